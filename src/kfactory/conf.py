@@ -133,13 +133,16 @@ class Settings(
     logger: ClassVar[Logger] = logger
     logfilter: LogFilter = Field(default_factory=LogFilter)
     display_type: Literal["widget", "image", "docs"] = "image"
-    meta_format: Literal["v2", "v1"] = "v2"
+    meta_format: Literal["v3", "v2", "v1"] = "v2"
     console: rich.console.Console = Field(default_factory=rich.console.Console)
     """The format of the saving of metadata.
 
     v1: Transformations and other KLayout objects are stored as a string. In
         case of ports they are converted back to KLayout objects on read.
     v2: All objects can be stored in the nativ KLayout format (klayout>=0.28.13)
+    v3: Same as v2, but all ports, settings and info of a cell are packed into a
+        single meta info entry instead of one entry per field. This format is
+        also used for writing.
     """
 
     def __init__(self, **data: Any):
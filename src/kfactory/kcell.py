@@ -15,26 +15,50 @@ import importlib
 import importlib.util
 import inspect
 import json
+import pickle
+import re
 import socket
-from collections import UserDict
-from collections.abc import Callable, Hashable, Iterable, Iterator, Sequence
+import time
+import weakref
+from collections import OrderedDict, UserDict
+from collections.abc import (
+    Callable,
+    Hashable,
+    ItemsView,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    Sequence,
+)
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import IntEnum, IntFlag, auto
 from hashlib import sha3_512
 from pathlib import Path
 from tempfile import gettempdir
 from types import FunctionType, ModuleType
-from typing import Any, Literal, Protocol, TypeAlias, TypeVar, cast, overload
+from typing import (
+    Any,
+    ClassVar,
+    Literal,
+    Protocol,
+    TypeAlias,
+    TypeVar,
+    cast,
+    overload,
+)
 
 import cachetools.func
 import numpy as np
 import rich
 import rich.json
+import rich.progress
 import ruamel.yaml
 import toolz
 from aenum import Enum, constant  # type: ignore[import-untyped,unused-ignore]
 from cachetools import Cache
-from cachetools.keys import _HashedTuple  # type: ignore[attr-defined,unused-ignore]
+from cachetools.keys import hashkey
 from pydantic import BaseModel, Field, computed_field, model_validator
 from pydantic_settings import BaseSettings
 from typing_extensions import ParamSpec
@@ -117,6 +141,9 @@ MetaData: TypeAlias = (
 kcl: KCLayout
 kcls: dict[str, KCLayout] = {}
 
+_cell_meta_key = "kfactory:cell"
+_cell_meta_prefixes = ("kfactory:ports:", "kfactory:settings:", "kfactory:info:")
+
 
 class KCellFunc(Protocol[KCellParams]):
     def __call__(
@@ -491,7 +518,9 @@ class KCell:
         info: Dictionary for storing additional info if necessary. This is not
             passed to the GDS and therefore not reversible.
         _kdb_cell: Pure KLayout cell object.
-        _locked: If set the cell shouldn't be modified anymore.
+        _locked: If set the cell shouldn't be modified anymore. This is the
+            `locked` flag of the KLayout cell, so KLayout refuses modifications
+            of the shapes and instances of a locked cell as well.
         ports: Manages the ports of the cell.
     """
 
@@ -499,11 +528,14 @@ class KCell:
     _ports: Ports
     _settings: KCellSettings
     _kdb_cell: kdb.Cell
-    info: Info
+    _info: Info
     d: UMKCell
     kcl: KCLayout
     boundary: kdb.DPolygon | None
-    insts: Instances
+    _insts: Instances
+    _lazy_meta_format: Literal["v1", "v2", "v3"] | None
+    _dup_source: KCell | None
+    _factory_call: tuple[str, dict[str, Any]] | None
 
     def __init__(
         self,
@@ -511,6 +543,7 @@ class KCell:
         kcl: KCLayout | None = None,
         kdb_cell: kdb.Cell | None = None,
         ports: Ports | None = None,
+        lazy: bool = False,
     ):
         """Constructor of KCell.
 
@@ -522,31 +555,87 @@ class KCell:
                 KLayout Cell
             ports: Attach an existing [Ports][kfactory.kcell.Ports] object to the KCell,
                 if `None` create an empty one.
+            lazy: If `True` and `kdb_cell` is given, only create the instances
+                and read ports, settings and info of the KLayout Cell when one of
+                them is accessed for the first time.
         """
         kcl = kcl or _get_default_kcl()
         self.kcl = kcl
-        self.insts = Instances()
+        self._lazy_meta_format = None
+        self._dup_source = None
+        self._factory_call = None
+        self._insts = Instances()
         self._settings = KCellSettings()
-        self.info: Info = Info()
-        self._locked = False
+        self._info = Info()
+        self._hash: bytes | None = None
+        self._meta_state: tuple[Any, ...] | None = None
         if name is None:
             _name = "Unnamed_!"
         else:
             _name = name
         self._kdb_cell = kdb_cell or kcl.create_cell(_name)
+        self._locked = False
         if _name == "Unnamed_!":
             self._kdb_cell.name = f"Unnamed_{self.cell_index()}"
         self.kcl.register_cell(self, allow_reregister=True)
-        self.ports: Ports = ports or Ports(self.kcl)
+        self._ports = ports or Ports(self.kcl)
 
         if kdb_cell is not None:
-            for inst in kdb_cell.each_inst():
-                self.insts.append(Instance(self.kcl, inst))
-            self.get_meta_data(meta_format=config.meta_format)
+            if lazy:
+                self._lazy_meta_format = config.meta_format
+            else:
+                for inst in kdb_cell.each_inst():
+                    self._insts.append(Instance(self.kcl, inst))
+                self.get_meta_data(meta_format=config.meta_format)
         self.d = UMKCell(self)
 
         self.boundary = None
 
+    def _load(self) -> None:
+        """Create the instances and read the metadata of a lazy KCell.
+
+        Copies of locked cells copy the ports and info of the original instead of
+        reading the metadata.
+        """
+        meta_format = self._lazy_meta_format
+        if meta_format is not None:
+            self._lazy_meta_format = None
+            for inst in self._kdb_cell.each_inst():
+                self._insts.append(Instance(self.kcl, inst))
+            source = self._dup_source
+            if source is None:
+                self.get_meta_data(meta_format=meta_format)
+            else:
+                self._dup_source = None
+                self._ports = source._ports.copy(kcl=self.kcl)
+                self._info = source._info.model_copy()
+
+    @property
+    def insts(self) -> Instances:
+        """Instances of the KCell."""
+        if self._lazy_meta_format is not None:
+            self._load()
+        return self._insts
+
+    @insts.setter
+    def insts(self, value: Instances) -> None:
+        if self._lazy_meta_format is not None:
+            self._load()
+        self._insts = value
+
+    @property
+    def info(self) -> Info:
+        """Dictionary for storing additional info of the cell."""
+        if self._lazy_meta_format is not None:
+            self._load()
+        return self._info
+
+    @info.setter
+    def info(self, value: Info) -> None:
+        if self._lazy_meta_format is not None:
+            self._load()
+        self._info = value
+
     def evaluate_insts(self) -> None:
         """Check all KLayout instances and create kfactory Instances."""
         self.insts = Instances()
@@ -560,8 +649,18 @@ class KCell:
     @property
     def settings(self) -> KCellSettings:
         """Settings dictionary set by the [@cell][kfactory.kcell.cell] decorator."""
+        if self._lazy_meta_format is not None:
+            self._load()
         return self._settings
 
+    @property
+    def _locked(self) -> bool:
+        return self._kdb_cell.locked
+
+    @_locked.setter
+    def _locked(self, value: bool) -> None:
+        self._kdb_cell.locked = value
+
     @property
     def name(self) -> str:
         """Name of the KCell."""
@@ -622,6 +721,42 @@ class KCell:
         """Enables use of `copy.copy` and `copy.deep_copy`."""
         return self.dup()
 
+    def _lazy_dup(self, kcl: KCLayout) -> KCell:
+        """Register a copy of this cell in a duplicate of its KCLayout.
+
+        The settings are immutable and shared. Ports and info of a locked cell are
+        shared until the copy is accessed for the first time, see
+        [_load][kfactory.kcell.KCell._load]. Unlocked cells might still change, so
+        their copies are loaded immediately.
+
+        Args:
+            kcl: Duplicate of `self.kcl` with the same cell and layer indexes.
+        """
+        cell = KCell.__new__(KCell)
+        cell.kcl = kcl
+        cell._kdb_cell = kcl.layout.cell(self._kdb_cell.cell_index())
+        cell._insts = Instances()
+        cell._settings = self._settings
+        cell._ports = self._ports
+        cell._locked = False
+        cell._hash = None
+        cell._meta_state = self._meta_state
+        if self._lazy_meta_format is not None:
+            # not loaded yet, the copied metadata is still valid
+            cell._lazy_meta_format = self._lazy_meta_format
+            cell._dup_source = None
+            cell._info = Info()
+        else:
+            cell._lazy_meta_format = config.meta_format
+            cell._dup_source = self
+            cell._info = self._info
+        cell.d = UMKCell(cell)
+        cell.boundary = None
+        kcl.kcells[cell._kdb_cell.cell_index()] = cell
+        if not self._locked:
+            cell._load()
+        return cell
+
     def add_port(
         self, port: Port, name: str | None = None, keep_mirror: bool = False
     ) -> Port:
@@ -870,12 +1005,16 @@ class KCell:
     @property
     def ports(self) -> Ports:
         """Ports associated with the cell."""
+        if self._lazy_meta_format is not None:
+            self._load()
         return self._ports
 
     @ports.setter
     def ports(self, new_ports: InstancePorts | Ports) -> None:
         if self._locked:
             raise LockedError(self)
+        if self._lazy_meta_format is not None:
+            self._load()
         self._ports = new_ports.copy()
 
     @overload
@@ -1054,8 +1193,89 @@ class KCell:
         """
         return self.create_inst(cell)
 
+    def connect_many(
+        self,
+        connections: Iterable[
+            tuple[Instance, str | Port | None, Instance | Port, str | None]
+        ],
+        *,
+        mirror: bool = False,
+        allow_width_mismatch: bool = False,
+        allow_layer_mismatch: bool = False,
+        allow_type_mismatch: bool = False,
+    ) -> None:
+        """Connect a batch of instances of this cell.
+
+        Each connection is a tuple `(instance, port, other, other_port_name)` with the
+        meaning of the arguments of [Instance.connect][kfactory.kcell.Instance.connect].
+        The connections are applied in order, so an instance can be connected to an
+        instance placed earlier in the same batch.
+
+        All connections are checked and their transformations calculated before any
+        instance is changed. The instances are then updated in one bulk change of the
+        layout.
+
+        Args:
+            connections: The connections to make.
+            mirror: Connect with klayout.db.Trans.M90 instead of R180.
+            allow_width_mismatch: Skip width check between the ports if set.
+            allow_layer_mismatch: Skip layer check between the ports if set.
+            allow_type_mismatch: Skip port_type check between the ports if set.
+        """
+        if self._locked:
+            raise LockedError(self)
+        placed: dict[int, tuple[Instance, kdb.Trans | kdb.DCplxTrans]] = {}
+        for inst, port, other, other_port_name in connections:
+            if isinstance(other, Instance):
+                if other_port_name is None:
+                    raise ValueError(
+                        "portname cannot be None if an Instance Object is given. For"
+                        "complex connections (non-90 degree and floating point ports)"
+                        " use route_cplx instead"
+                    )
+                if id(other) in placed:
+                    op = other.cell.ports[other_port_name].copy(placed[id(other)][1])
+                else:
+                    op = other.ports[other_port_name]
+            elif isinstance(other, Port):
+                op = other
+            else:
+                raise ValueError("other_instance must be of type Instance or Port")
+            placed[id(inst)] = (
+                inst,
+                inst._connection_trans(
+                    port,
+                    op,
+                    other,
+                    mirror=mirror,
+                    allow_width_mismatch=allow_width_mismatch,
+                    allow_layer_mismatch=allow_layer_mismatch,
+                    allow_type_mismatch=allow_type_mismatch,
+                ),
+            )
+
+        self.kcl.layout.start_changes()
+        try:
+            for inst, trans in placed.values():
+                if isinstance(trans, kdb.DCplxTrans):
+                    inst._instance.dcplx_trans = trans
+                else:
+                    inst._instance.trans = trans
+        finally:
+            self.kcl.layout.end_changes()
+
     def hash(self) -> bytes:
-        """Provide a unique hash of the cell."""
+        """Provide a unique hash of the cell.
+
+        The hash is built from the shapes, ports and instances of the cell. For
+        instances the (cached) hashes of their cells are used. Locked cells cannot
+        be modified anymore, therefore the hash of a locked cell is cached if all its
+        child cells are locked as well.
+        """
+        if not self._locked:
+            self._hash = None
+        elif self._hash is not None:
+            return self._hash
         h = sha3_512()
         h.update(self.name.encode("ascii", "ignore"))
 
@@ -1071,7 +1291,12 @@ class KCell:
         insts_hashs = list(sorted(inst.hash for inst in self.insts))
         for _hash in insts_hashs:
             h.update(_hash)
-        return h.digest()
+        digest = h.digest()
+        if self._locked and all(
+            self.kcl[ci]._locked for ci in self._kdb_cell.each_child_cell()
+        ):
+            self._hash = digest
+        return digest
 
     def auto_rename_ports(self, rename_func: Callable[..., None] | None = None) -> None:
         """Rename the ports with the schema angle -> "NSWE" and sort by x and y.
@@ -1139,11 +1364,15 @@ class KCell:
             it.targets = [_old_kdb_cell.cell_index()]
             it.max_depth = 0
             insts = [instit.current_inst_element().inst() for instit in it.each()]
+            locked = c.locked
+            c.locked = False
             for inst in insts:
                 ca = inst.cell_inst
                 ca.cell_index = _ci
                 c.replace(inst, ca)
+            c.locked = locked
 
+        _old_kdb_cell.locked = False
         self.kcl.layout.delete_cell(_old_kdb_cell.cell_index())
         self.rebuild()
 
@@ -1207,16 +1436,16 @@ class KCell:
                     if not kcell._destroyed():
                         if kcell.is_library_cell():
                             kcell.convert_to_static(recursive=True)
-                        kcell.set_meta_data()
+                        kcell.set_meta_data(skip_unchanged=True)
                 if self.is_library_cell():
                     self.convert_to_static(recursive=True)
-                self.set_meta_data()
+                self.set_meta_data(skip_unchanged=True)
             case True, False:
                 self.kcl.set_meta_data()
                 for kcell in (self.kcl[ci] for ci in self.called_cells()):
                     if not kcell._destroyed():
-                        kcell.set_meta_data()
-                self.set_meta_data()
+                        kcell.set_meta_data(skip_unchanged=True)
+                self.set_meta_data(skip_unchanged=True)
             case False, True:
                 for kcell in (self.kcl[ci] for ci in self.called_cells()):
                     if kcell.is_library_cell() and not kcell._destroyed():
@@ -1269,14 +1498,16 @@ class KCell:
             layout_b = kdb.Layout()
             layout_b.read(fn, options)
             layout_a = self.kcl.layout.dup()
-            layout_a.delete_cell(layout_a.cell(self.name).cell_index())
+            cell_a = layout_a.cell(self.name)
+            cell_a.locked = False
+            layout_a.delete_cell(cell_a.cell_index())
             diff = MergeDiff(
                 layout_a=layout_a,
                 layout_b=layout_b,
                 name_a=self.name,
                 name_b=Path(filename).stem,
             )
-            diff.compare()
+            diff.compare_sharded()
             if diff.dbu_differs:
                 raise MergeError("Layouts' DBU differ. Check the log for more info.")
             elif diff.diff_xor.cells() > 0:
@@ -1457,11 +1688,69 @@ class KCell:
         else:
             return self._kdb_cell.transform(inst_or_trans)  # type:ignore[arg-type]
 
-    def set_meta_data(self) -> None:
+    def _meta_fingerprint(self, meta_format: str) -> tuple[Any, ...]:
+        """Snapshot of everything written by `set_meta_data`."""
+        return (
+            meta_format,
+            tuple(
+                (
+                    port.name,
+                    port.width,
+                    port.layer,
+                    port.port_type,
+                    port._trans.dup() if port._trans else None,
+                    port._dcplx_trans.dup() if port._dcplx_trans else None,
+                    port._info.model_dump() if port._info else {},
+                )
+                for port in self.ports
+            ),
+            self.settings,
+            self.info.model_dump(),
+        )
+
+    @property
+    def meta_dirty(self) -> bool:
+        """Whether ports, settings or info changed since the last `set_meta_data`."""
+        meta_format = "v3" if config.meta_format == "v3" else "v2"
+        return self._meta_state != self._meta_fingerprint(meta_format)
+
+    def set_meta_data(
+        self,
+        meta_format: Literal["v1", "v2", "v3"] | None = None,
+        skip_unchanged: bool = False,
+    ) -> bool:
         """Set metadata of the Cell.
 
         Currently, ports, settings and info will be set.
+
+        Args:
+            meta_format: Format to write the metadata in. `v1` and `v2` store
+                each port field, setting and info as a separate meta info
+                entry. `v3` packs everything into a single entry
+                `kfactory:cell` per cell. Defaults to `config.meta_format`.
+            skip_unchanged: Don't write the metadata again if ports, settings and
+                info didn't change since the last call.
+
+        Returns:
+            Whether the metadata was written.
         """
+        if (
+            skip_unchanged
+            and self._lazy_meta_format is not None
+            and self._dup_source is None
+        ):
+            # metadata of lazy KCells is still the one that was read
+            return False
+        meta_format = "v3" if (meta_format or config.meta_format) == "v3" else "v2"
+        state = self._meta_fingerprint(meta_format)
+        if skip_unchanged and state == self._meta_state:
+            return False
+        self._meta_state = state
+        if meta_format == "v3":
+            self._set_meta_data_v3()
+            return True
+        if self._kdb_cell.meta_info(_cell_meta_key) is not None:
+            self._kdb_cell.remove_meta_info(_cell_meta_key)
         for i, port in enumerate(self.ports):
             if port.name:
                 self.add_meta_info(
@@ -1501,8 +1790,8 @@ class KCell:
                     )
                 )
 
-            info = port.info.model_dump()
-            for name, value in port.info:
+            info = port._info.model_dump() if port._info else {}
+            for name, value in port._info or ():
                 info[name] = value
 
             for name, value in info.items():
@@ -1523,9 +1812,75 @@ class KCell:
             self.add_meta_info(
                 kdb.LayoutMetaInfo(f"kfactory:info:{name}", info, None, True)
             )
+        return True
+
+    def _set_meta_data_v3(self) -> None:
+        """Set the metadata of the Cell as a single packed meta info entry.
+
+        Ports are packed into a JSON string, which KLayout can store and read
+        much faster than nested native objects. If any port info is not JSON
+        serializable, the ports are stored as native KLayout objects instead.
+        """
+        kdb_cell = self._kdb_cell
+        for meta in list(kdb_cell.each_meta_info()):
+            if meta.name.startswith(_cell_meta_prefixes):
+                kdb_cell.remove_meta_info(meta.name)
+
+        get_info = self.kcl.layout.get_info
+        ports: list[dict[str, Any]] = []
+        for port in self.ports:
+            _port: dict[str, Any] = {
+                "layer": get_info(port.layer).to_s(),
+                "width": port.width,
+                "port_type": port.port_type,
+            }
+            if port.name:
+                _port["name"] = port.name
+            if port._trans:
+                t = port._trans
+                _port["trans"] = [t.rot, t.is_mirror(), t.disp.x, t.disp.y]
+            elif port._dcplx_trans:
+                dt = port._dcplx_trans
+                _port["dcplx_trans"] = [
+                    dt.angle,
+                    dt.is_mirror(),
+                    dt.mag,
+                    dt.disp.x,
+                    dt.disp.y,
+                ]
+            if port._info:
+                _port["info"] = port._info.model_dump()
+            ports.append(_port)
+
+        packed_ports: str | list[dict[str, Any]]
+        try:
+            packed_ports = json.dumps(ports, separators=(",", ":"))
+        except TypeError:
+            packed_ports = ports
+
+        kdb_cell.add_meta_info(
+            kdb.LayoutMetaInfo(
+                _cell_meta_key,
+                {
+                    "ports": packed_ports,
+                    "settings": self.settings.model_dump(),
+                    "info": self.info.model_dump(),
+                },
+                None,
+                True,
+            )
+        )
 
-    def get_meta_data(self, meta_format: Literal["v1", "v2"] = "v2") -> None:
-        """Read metadata from the KLayout Layout object."""
+    def get_meta_data(self, meta_format: Literal["v1", "v2", "v3"] = "v2") -> None:
+        """Read metadata from the KLayout Layout object.
+
+        Packed (`v3`) metadata is detected automatically, `meta_format` is only
+        used to decide how to interpret the per-entry `v1`/`v2` metadata.
+        """
+        packed = self._kdb_cell.meta_info(_cell_meta_key)
+        if packed is not None:
+            self._get_meta_data_v3(packed.value)
+            return
         port_dict: dict[str, Any] = {}
         settings = {}
         for meta in self.each_meta_info():
@@ -1549,7 +1904,7 @@ class KCell:
         self.ports = Ports(self.kcl)
 
         match meta_format:
-            case "v2":
+            case "v2" | "v3":
                 for index in sorted(port_dict.keys()):
                     _d = port_dict[index]
                     name = _d.get("name", None)
@@ -1603,6 +1958,36 @@ class KCell:
                     f" Available formats are 'default' or 'legacy'."
                 )
 
+    def _get_meta_data_v3(self, meta: dict[str, Any]) -> None:
+        """Read the packed metadata of the Cell."""
+        for name, value in meta.get("info", {}).items():
+            self.info[name] = value
+        self._settings = KCellSettings(**meta.get("settings", {}))
+
+        self.ports = Ports(self.kcl)
+        ports = meta.get("ports", [])
+        if isinstance(ports, str):
+            ports = json.loads(ports)
+        layer = self.kcl.layout.layer
+        for _d in ports:
+            _port = Port(
+                name=_d.get("name"),
+                width=_d["width"],
+                layer=layer(kdb.LayerInfo.from_string(_d["layer"])),
+                trans=kdb.Trans.R0,
+                kcl=self.kcl,
+                port_type=_d["port_type"],
+                info=_d.get("info", {}),
+            )
+            if "trans" in _d:
+                rot, mirror, x, y = _d["trans"]
+                _port.trans = kdb.Trans(rot, mirror, x, y)
+            elif "dcplx_trans" in _d:
+                angle, mirror, mag, x, y = _d["dcplx_trans"]
+                _port.dcplx_trans = kdb.DCplxTrans(mag, angle, mirror, x, y)
+
+            self.add_port(_port, keep_mirror=True)
+
     @property
     def x(self) -> int:
         """Returns the x-coordinate of the center of the bounding box."""
@@ -1726,8 +2111,10 @@ class KCell:
                     circ.connect_pin(pin, net)
 
         # sort the ports of all instances by position and layer
+        inst_names: list[str] = []
         for i, inst in enumerate(self.insts):
-            name = inst.name or f"{i}_{inst.cell.name}"
+            inst_names.append(inst.name)
+            name = inst_names[i] or f"{i}_{inst.cell.name}"
             subc = circ.create_subcircuit(
                 netlist.circuit_by_cell_index(inst.cell_index), name
             )
@@ -1778,7 +2165,7 @@ class KCell:
                     # connect instance ports to each other
                     name = "-".join(
                         [
-                            (inst.name or str(i)) + "_" + (port.name or str(j))
+                            (inst_names[i] or str(i)) + "_" + (port.name or str(j))
                             for i, j, inst, port, subc in ports
                         ]
                     )
@@ -2353,6 +2740,449 @@ class LayerStack(BaseModel):
         return self.layers[attr]
 
 
+@dataclass
+class CellCacheStats:
+    """Counters of a [KCellCache][kfactory.kcell.KCellCache]."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    build_time: float = 0.0
+    """Time spent creating cells on cache misses [s]."""
+
+
+@dataclass
+class WriteStats:
+    """Timing breakdown of the last [write][kfactory.kcell.KCLayout.write]."""
+
+    meta_time: float = 0.0
+    """Time spent on setting the metadata of the cells [s]."""
+    stream_time: float = 0.0
+    """Time spent on writing the layout to the file [s]."""
+    cells_updated: int = 0
+    cells_skipped: int = 0
+    """Cells whose metadata was unchanged since the last write."""
+
+
+class KCellCache(MutableMapping[Hashable, KCell]):
+    """Bounded cache for the cells of a [cell][kfactory.kcell.KCLayout.cell] function.
+
+    Entries whose KCell has been destroyed are dropped on access. If the cache is
+    bounded, entries are evicted by least recently used (`"lru"`) or least frequently
+    used (`"lfu"`) policy. With `delete_evicted`, evicted cells which aren't
+    instantiated in any other cell are deleted from their KCLayout.
+
+    Attributes:
+        maxsize: Maximum size of the cache. `None` for unbounded.
+        getsizeof: Function returning the size of a KCell. By default each KCell
+            has size 1, i.e. `maxsize` is the maximum number of entries.
+        policy: Eviction policy.
+        delete_evicted: Delete evicted KCells if they have no parent cells. Only
+            use this if the cells aren't referenced outside of the cache, e.g. as
+            top cells, otherwise these references point to deleted cells.
+        stats: Hit/miss/eviction counters and time spent building cells.
+        currsize: Current size of the cache.
+    """
+
+    def __init__(
+        self,
+        maxsize: int | None = None,
+        getsizeof: Callable[[KCell], int] | None = None,
+        policy: Literal["lru", "lfu"] = "lru",
+        delete_evicted: bool = False,
+    ) -> None:
+        """Create an empty cache."""
+        self.maxsize = maxsize
+        self.getsizeof = getsizeof
+        self.policy = policy
+        self.delete_evicted = delete_evicted
+        self.stats = CellCacheStats()
+        self.currsize = 0
+        self._data: OrderedDict[Hashable, KCell] = OrderedDict()
+        self._uses: dict[Hashable, int] = {}
+        self._sizes: dict[Hashable, int] = {}
+
+    def __getitem__(self, key: Hashable) -> KCell:
+        """Get a cached KCell, raises `KeyError` on a miss or a destroyed KCell."""
+        try:
+            kcell = self._data[key]
+        except KeyError:
+            self.stats.misses += 1
+            raise
+        if kcell._kdb_cell._destroyed():
+            self._remove(key)
+            self.stats.misses += 1
+            raise KeyError(key)
+        self.stats.hits += 1
+        if self.maxsize is not None:
+            if self.policy == "lfu":
+                self._uses[key] += 1
+            else:
+                self._data.move_to_end(key)
+        return kcell
+
+    def __setitem__(self, key: Hashable, kcell: KCell) -> None:
+        """Add a KCell to the cache and evict entries if the cache is full."""
+        size = self.getsizeof(kcell) if self.getsizeof is not None else 1
+        if self.maxsize is not None and size > self.maxsize:
+            raise ValueError(f"KCell {kcell.name} is too large for the cache")
+        if key in self._data:
+            self._remove(key)
+        while self.maxsize is not None and self.currsize + size > self.maxsize:
+            self.popitem()
+        self._data[key] = kcell
+        self._uses[key] = 0
+        self._sizes[key] = size
+        self.currsize += size
+
+    def __delitem__(self, key: Hashable) -> None:
+        """Remove an entry without deleting the KCell."""
+        self._remove(key)
+
+    def __contains__(self, key: object) -> bool:
+        """Check for a key without counting it as a hit or miss."""
+        return key in self._data
+
+    def __iter__(self) -> Iterator[Hashable]:
+        """Iterate over the keys."""
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        """Number of cached KCells."""
+        return len(self._data)
+
+    def items(self) -> ItemsView[Hashable, KCell]:
+        """Keys and KCells without counting them as hits."""
+        return self._data.items()
+
+    def _remove(self, key: Hashable) -> KCell:
+        kcell = self._data.pop(key)
+        del self._uses[key]
+        self.currsize -= self._sizes.pop(key)
+        return kcell
+
+    def popitem(self) -> tuple[Hashable, KCell]:
+        """Evict an entry according to the policy."""
+        if not self._data:
+            raise KeyError(f"{type(self).__name__} is empty")
+        if self.policy == "lfu":
+            key = min(self._uses, key=self._uses.__getitem__)
+        else:
+            key = next(iter(self._data))
+        kcell = self._remove(key)
+        self.stats.evictions += 1
+        if (
+            self.delete_evicted
+            and not kcell._destroyed()
+            and kcell._kdb_cell.parent_cells() == 0
+        ):
+            kcell.kcl.delete_cell(kcell)
+        return key, kcell
+
+    def clear(self) -> None:
+        """Remove all entries without deleting the KCells."""
+        self._data.clear()
+        self._uses.clear()
+        self._sizes.clear()
+        self.currsize = 0
+
+
+_fingerprints: weakref.WeakKeyDictionary[Callable[..., Any], str] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _referenced_functions(obj: Callable[..., Any]) -> list[Callable[..., Any]]:
+    """Functions and classes a function (or the methods of a class) refers to.
+
+    Global names and closure variables of the code and its nested code objects are
+    resolved. Decorated functions are unwrapped.
+    """
+    functions = (
+        [v for v in vars(obj).values() if isinstance(v, FunctionType)]
+        if isinstance(obj, type)
+        else [obj]
+    )
+    referenced: list[Callable[..., Any]] = []
+    for function in functions:
+        code = getattr(function, "__code__", None)
+        if code is None:
+            continue
+        values: list[Any] = []
+        codes = [code]
+        while codes:
+            _code = codes.pop()
+            values.extend(
+                function.__globals__[name]
+                for name in _code.co_names
+                if name in function.__globals__
+            )
+            codes.extend(c for c in _code.co_consts if inspect.iscode(c))
+        values.extend(
+            cell.cell_contents
+            for cell in function.__closure__ or ()
+            if cell.cell_contents is not None
+        )
+        referenced.extend(
+            inspect.unwrap(v) for v in values if isinstance(v, FunctionType | type)
+        )
+    return referenced
+
+
+def _function_fingerprint(f: Callable[..., Any]) -> str:
+    """Hash a function by its qualified name and source (or bytecode).
+
+    The functions and classes it refers to which are defined in the same top level
+    package are hashed as well, recursively. So editing a helper or the function
+    of a child cell changes the fingerprint.
+    """
+    f = inspect.unwrap(f)
+    try:
+        return _fingerprints[f]
+    except (KeyError, TypeError):
+        pass
+    h = sha3_512()
+    h.update(__version__.encode("UTF-8"))
+    package = str(getattr(f, "__module__", "")).partition(".")[0]
+    seen: set[int] = set()
+    stack: list[Callable[..., Any]] = [f]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        module = str(getattr(obj, "__module__", ""))
+        h.update(f"{module}.{getattr(obj, '__qualname__', '')}".encode())
+        try:
+            h.update(inspect.getsource(obj).encode("UTF-8"))
+        except (OSError, TypeError):
+            code = getattr(obj, "__code__", None)
+            if code is not None:
+                h.update(code.co_code)
+                h.update(repr(code.co_consts).encode("UTF-8"))
+        stack.extend(
+            ref
+            for ref in _referenced_functions(obj)
+            if str(getattr(ref, "__module__", "")).partition(".")[0] == package
+        )
+    fingerprint = h.hexdigest()
+    try:
+        _fingerprints[f] = fingerprint
+    except TypeError:
+        pass
+    return fingerprint
+
+
+def _persistent_key_value(value: Any) -> Any:
+    """Convert a cell parameter to a json serializable, run independent value."""
+    if isinstance(value, LayerEnum):
+        return ["LayerEnum", value.layer, value.datatype]
+    if value is None or isinstance(value, str | bool | int | float):
+        return value
+    if isinstance(value, dict | frozenset):
+        items = value.items() if isinstance(value, dict) else value
+        return sorted(
+            ([str(k), _persistent_key_value(v)] for k, v in items),
+            key=lambda item: item[0],
+        )
+    if isinstance(value, list | tuple):
+        return [_persistent_key_value(v) for v in value]
+    return clean_value(value)
+
+
+class PersistentCellCache:
+    """On-disk cache for cells created by [cell][kfactory.kcell.KCLayout.cell].
+
+    Each entry is stored as an OASIS file containing the cell, its children and the
+    kfactory metadata (ports, settings, info). An `index.json` keeps track of the
+    entries for LRU eviction and of the fingerprints of the functions which built
+    the child cells. An entry is only used if these functions are unchanged. The
+    parameters of the child cells are pickled next to the OASIS file, so a hit
+    adds the child cells to the caches of their functions.
+
+    Attributes:
+        path: Directory of the cache.
+        max_size: Maximum size of all the OASIS files in bytes. `None` for unbounded.
+        max_entries: Maximum number of cached cells. `None` for unbounded.
+    """
+
+    index_name: str = "index.json"
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_size: int | None = None,
+        max_entries: int | None = None,
+    ) -> None:
+        """Create or open a persistent cache in a directory.
+
+        Args:
+            path: Directory of the cache. Will be created if it doesn't exist.
+            max_size: Maximum size of all the cached files in bytes.
+            max_entries: Maximum number of cached cells.
+        """
+        self.path = Path(path).expanduser().resolve()
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self._index: dict[str, dict[str, Any]] = self._read_index()
+
+    def _read_index(self) -> dict[str, dict[str, Any]]:
+        index_file = self.path / self.index_name
+        if not index_file.is_file():
+            return {}
+        try:
+            index: dict[str, dict[str, Any]] = json.loads(index_file.read_text())
+        except json.JSONDecodeError:
+            config.logger.warning(
+                "Corrupt persistent cell cache index {}, starting with an empty cache",
+                index_file,
+            )
+            return {}
+        return index
+
+    def _write_index(self) -> None:
+        index_file = self.path / self.index_name
+        tmp_file = index_file.with_suffix(".json.tmp")
+        tmp_file.write_text(json.dumps(self._index))
+        tmp_file.replace(index_file)
+
+    def _file(self, key: str) -> Path:
+        return self.path / f"{key}.oas"
+
+    def _calls_file(self, key: str) -> Path:
+        return self.path / f"{key}.pkl"
+
+    def __len__(self) -> int:
+        """Number of cached cells."""
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        """Check whether a key is in the cache."""
+        return key in self._index
+
+    @property
+    def size(self) -> int:
+        """Size of all cached files in bytes."""
+        return sum(entry["size"] for entry in self._index.values())
+
+    def key(self, fingerprint: str, params: dict[str, Any]) -> str:
+        """Create a key from a function fingerprint and the cell parameters."""
+        h = sha3_512()
+        h.update(fingerprint.encode("UTF-8"))
+        h.update(
+            json.dumps(
+                [[name, _persistent_key_value(v)] for name, v in params.items()]
+            ).encode("UTF-8")
+        )
+        return h.hexdigest()[:64]
+
+    def get(self, key: str, kcl: KCLayout) -> KCell | None:
+        """Load a cell from the cache into a KCLayout.
+
+        Returns `None` if the key is not cached, if the function of a child cell
+        changed or isn't defined in the KCLayout, or if a cell with the cached name
+        already exists in the KCLayout.
+        """
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+        file = self._file(key)
+        if not file.is_file():
+            del self._index[key]
+            self._write_index()
+            return None
+        for _, function_name, fingerprint in entry.get("children", []):
+            function = kcl._cell_functions.get(function_name)
+            if function is None or _function_fingerprint(function) != fingerprint:
+                return None
+        name = entry["name"]
+        if kcl.layout.cell(name) is not None:
+            return None
+        kcl.layout.read(str(file), load_layout_options())
+        kdb_cell = kcl.layout.cell(name)
+        if kdb_cell is None:
+            return None
+        calls_file = self._calls_file(key)
+        if calls_file.is_file():
+            try:
+                calls = pickle.loads(calls_file.read_bytes())
+            except (pickle.UnpicklingError, AttributeError, ImportError, EOFError):
+                config.logger.warning(
+                    "Cannot load the child cell parameters of {}, the child cells"
+                    " are not added to the caches of their functions",
+                    name,
+                )
+            else:
+                kcl._register_factory_cells(calls)
+        entry["accessed"] = time.time()
+        self._write_index()
+        return KCell(name=name, kcl=kcl, kdb_cell=kdb_cell)
+
+    def put(self, key: str, kcell: KCell, function: str = "") -> None:
+        """Write a cell (including its children and metadata) to the cache."""
+        file = self._file(key)
+        kcell.write(file, save_options=save_layout_options())
+        calls = _factory_calls(kcell)
+        calls_file = self._calls_file(key)
+        calls_file.write_bytes(pickle.dumps(calls))
+        children = []
+        for name, function_name, _ in calls:
+            child_function = kcell.kcl._cell_functions.get(function_name)
+            if child_function is not None:
+                children.append(
+                    [name, function_name, _function_fingerprint(child_function)]
+                )
+        self._index[key] = {
+            "name": kcell.name,
+            "function": function,
+            "size": file.stat().st_size + calls_file.stat().st_size,
+            "accessed": time.time(),
+            "children": children,
+        }
+        self.evict()
+        self._write_index()
+
+    def evict(self) -> None:
+        """Delete the least recently used entries until the cache is within bounds."""
+        lru = sorted(self._index.items(), key=lambda item: item[1]["accessed"])
+        size = self.size
+        n = len(lru)
+        for key, entry in lru:
+            if (self.max_size is None or size <= self.max_size) and (
+                self.max_entries is None or n <= self.max_entries
+            ):
+                break
+            self._file(key).unlink(missing_ok=True)
+            self._calls_file(key).unlink(missing_ok=True)
+            del self._index[key]
+            size -= entry["size"]
+            n -= 1
+
+    def invalidate(self, function: Callable[..., Any] | str | None = None) -> None:
+        """Delete cache entries.
+
+        Args:
+            function: Only delete the entries created by this function (or
+                `module.qualname` of the function). If `None`, delete all entries.
+        """
+        if function is not None and not isinstance(function, str):
+            function = f"{function.__module__}.{function.__qualname__}"
+        for key in [
+            key
+            for key, entry in self._index.items()
+            if function is None or entry["function"] == function
+        ]:
+            self._file(key).unlink(missing_ok=True)
+            self._calls_file(key).unlink(missing_ok=True)
+            del self._index[key]
+        self._write_index()
+
+    def clear(self) -> None:
+        """Delete all entries of the cache."""
+        self.invalidate()
+
+
 class KCLayout(BaseModel, arbitrary_types_allowed=True, extra="allow"):
     """Small extension to the klayout.db.Layout.
 
@@ -2409,6 +3239,10 @@ class KCLayout(BaseModel, arbitrary_types_allowed=True, extra="allow"):
     constants: Constants = Field(default_factory=Constants)
     rename_function: Callable[..., None]
     _registered_functions: dict[int, Callable[..., KCell]]
+    _cache_setters: dict[str, Callable[[KCell, dict[str, Any]], None]]
+    _cell_functions: dict[str, Callable[..., KCell]]
+    cell_caches: dict[str, KCellCache] = Field(default_factory=dict)
+    write_stats: WriteStats = Field(default_factory=WriteStats)
 
     info: Info = Field(default_factory=Info)
     _settings: KCellSettings
@@ -2481,6 +3315,8 @@ class KCLayout(BaseModel, arbitrary_types_allowed=True, extra="allow"):
             info=Info(**info) if info else Info(),
         )
         self._name = name
+        self._cache_setters = {}
+        self._cell_functions = {}
         self._settings = KCellSettings(
             version=__version__,
             klayout_version=kdb.__version__,  # type: ignore[attr-defined]
@@ -2592,6 +3428,7 @@ class KCLayout(BaseModel, arbitrary_types_allowed=True, extra="allow"):
         drop_params: list[str] = ["self", "cls"],
         info: dict[str, MetaData] | None = None,
         post_process: Iterable[Callable[[KCell], None]] = [],
+        persistent_cache: PersistentCellCache | Path | str | None = None,
     ) -> Callable[[KCellFunc[KCellParams]], KCellFunc[KCellParams]]: ...
 
     @config.logger.catch(reraise=True)
@@ -2606,13 +3443,14 @@ class KCLayout(BaseModel, arbitrary_types_allowed=True, extra="allow"):
         check_instances: bool = True,
         snap_ports: bool = True,
         add_port_layers: bool = True,
-        cache: Cache[int, Any] | dict[int, Any] | None = None,
+        cache: Cache[int, Any] | dict[int, Any] | KCellCache | None = None,
         rec_dicts: bool = False,
         basename: str | None = None,
         drop_params: list[str] = ["self", "cls"],
         register_factory: bool = True,
         info: dict[str, MetaData] | None = None,
         post_process: Iterable[Callable[[KCell], None]] = [],
+        persistent_cache: PersistentCellCache | Path | str | None = None,
     ) -> (
         KCellFunc[KCellParams]
         | Callable[[KCellFunc[KCellParams]], KCellFunc[KCellParams]]
@@ -2638,7 +3476,10 @@ class KCLayout(BaseModel, arbitrary_types_allowed=True, extra="allow"):
                 [netlist_layer_mapping][kfactory.kcell.KCLayout.netlist_layer_mapping]
                 to the ports if the port layer is in the mapping.
             cache: Provide a user defined cache instead of an internal one. This
-                can be used for example to clear the cache.
+                can be used for example to clear the cache. By default an unbounded
+                [KCellCache][kfactory.kcell.KCellCache] is used. KCellCaches are
+                registered in [cell_caches][kfactory.kcell.KCLayout.cell_caches]
+                under the qualified name (`module.qualname`) of the function.
             rec_dicts: Allow and inspect recursive dictionaries as parameters (can be
                 expensive if the cell is called often).
             basename: Overwrite the name normally inferred from the function or class
@@ -2649,136 +3490,211 @@ class KCLayout(BaseModel, arbitrary_types_allowed=True, extra="allow"):
                 [factories][kfactory.kcell.KCLayout.factories]
             info: Additional metadata to put into info attribute.
             post_process: List of functions to call after the cell has been created.
+            persistent_cache: Directory or
+                [PersistentCellCache][kfactory.kcell.PersistentCellCache] to store
+                created cells on disk. On a hit (same function source and same
+                parameters), the cell is loaded from disk instead of calling the
+                function.
         """
         d2fs = rec_dict_to_frozenset if rec_dicts else dict_to_frozenset
         fs2d = rec_frozenset_to_dict if rec_dicts else frozenset_to_dict
+        _persistent_cache = (
+            PersistentCellCache(persistent_cache)
+            if isinstance(persistent_cache, str | Path)
+            else persistent_cache
+        )
 
         def decorator_autocell(
             f: Callable[KCellParams, KCell],
         ) -> Callable[KCellParams, KCell]:
+            # the signature is only inspected once per function
             sig = inspect.signature(f)
+            param_names = tuple(sig.parameters)
+            param_defaults: dict[str, Any] = {
+                name: p.default for name, p in sig.parameters.items()
+            }
+            required_params = tuple(
+                name
+                for name, p in sig.parameters.items()
+                if p.default is inspect.Parameter.empty
+            )
+            fixed_params = not any(
+                p.kind == inspect.Parameter.VAR_KEYWORD for p in sig.parameters.values()
+            )
+            function_name = f"{f.__module__}.{f.__qualname__}"
+            self._cell_functions[function_name] = f
 
-            # previously was a KCellCache, but dict should do for most case
-            _cache: Cache[_HashedTuple, KCell] | dict[_HashedTuple, KCell] = cache or {}
+            _cache: Cache[Any, KCell] | dict[Any, KCell] | KCellCache = (
+                cache if cache is not None else KCellCache()
+            )
+            if isinstance(_cache, KCellCache):
+                self.cell_caches[function_name] = _cache
+            # KCellCaches never return destroyed cells
+            sweep_destroyed = not isinstance(_cache, KCellCache)
+
+            def cell_key(params: dict[str, Any]) -> Hashable:
+                # Without `**kwargs` in the signature the order of the parameters is
+                # always the one of the signature, so there is no need to sort them.
+                if fixed_params:
+                    return tuple(params.items())
+                return hashkey(**params)
+
+            # cells which are too large for a bounded cache are kept here, outside
+            # of the size limit, so they aren't built again on the next call
+            oversized: dict[Hashable, KCell] = {}
+
+            def cache_cell(key: Hashable, cell: KCell) -> None:
+                try:
+                    _cache[key] = cell
+                except ValueError:
+                    config.logger.warning(
+                        "KCell {} is too large for the cache of {}, it is kept"
+                        " outside of the cache's size limit",
+                        cell.name,
+                        f.__name__,
+                    )
+                    oversized[key] = cell
 
-            @functools.wraps(f)
-            def wrapper_autocell(
-                *args: KCellParams.args, **kwargs: KCellParams.kwargs
-            ) -> KCell:
-                params: dict[str, KCellParams.kwargs | KCellParams.args] = {
-                    p.name: p.default for k, p in sig.parameters.items()
-                }
-                arg_par = list(sig.parameters.items())[: len(args)]
-                for i, (k, v) in enumerate(arg_par):
-                    params[k] = args[i]
+            def cell_params(
+                args: tuple[Any, ...], kwargs: dict[str, Any]
+            ) -> dict[str, Any]:
+                params: dict[str, Any] = param_defaults.copy()
+                params.update(zip(param_names, args))
                 params.update(kwargs)
 
-                del_parameters: list[str] = []
+                for name in required_params:
+                    if params.get(name) is inspect.Parameter.empty:
+                        del params[name]
 
                 for key, value in params.items():
                     if isinstance(value, dict):
                         params[key] = d2fs(value)
-                    if value == inspect.Parameter.empty:
-                        del_parameters.append(key)
-
-                for param in del_parameters:
-                    del params[param]
-
-                @cachetools.cached(cache=_cache)
-                @functools.wraps(f)
-                def wrapped_cell(
-                    **params: KCellParams.args | KCellParams.kwargs,
-                ) -> KCell:
-                    for key, value in params.items():
-                        if isinstance(value, frozenset):
-                            params[key] = fs2d(value)
-                    cell = f(**params)
-                    dbu = cell.kcl.layout.dbu
-                    if cell._locked:
-                        # If the cell is locked, it comes from a cache (most likely)
-                        # and should be copied first
-                        cell = cell.dup()
-                    if set_name:
-                        if basename is not None:
-                            name = get_cell_name(basename, **params)
-                        else:
-                            name = get_cell_name(f.__name__, **params)
-                        cell.name = name
-                    if set_settings:
-                        settings = cell.settings.model_dump()
-                        if basename is not None:
-                            settings["function_name"] = basename
-                        else:
-                            settings["function_name"] = f.__name__
+                return params
 
-                        for param in drop_params:
-                            params.pop(param, None)
-                        settings.update(params)
-                        cell._settings = KCellSettings(**settings)
-                    cell_info = cell.info.model_dump()
-                    for name, value in cell.info:
-                        cell_info[name] = value
-                    cell.info = Info(**cell_info)
-                    if check_instances:
-                        if any(inst.is_complex() for inst in cell.each_inst()):
-                            raise ValueError(
-                                "Most foundries will not allow off-grid instances. "
-                                "Please flatten them or add check_instances=False to"
-                                " the decorator."
+            @functools.wraps(f)
+            def wrapped_cell(**params: Any) -> KCell:
+                build_start = time.perf_counter()
+                for key, value in params.items():
+                    if isinstance(value, frozenset):
+                        params[key] = fs2d(value)
+                if _persistent_cache is not None:
+                    # fingerprinted on the first call, when the helpers defined
+                    # after the function exist as well
+                    persistent_key = _persistent_cache.key(
+                        _function_fingerprint(f), params
+                    )
+                    persistent_cell = _persistent_cache.get(persistent_key, self)
+                    if persistent_cell is not None:
+                        persistent_cell._locked = True
+                        persistent_cell._factory_call = (function_name, params)
+                        if isinstance(_cache, KCellCache):
+                            _cache.stats.build_time += time.perf_counter() - build_start
+                        return persistent_cell
+                call_params = params.copy()
+                cell = f(**params)  # type: ignore[call-arg]
+                dbu = cell.kcl.layout.dbu
+                if cell._locked:
+                    # If the cell is locked, it comes from a cache (most likely)
+                    # and should be copied first
+                    cell = cell.dup()
+                if set_name:
+                    if basename is not None:
+                        name = get_cell_name(basename, **params)
+                    else:
+                        name = get_cell_name(f.__name__, **params)
+                    cell.name = name
+                if set_settings:
+                    settings = cell.settings.model_dump()
+                    if basename is not None:
+                        settings["function_name"] = basename
+                    else:
+                        settings["function_name"] = f.__name__
+
+                    for param in drop_params:
+                        params.pop(param, None)
+                    settings.update(params)
+                    cell._settings = KCellSettings(**settings)
+                cell_info = cell.info.model_dump()
+                for name, value in cell.info:
+                    cell_info[name] = value
+                cell.info = Info(**cell_info)
+                if check_instances:
+                    if any(inst.is_complex() for inst in cell.each_inst()):
+                        raise ValueError(
+                            "Most foundries will not allow off-grid instances. "
+                            "Please flatten them or add check_instances=False to"
+                            " the decorator."
+                        )
+                if snap_ports:
+                    for port in cell.ports:
+                        if port._dcplx_trans:
+                            dup = port._dcplx_trans.dup()
+                            dup.disp = port._dcplx_trans.disp.to_itype(dbu).to_dtype(
+                                dbu
                             )
-                    if snap_ports:
-                        for port in cell.ports:
-                            if port._dcplx_trans:
-                                dup = port._dcplx_trans.dup()
-                                dup.disp = port._dcplx_trans.disp.to_itype(
-                                    dbu
-                                ).to_dtype(dbu)
-                                port.dcplx_trans = dup
-                    if add_port_layers:
-                        for port in cell.ports:
-                            if port.layer in cell.kcl.netlist_layer_mapping:
-                                if port._trans:
-                                    edge = kdb.Edge(
-                                        kdb.Point(0, -port.width // 2),
-                                        kdb.Point(0, port.width // 2),
-                                    )
+                            port.dcplx_trans = dup
+                if add_port_layers:
+                    for port in cell.ports:
+                        if port.layer in cell.kcl.netlist_layer_mapping:
+                            if port._trans:
+                                edge = kdb.Edge(
+                                    kdb.Point(0, -port.width // 2),
+                                    kdb.Point(0, port.width // 2),
+                                )
+                                cell.shapes(
+                                    cell.kcl.netlist_layer_mapping[port.layer]
+                                ).insert(port.trans * edge)
+                                if port.name:
                                     cell.shapes(
                                         cell.kcl.netlist_layer_mapping[port.layer]
-                                    ).insert(port.trans * edge)
-                                    if port.name:
-                                        cell.shapes(
-                                            cell.kcl.netlist_layer_mapping[port.layer]
-                                        ).insert(kdb.Text(port.name, port.trans))
-                                else:
-                                    dedge = kdb.DEdge(
-                                        kdb.DPoint(0, -port.d.width / 2),
-                                        kdb.DPoint(0, port.d.width / 2),
-                                    )
+                                    ).insert(kdb.Text(port.name, port.trans))
+                            else:
+                                dedge = kdb.DEdge(
+                                    kdb.DPoint(0, -port.d.width / 2),
+                                    kdb.DPoint(0, port.d.width / 2),
+                                )
+                                cell.shapes(
+                                    cell.kcl.netlist_layer_mapping[port.layer]
+                                ).insert(port.dcplx_trans * dedge)
+                                if port.name:
                                     cell.shapes(
                                         cell.kcl.netlist_layer_mapping[port.layer]
-                                    ).insert(port.dcplx_trans * dedge)
-                                    if port.name:
-                                        cell.shapes(
-                                            cell.kcl.netlist_layer_mapping[port.layer]
-                                        ).insert(
-                                            kdb.DText(
-                                                port.name, port.dcplx_trans.s_trans()
-                                            )
-                                        )
-                    cell._locked = True
-                    if cell.kcl != self:
-                        raise ValueError(
-                            "The KCell created must be using the same"
-                            " KCLayout object as the @cell decorator. "
-                            f"{self.name!r} != {cell.kcl.name!r}. Please make sure to "
-                            "use @kcl.cell and only use @cell for cells which are"
-                            " created through kfactory.kcl. To create KCells not in "
-                            "the standard KCLayout, use either custom_kcl.kcell() or "
-                            "KCell(kcl=custom_kcl)."
-                        )
-                    return cell
+                                    ).insert(
+                                        kdb.DText(port.name, port.dcplx_trans.s_trans())
+                                    )
+                cell._locked = True
+                cell._factory_call = (function_name, call_params)
+                if cell.kcl != self:
+                    raise ValueError(
+                        "The KCell created must be using the same"
+                        " KCLayout object as the @cell decorator. "
+                        f"{self.name!r} != {cell.kcl.name!r}. Please make sure to "
+                        "use @kcl.cell and only use @cell for cells which are"
+                        " created through kfactory.kcl. To create KCells not in "
+                        "the standard KCLayout, use either custom_kcl.kcell() or "
+                        "KCell(kcl=custom_kcl)."
+                    )
+                if _persistent_cache is not None:
+                    _persistent_cache.put(persistent_key, cell, function_name)
+                if isinstance(_cache, KCellCache):
+                    _cache.stats.build_time += time.perf_counter() - build_start
+                return cell
 
-                _cell = wrapped_cell(**params)
+            @functools.wraps(f)
+            def wrapper_autocell(
+                *args: KCellParams.args, **kwargs: KCellParams.kwargs
+            ) -> KCell:
+                params = cell_params(args, kwargs)
+                cell_hash = cell_key(params)
+                try:
+                    _cell = _cache[cell_hash]
+                except KeyError:
+                    _oversized_cell = oversized.get(cell_hash)
+                    if _oversized_cell is not None and not _oversized_cell._destroyed():
+                        _cell = _oversized_cell
+                    else:
+                        _cell = wrapped_cell(**params)
+                        cache_cell(cell_hash, _cell)
 
                 if info is not None:
                     _cell.info.update(info)
@@ -2786,11 +3702,11 @@ class KCLayout(BaseModel, arbitrary_types_allowed=True, extra="allow"):
                 for pp in post_process:
                     pp(_cell)
 
-                if _cell._destroyed():
+                if sweep_destroyed and _cell._destroyed():
                     # If the any cell has been destroyed, we should clean up the cache.
                     # Delete all the KCell entrances in the cache which have
                     # `_destroyed() == True`
-                    _deleted_cell_hashes: list[_HashedTuple] = [
+                    _deleted_cell_hashes: list[Hashable] = [
                         _hash_item
                         for _hash_item, _cell_item in _cache.items()
                         if _cell_item._destroyed()
@@ -2798,9 +3714,14 @@ class KCLayout(BaseModel, arbitrary_types_allowed=True, extra="allow"):
                     for _dch in _deleted_cell_hashes:
                         del _cache[_dch]
                     _cell = wrapped_cell(**params)
+                    cache_cell(cell_hash, _cell)
 
                 return _cell
 
+            def cache_built_cell(cell: KCell, kwargs: dict[str, Any]) -> None:
+                cache_cell(cell_key(cell_params((), kwargs)), cell)
+
+            self._cache_setters[function_name] = cache_built_cell
             if register_factory:
                 self.factories[basename or f.__name__] = wrapper_autocell
             return wrapper_autocell
@@ -3004,6 +3925,10 @@ class KCLayout(BaseModel, arbitrary_types_allowed=True, extra="allow"):
 
         return decorator_autocell if _func is None else decorator_autocell(_func)
 
+    def cache_stats(self) -> dict[str, CellCacheStats]:
+        """Statistics of the registered [cell caches][kfactory.kcell.KCellCache]."""
+        return {name: cache.stats for name, cache in self.cell_caches.items()}
+
     def kcell(self, name: str | None = None, ports: Ports | None = None) -> KCell:
         """Create a new cell based ont he pdk's layout object."""
         return KCell(name=name, kcl=self, ports=ports)
@@ -3063,6 +3988,10 @@ class KCLayout(BaseModel, arbitrary_types_allowed=True, extra="allow"):
     def dup(self, init_cells: bool = True) -> KCLayout:
         """Create a duplication of the `~KCLayout` object.
 
+        The KCells of the copy share their settings and, until they are accessed
+        for the first time, the ports and info of locked cells with the original
+        ones.
+
         Args:
             init_cells: initialize the all cells in the new KCLayout object
 
@@ -3072,17 +4001,8 @@ class KCLayout(BaseModel, arbitrary_types_allowed=True, extra="allow"):
         kcl = KCLayout(self.name + "_DUPLICATE")
         kcl.layout.assign(self.layout.dup())
         if init_cells:
-            for i, kc in self.kcells.items():
-                kcl.kcells[i] = KCell(
-                    name=kc.name,
-                    kcl=kcl,
-                    kdb_cell=kcl.layout.cell(kc.name),
-                    ports=kc.ports,
-                )
-                kcl.kcells[i]._settings = kc.settings.model_copy()
-                kcl.kcells[i].info = kc.info.model_copy(
-                    update={n: v for n, v in kc.info}
-                )
+            for kc in self.kcells.values():
+                kc._lazy_dup(kcl)
         kcl.rename_function = self.rename_function
         return kcl
 
@@ -3119,25 +4039,32 @@ class KCLayout(BaseModel, arbitrary_types_allowed=True, extra="allow"):
             )
 
     def delete_cell(self, cell: KCell | int) -> None:
-        """Delete a cell in the kcl object."""
-        if isinstance(cell, int):
-            self.layout.delete_cell(cell)
-            del self.kcells[cell]
-        else:
-            ci = cell.cell_index()
-            self.layout.delete_cell(ci)
-            del self.kcells[ci]
+        """Delete a cell in the kcl object.
+
+        Locked cells can be deleted as well.
+        """
+        ci = cell if isinstance(cell, int) else cell.cell_index()
+        self._unlock_cells([ci])
+        self.layout.delete_cell(ci)
+        del self.kcells[ci]
 
     def delete_cell_rec(self, cell_index: int) -> None:
         """Deletes a KCell plus all subcells."""
+        self._unlock_cells([cell_index, *self.layout.cell(cell_index).called_cells()])
         self.layout.delete_cell_rec(cell_index)
         self.rebuild()
 
     def delete_cells(self, cell_index_list: Sequence[int]) -> None:
         """Delete a sequence of cell by indexes."""
+        self._unlock_cells(cell_index_list)
         self.layout.delete_cells(cell_index_list)
         self.rebuild()
 
+    def _unlock_cells(self, cell_indexes: Iterable[int]) -> None:
+        """Unlock KLayout cells, KLayout refuses to delete locked cells."""
+        for ci in cell_indexes:
+            self.layout.cell(ci).locked = False
+
     def rebuild(self) -> None:
         """Rebuild the KCLayout based on the Layoutt object."""
         kcells2delete: list[int] = []
@@ -3182,18 +4109,14 @@ class KCLayout(BaseModel, arbitrary_types_allowed=True, extra="allow"):
                     raise
 
                 kdb_c = self.layout.cell(obj)
-                c = KCell(name=kdb_c.name, kcl=self, kdb_cell=self.layout.cell(obj))
-                c.get_meta_data()
-                return c
+                return KCell(name=kdb_c.name, kcl=self, kdb_cell=kdb_c)
         else:
-            if self.layout.cell(obj) is not None:
+            kdb_c = self.layout.cell(obj)
+            if kdb_c is not None:
                 try:
-                    return self.kcells[self.layout.cell(obj).cell_index()]
+                    return self.kcells[kdb_c.cell_index()]
                 except KeyError:
-                    kdb_c = self.layout.cell(obj)
-                    c = KCell(name=kdb_c.name, kcl=self, kdb_cell=self.layout.cell(obj))
-                    c.get_meta_data()
-                    return c
+                    return KCell(name=kdb_c.name, kcl=self, kdb_cell=kdb_c)
             from pprint import pformat
 
             raise ValueError(
@@ -3209,6 +4132,8 @@ class KCLayout(BaseModel, arbitrary_types_allowed=True, extra="allow"):
         register_cells: bool = False,
         test_merge: bool = True,
         update_kcl_meta_data: Literal["overwrite", "skip", "drop"] = "skip",
+        lazy: bool = False,
+        cell_filter: str | None = None,
     ) -> kdb.LayerMap:
         """Read a GDS file into the existing Layout.
 
@@ -3230,42 +4155,40 @@ class KCLayout(BaseModel, arbitrary_types_allowed=True, extra="allow"):
                 overwrite: overwrite existing info entries
                 skip: keep existing info values
                 drop: don't add any new info
+            lazy: Only used with `register_cells`. The KCells only create their
+                instances and read their ports, settings and info when one of them
+                is accessed for the first time.
+            cell_filter: Glob pattern of the new cell names to keep. The matching
+                cells and all their child cells are kept, all other cells which
+                didn't exist in the layout before are deleted again. This is a
+                prune after the read: the whole file is still read, but the
+                deleted cells don't stay in the layout and no KCells are
+                registered for them.
         """
-        layout_b = kdb.Layout()
-        layout_b.read(str(filename), options)
+        fn = str(Path(filename).expanduser().resolve())
+        cells = {c.cell_index() for c in self.layout.each_cell()}
         if (
-            self.cells() > 0
-            and test_merge
-            and (
-                options.cell_conflict_resolution
-                != kdb.LoadLayoutOptions.CellConflictResolution.RenameCell
-            )
+            cells
+            and options.cell_conflict_resolution
+            != kdb.LoadLayoutOptions.CellConflictResolution.RenameCell
         ):
-            for kcell in self.kcells.values():
-                kcell.set_meta_data()
-            diff = MergeDiff(
-                layout_a=self.layout,
-                layout_b=layout_b,
-                name_a=self.name,
-                name_b=Path(filename).stem,
-            )
-            diff.compare()
-            if diff.dbu_differs:
-                raise MergeError("Layouts' DBU differ. Check the log for more info.")
-            elif diff.diff_xor.cells() > 0:
-                diff_kcl = KCLayout(self.name + "_XOR")
-                diff_kcl.layout.assign(diff.diff_xor)
-                show(diff_kcl)
-
-                raise MergeError(
-                    f"Layout {self.name} cannot merge with layout "
-                    f"{Path(filename).stem} safely. See the error messages or"
-                    f"or check with KLayout."
-                )
-
-        cells = set(self.layout.cells("*"))
-        fn = str(Path(filename).expanduser().resolve())
-        lm = self.layout.read(fn, options)
+            lm, merged = self._read_merge(fn, options, test_merge)
+        else:
+            lm = self.layout.read(fn, options)
+            merged = []
+        new_cells = [
+            c.cell_index()
+            for c in self.layout.each_cell()
+            if c.cell_index() not in cells
+        ]
+        if cell_filter is not None:
+            keep = set(cells)
+            for c in self.layout.cells(cell_filter):
+                keep.add(c.cell_index())
+            for ci in list(keep):
+                keep.update(self.layout.cell(ci).called_cells())
+            self.layout.delete_cells([ci for ci in new_cells if ci not in keep])
+            new_cells = [ci for ci in new_cells if ci in keep]
         info, settings = self.get_meta_data()
 
         match update_kcl_meta_data:
@@ -3288,21 +4211,246 @@ class KCLayout(BaseModel, arbitrary_types_allowed=True, extra="allow"):
                     ", available strategies are 'overwrite', 'skip', or 'drop'"
                 )
         meta_format = settings.get("meta_format") or config.meta_format
-        load_cells = set(layout_b.cells("*"))
-        new_cells = load_cells - cells
 
         if register_cells:
-            for c in new_cells:
-                kc = KCell(kdb_cell=c, kcl=self)
-                kc.get_meta_data(meta_format=meta_format)
-
-        for c in load_cells & cells:
-            kc = self.kcells[c.cell_index()]
-            kc.get_meta_data(meta_format=meta_format)
-            kc.rebuild()
+            for ci in new_cells:
+                kdb_c = self.layout.cell(ci)
+                kc = KCell(name=kdb_c.name, kcl=self, kdb_cell=kdb_c, lazy=True)
+                kc._lazy_meta_format = meta_format
+                if not lazy:
+                    kc._load()
+
+        for ci in merged:
+            existing = self.kcells.get(ci)
+            if existing is not None:
+                # locked cells keep their ports, settings and info
+                if not existing._locked:
+                    existing.get_meta_data(meta_format=meta_format)
+                existing.rebuild()
+            # the content changed, drop the cached hashes
+            for caller in [ci, *self.layout.cell(ci).caller_cells()]:
+                kcell = self.kcells.get(caller)
+                if kcell is not None:
+                    kcell._hash = None
 
         return lm
 
+    def _read_merge(
+        self, filename: str, options: kdb.LoadLayoutOptions, test_merge: bool
+    ) -> tuple[kdb.LayerMap, list[int]]:
+        """Read a file into the populated layout and merge cells with equal names.
+
+        The file is read into a separate layout and its cells are moved into this
+        one. Only the existing cells whose names are also in the file are
+        temporarily renamed for this, so the cost doesn't depend on the size of
+        the existing layout. Cells whose name exists in both are then compared by
+        a hash of their content, and only if the hashes differ, a
+        [MergeDiff][kfactory.kcell.MergeDiff] of them is created. Afterwards the
+        read cells are merged into the existing ones according to the
+        `cell_conflict_resolution` of the options, following `kdb.Layout.read`:
+        read cells which are only used by a single skipped cell are deleted with
+        it, and children of overwritten cells which aren't used anymore are
+        deleted. Unlike KLayout, skipping never deletes cells which existed
+        before the read. The layout keeps its dbu, read cells are scaled to it.
+
+        Returns:
+            The layer map of the read and the indexes of the existing cells which
+            were merged with a read cell.
+        """
+        layout = self.layout
+        dbu = layout.dbu
+        layout_b = kdb.Layout()
+        lm_b = layout_b.read(filename, options)
+
+        names: dict[int, str] = {}
+        for c in layout_b.each_cell():
+            existing = layout.cell(c.name)
+            if existing is not None:
+                names[existing.cell_index()] = c.name
+        moved: list[int] = []
+
+        def restore() -> None:
+            delete = [ci for ci in moved if layout.is_valid_cell_index(ci)]
+            if delete:
+                layout.delete_cells(delete)
+            for ci, name in names.items():
+                layout.rename_cell(ci, name)
+
+        if test_merge and layout_b.dbu != dbu:
+            config.logger.critical(
+                f"DBU differs between existing layout {dbu!r}"
+                f" and the new layout {layout_b.dbu!r}."
+            )
+            raise MergeError("Layouts' DBU differ. Check the log for more info.")
+
+        for ci, name in names.items():
+            layout.rename_cell(ci, f"{name}$kfactory_read${ci}")
+        diff: MergeDiff | None = None
+        try:
+            # cells moved from a layout with a different dbu are scaled to the dbu
+            # of this layout
+            top_b = layout_b.create_cell("$kfactory_read")
+            for ci_top in layout_b.top_cells():
+                if ci_top.cell_index() != top_b.cell_index():
+                    top_b.insert(kdb.CellInstArray(ci_top.cell_index(), kdb.Trans()))
+            top_a = layout.create_cell("$kfactory_read")
+            top_a.move_tree(top_b)
+            moved = list(top_a.called_cells())
+            layout.delete_cell(top_a.cell_index())
+
+            cis = {name: ci for ci, name in names.items()}
+            pairs = {
+                ci_b: cis[layout.cell(ci_b).name]
+                for ci_b in moved
+                if layout.cell(ci_b).name in cis
+            }
+            if test_merge:
+                for ci_a in pairs.values():
+                    kcell = self.kcells.get(ci_a)
+                    if kcell is not None and not kcell._destroyed():
+                        kcell.set_meta_data(skip_unchanged=True)
+                differing = [
+                    (ci_a, ci_b)
+                    for ci_b, ci_a in pairs.items()
+                    if _cell_content_hash(layout.cell(ci_a), pairs)
+                    != _cell_content_hash(layout.cell(ci_b), pairs)
+                ]
+                if differing:
+                    for ci, name in names.items():
+                        layout.rename_cell(ci, name)
+                    diff = self._merge_diff(filename, differing)
+                    if diff.diff_xor.cells() == 0:
+                        # only a different representation, e.g. duplicate shapes
+                        diff = None
+                        for ci, name in names.items():
+                            layout.rename_cell(ci, f"{name}$kfactory_read${ci}")
+        except BaseException:
+            restore()
+            raise
+        if diff is not None:
+            restore()
+            diff_kcl = KCLayout(self.name + "_XOR")
+            diff_kcl.layout.assign(diff.diff_xor)
+            show(diff_kcl)
+
+            raise MergeError(
+                f"Layout {self.name} cannot merge with layout "
+                f"{Path(filename).stem} safely. See the error messages or"
+                f"or check with KLayout."
+            )
+
+        skip = (
+            options.cell_conflict_resolution
+            == kdb.LoadLayoutOptions.CellConflictResolution.SkipNewCell
+        )
+        overwrite = (
+            options.cell_conflict_resolution
+            == kdb.LoadLayoutOptions.CellConflictResolution.OverwriteCell
+        )
+        # KLayout refuses to modify locked cells, lock them again afterwards
+        locked = [ci_a for ci_a in pairs.values() if layout.cell(ci_a).locked]
+        for ci_a in locked:
+            layout.cell(ci_a).locked = False
+        # children of overwritten cells, deleted if they aren't used anymore
+        old_children: set[int] = set()
+        if not skip:
+            for ci_b, ci_a in pairs.items():
+                cell_a = layout.cell(ci_a)
+                cell_b = layout.cell(ci_b)
+                if overwrite:
+                    old_children.update(cell_a.each_child_cell())
+                    cell_a.clear()
+                    cell_a.clear_meta_info()
+                cell_insts = {inst.cell_inst for inst in cell_a.each_inst()}
+                for inst in cell_b.each_inst():
+                    cell_inst = inst.cell_inst.dup()
+                    cell_inst.cell_index = pairs.get(
+                        cell_inst.cell_index, cell_inst.cell_index
+                    )
+                    # like KLayout's AddToCell, don't duplicate existing instances
+                    if cell_inst not in cell_insts:
+                        cell_a.insert(cell_inst, inst.prop_id)
+                cell_a.copy_shapes(cell_b)
+                cell_a.copy_meta_info(cell_b)
+
+        # like KLayout, the read cells which are only used by a single skipped
+        # cell are dropped with it, cells which existed before are always kept
+        drop: set[int] = set()
+        if skip:
+            for ci_b in pairs:
+                owned = {ci_b}
+                stack = [ci_b]
+                while stack:
+                    for child in layout.cell(stack.pop()).each_child_cell():
+                        if child in owned or child in pairs:
+                            continue
+                        users = layout.cell(child).each_parent_cell()
+                        if all(user in owned for user in users):
+                            owned.add(child)
+                            stack.append(child)
+                drop |= owned
+        drop |= pairs.keys()
+
+        parents: set[int] = set()
+        for ci_b in pairs:
+            parents.update(layout.cell(ci_b).each_parent_cell())
+        for parent in parents - drop:
+            for inst in list(layout.cell(parent).each_inst()):
+                if inst.cell_index in pairs:
+                    inst.cell_index = pairs[inst.cell_index]
+        if drop:
+            layout.delete_cells(list(drop))
+        merged = set(pairs.values())
+        stack = list(old_children)
+        while stack:
+            ci = stack.pop()
+            if (
+                ci not in merged
+                and layout.is_valid_cell_index(ci)
+                and layout.cell(ci).parent_cells() == 0
+            ):
+                stack.extend(layout.cell(ci).each_child_cell())
+                layout.cell(ci).locked = False
+                layout.delete_cell(ci)
+        for ci_a in locked:
+            layout.cell(ci_a).locked = True
+        for ci, name in names.items():
+            layout.rename_cell(ci, name)
+        for meta in layout_b.each_meta_info():
+            layout.add_meta_info(meta)
+
+        lm = kdb.LayerMap()
+        for li_b in layout_b.layer_indexes():
+            expr = lm_b.mapping_str(li_b)
+            if expr:
+                lm.map(expr, layout.layer(layout_b.get_info(li_b)))
+
+        return lm, list(pairs.values())
+
+    def _merge_diff(self, filename: str, differing: list[tuple[int, int]]) -> MergeDiff:
+        """Compare the trees of pairs of cells geometrically."""
+        layout_a = kdb.Layout()
+        layout_a.dbu = self.layout.dbu
+        layout_b = kdb.Layout()
+        layout_b.dbu = self.layout.dbu
+        for ci_a, ci_b in differing:
+            cell_a = self.layout.cell(ci_a)
+            cell_b = self.layout.cell(ci_b)
+            copy_a = layout_a.create_cell(cell_a.name)
+            copy_a.copy_tree(cell_a)
+            copy_a.copy_meta_info(cell_a)
+            copy_b = layout_b.create_cell(cell_a.name)
+            copy_b.copy_tree(cell_b)
+            copy_b.copy_meta_info(cell_b)
+        diff = MergeDiff(
+            layout_a=layout_a,
+            layout_b=layout_b,
+            name_a=self.name,
+            name_b=Path(filename).stem,
+        )
+        diff.compare_sharded()
+        return diff
+
     def get_meta_data(self) -> tuple[dict[str, Any], dict[str, Any]]:
         """Read KCLayout meta info from the KLayout object."""
         settings = {}
@@ -3317,7 +4465,10 @@ class KCLayout(BaseModel, arbitrary_types_allowed=True, extra="allow"):
 
     def set_meta_data(self) -> None:
         """Set the info/settings of the KCLayout."""
-        for name, setting in self.settings.model_dump().items():
+        settings = self.settings.model_dump()
+        if config.meta_format == "v3":
+            settings["meta_format"] = "v3"
+        for name, setting in settings.items():
             self.add_meta_info(
                 kdb.LayoutMetaInfo(f"kfactory:settings:{name}", setting, None, True)
             )
@@ -3358,29 +4509,231 @@ class KCLayout(BaseModel, arbitrary_types_allowed=True, extra="allow"):
             options: KLayout options to load from the GDS. Can determine how merge
                 conflicts are handled for example. See
                 https://www.klayout.de/doc-qt5/code/class_LoadLayoutOptions.html
-            set_meta: Make sure all the cells have their metadata set
+            set_meta: Make sure all the cells have their metadata set. Only cells
+                whose ports, settings or info changed since the last write are
+                updated.
             convert_external_cells: Whether to make KCells not in this KCLayout to
 
+        The time spent on metadata and on streaming is stored in
+        [write_stats][kfactory.kcell.KCLayout.write_stats].
         """
+        stats = WriteStats()
+        start = time.perf_counter()
         match (set_meta, convert_external_cells):
             case (True, True):
                 self.set_meta_data()
                 for kcell in self.kcells.values():
                     if not kcell._destroyed():
-                        kcell.set_meta_data()
+                        if kcell.set_meta_data(skip_unchanged=True):
+                            stats.cells_updated += 1
+                        else:
+                            stats.cells_skipped += 1
                         if kcell.is_library_cell():
                             kcell.convert_to_static(recursive=True)
             case (True, False):
-                self.set_meta_data()
-                for kcell in self.kcells.values():
-                    if not kcell._destroyed():
-                        kcell.set_meta_data()
+                self._set_kcells_meta_data(stats)
             case (False, True):
                 for kcell in self.kcells.values():
                     if kcell.is_library_cell() and not kcell._destroyed():
                         kcell.convert_to_static(recursive=True)
 
-        return self.layout.write(str(filename), options)
+        stream_start = time.perf_counter()
+        stats.meta_time = stream_start - start
+        self.layout.write(str(filename), options)
+        stats.stream_time = time.perf_counter() - stream_start
+        self.write_stats = stats
+        config.logger.debug(
+            "Wrote {} (metadata: {:.3f}s, {} cells updated, {} skipped;"
+            " stream: {:.3f}s)",
+            filename,
+            stats.meta_time,
+            stats.cells_updated,
+            stats.cells_skipped,
+            stats.stream_time,
+        )
+
+    def _set_kcells_meta_data(self, stats: WriteStats) -> None:
+        """Set the metadata of the layout and all changed KCells."""
+        self.set_meta_data()
+        for kcell in self.kcells.values():
+            if not kcell._destroyed():
+                if kcell.set_meta_data(skip_unchanged=True):
+                    stats.cells_updated += 1
+                else:
+                    stats.cells_skipped += 1
+
+    def build_parallel(
+        self,
+        factory: Callable[..., KCell],
+        param_list: Iterable[dict[str, Any]],
+        workers: int | None = None,
+    ) -> list[KCell]:
+        """Build the cells of a factory for many parameter sets in worker processes.
+
+        Each worker process builds its cells in its own copy of this KCLayout, so
+        the factory must be picklable (defined at module level) and the module
+        must set up the KCLayout when it is imported. The cells are sent back as
+        OASIS including their metadata and read into this KCLayout. Cells which
+        already exist here by name, e.g. children shared between the built cells,
+        are kept and not read again.
+
+        The cells and their child cells are added to the caches of the factories
+        which built them, so calling a factory with the same parameters afterwards
+        returns them. Child cells whose factory or parameters can't be resolved
+        here are only reused by name.
+
+        Args:
+            factory: A function decorated with [cell][kfactory.kcell.KCLayout.cell]
+                of this KCLayout.
+            param_list: Keyword arguments for each cell.
+            workers: Number of worker processes. Defaults to `config.n_threads`.
+                With one worker the cells are built in this process.
+
+        Returns:
+            The built cells in the order of `param_list`.
+        """
+        param_list = list(param_list)
+        workers = min(workers or config.n_threads, len(param_list))
+        if workers <= 1:
+            return [factory(**params) for params in param_list]
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(
+                pool.map(
+                    _build_cell_oasis,
+                    [factory] * len(param_list),
+                    param_list,
+                    chunksize=max(1, len(param_list) // (4 * workers)),
+                )
+            )
+
+        function_name = f"{factory.__module__}.{factory.__qualname__}"
+        options = load_layout_options()
+        cells: list[KCell] = []
+        for params, (name, data, children) in zip(param_list, results):
+            if self.layout.cell(name) is None:
+                self.layout.read_bytes(data, options)
+            self._register_factory_cells(children)
+            self._register_factory_cells([(name, function_name, params)])
+            cells.append(self[name])
+        return cells
+
+    def _register_factory_cells(
+        self, cells: Iterable[tuple[str, str, dict[str, Any] | None]]
+    ) -> None:
+        """Add read cells to the caches of the factories which built them.
+
+        Args:
+            cells: Name, factory (`module.qualname`) and parameters of each cell.
+                Cells without parameters, or whose factory isn't a
+                [cell][kfactory.kcell.KCLayout.cell] of this KCLayout, are only
+                locked.
+        """
+        for name, function_name, params in cells:
+            kdb_cell = self.layout.cell(name)
+            if kdb_cell is None:
+                continue
+            cell = self[kdb_cell.cell_index()]
+            cell._locked = True
+            cache_setter = self._cache_setters.get(function_name)
+            if params is not None and cache_setter is not None:
+                cell._factory_call = (function_name, params)
+                cache_setter(cell, params)
+
+    def write_many(
+        self,
+        targets: Mapping[str | Path, KCell | KCLayout],
+        options: kdb.SaveLayoutOptions = save_layout_options(),
+        set_meta: bool = True,
+        n_threads: int | None = None,
+        progress: bool = False,
+    ) -> dict[Path, WriteStats]:
+        """Write multiple KCells and/or KCLayouts to files concurrently.
+
+        A KCLayout target is written completely, a KCell target with all its child
+        cells. The targets can belong to any KCLayout, e.g. a chip and all the
+        libraries it uses.
+
+        Metadata is set on the calling thread. KLayout can't stream the same layout
+        from multiple threads at once, therefore targets sharing a layout are copied
+        into a layout of their own first. Afterwards all files are streamed in a
+        thread pool. The output doesn't depend on the order the threads run in.
+
+        Args:
+            targets: Mapping of file paths to the KCell or KCLayout to write.
+            options: KLayout options to save the files with.
+            set_meta: Make sure all the cells have their metadata set.
+            n_threads: Number of threads to stream with. Defaults to
+                `config.n_threads`.
+            progress: Show a progress bar of the streamed files.
+
+        Returns:
+            Timing breakdown per file. `meta_time` includes copying the layout.
+        """
+        kcls_used: dict[int, int] = {}
+        for target in targets.values():
+            _kcl = target if isinstance(target, KCLayout) else target.kcl
+            kcls_used[id(_kcl)] = kcls_used.get(id(_kcl), 0) + 1
+
+        jobs: list[tuple[Path, kdb.Layout, kdb.SaveLayoutOptions]] = []
+        write_stats: dict[Path, WriteStats] = {}
+        for filename, target in targets.items():
+            stats = WriteStats()
+            start = time.perf_counter()
+            _kcl = target if isinstance(target, KCLayout) else target.kcl
+            shared = kcls_used[id(_kcl)] > 1
+            _options = options
+            if isinstance(target, KCLayout):
+                if set_meta:
+                    target._set_kcells_meta_data(stats)
+                layout = target.layout.dup() if shared else target.layout
+            else:
+                if set_meta:
+                    _kcl.set_meta_data()
+                    for kcell in [
+                        *(_kcl[ci] for ci in target.called_cells()),
+                        target,
+                    ]:
+                        if kcell.set_meta_data(skip_unchanged=True):
+                            stats.cells_updated += 1
+                        else:
+                            stats.cells_skipped += 1
+                if shared:
+                    layout = kdb.Layout()
+                    layout.dbu = _kcl.layout.dbu
+                    for meta in _kcl.layout.each_meta_info():
+                        layout.add_meta_info(meta)
+                    cell = layout.create_cell(target.name)
+                    cell.copy_tree(target._kdb_cell)
+                    cell.copy_meta_info(target._kdb_cell)
+                else:
+                    layout = _kcl.layout
+                    _options = options.dup()
+                    _options.select_cell(target.cell_index())
+            stats.meta_time = time.perf_counter() - start
+            path = Path(filename)
+            write_stats[path] = stats
+            jobs.append((path, layout, _options))
+
+        def stream(job: tuple[Path, kdb.Layout, kdb.SaveLayoutOptions]) -> Path:
+            path, layout, _options = job
+            start = time.perf_counter()
+            layout.write(str(path), _options)
+            write_stats[path].stream_time = time.perf_counter() - start
+            return path
+
+        with (
+            ThreadPoolExecutor(max_workers=n_threads or config.n_threads) as executor,
+            rich.progress.Progress(
+                console=config.console, disable=not progress, transient=True
+            ) as bar,
+        ):
+            task = bar.add_task("Writing files", total=len(jobs))
+            for path in executor.map(stream, jobs):
+                config.logger.debug("Wrote {}", path)
+                bar.advance(task)
+
+        return write_stats
 
     def top_kcells(self) -> list[KCell]:
         """Return the top KCells."""
@@ -3859,15 +5212,32 @@ class Port:
     """
 
     yaml_tag = "!Port"
-    name: str | None
+    __slots__ = (
+        "_name",
+        "kcl",
+        "width",
+        "_layer",
+        "_trans",
+        "_dcplx_trans",
+        "_info",
+        "_port_type",
+        "_d",
+    )
+    _name: str | None
     kcl: KCLayout
     width: int
-    layer: int | LayerEnum
+    _layer: int | LayerEnum
     _trans: kdb.Trans | None
     _dcplx_trans: kdb.DCplxTrans | None
-    info: Info = Info()
-    port_type: str
-    d: UMPort
+    _info: Info | None
+    _port_type: str
+    _d: UMPort | None
+    _changes: ClassVar[int] = 0
+    """Counts changes of indexed attributes (name, layer, port_type) of any port.
+
+    Used by [Ports][kfactory.kcell.Ports] to check whether its indexes are still
+    valid.
+    """
 
     @overload
     def __init__(
@@ -3946,18 +5316,20 @@ class Port:
     ):
         """Create a port from dbu or um based units."""
         self.kcl = kcl or _get_default_kcl()
-        self.d = UMPort(self)
-        self.info = Info(**info)
+        self._d = None
+        self._info = Info(**info) if info else None
+        self._trans = None
+        self._dcplx_trans = None
         if port is not None:
-            self.name = port.name if name is None else name
+            self._name = port.name if name is None else name
 
             if port.dcplx_trans.is_complex():
                 self.dcplx_trans = port.dcplx_trans
             else:
                 self.trans = port.trans
 
-            self.port_type = port.port_type
-            self.layer = port.layer
+            self._port_type = port.port_type
+            self._layer = port.layer
             self.width = port.width
         elif (width is None and dwidth is None) or layer is None:
             raise ValueError("width, layer must be given if the 'port is None'")
@@ -3965,12 +5337,12 @@ class Port:
             if trans is not None:
                 # self.width = cast(int, width)
                 if isinstance(trans, str):
-                    self.trans = kdb.Trans.from_s(trans)
+                    self._trans = kdb.Trans.from_s(trans)
                 else:
-                    self.trans = trans.dup()
+                    self._trans = trans.dup()
                 assert width is not None
                 self.width = width
-                self.port_type = port_type
+                self._port_type = port_type
             elif dcplx_trans is not None:
                 if isinstance(dcplx_trans, str):
                     self.dcplx_trans = kdb.DCplxTrans.from_s(dcplx_trans)
@@ -3986,16 +5358,94 @@ class Port:
                 assert center is not None
                 self.trans = kdb.Trans(angle, mirror_x, *center)
                 self.width = width
-                self.port_type = port_type
+                self._port_type = port_type
             elif dwidth is not None:
                 assert dangle is not None
                 assert dcenter is not None
                 self.dcplx_trans = kdb.DCplxTrans(1, dangle, mirror_x, *dcenter)
 
             assert layer is not None
-            self.name = name
-            self.layer = layer
-            self.port_type = port_type
+            self._name = name
+            self._layer = layer
+            self._port_type = port_type
+
+    @property
+    def info(self) -> Info:
+        """Additional info about the port. Created on first access."""
+        if self._info is None:
+            self._info = Info()
+        return self._info
+
+    @info.setter
+    def info(self, value: Info) -> None:
+        self._info = value
+
+    @property
+    def d(self) -> UMPort:
+        """Access port info in um. Created on first access."""
+        if self._d is None:
+            self._d = UMPort(self)
+        return self._d
+
+    def _copy_with(
+        self,
+        trans: kdb.Trans | None = None,
+        dcplx_trans: kdb.DCplxTrans | None = None,
+    ) -> Port:
+        """Copy the port with a new transformation.
+
+        The transformation is not copied again, so it must not be shared with
+        another port. The info is copied deeply and only if it exists.
+        """
+        port = Port.__new__(Port)
+        port._name = self._name
+        port.kcl = self.kcl
+        port.width = self.width
+        port._layer = self._layer
+        port._port_type = self._port_type
+        port._info = (
+            self._info.model_copy(deep=True) if self._info is not None else None
+        )
+        port._d = None
+        if trans is not None:
+            port._trans = trans
+            port._dcplx_trans = None
+        else:
+            assert dcplx_trans is not None
+            port._trans = None
+            port._dcplx_trans = None
+            port.dcplx_trans = dcplx_trans
+        return port
+
+    @property
+    def name(self) -> str | None:
+        """Name of the port."""
+        return self._name
+
+    @name.setter
+    def name(self, value: str | None) -> None:
+        Port._changes += 1
+        self._name = value
+
+    @property
+    def layer(self) -> int | LayerEnum:
+        """Layer index or LayerEnum of the port."""
+        return self._layer
+
+    @layer.setter
+    def layer(self, value: int | LayerEnum) -> None:
+        Port._changes += 1
+        self._layer = value
+
+    @property
+    def port_type(self) -> str:
+        """Type of the port, e.g. "optical" or "electrical"."""
+        return self._port_type
+
+    @port_type.setter
+    def port_type(self, value: str) -> None:
+        Port._changes += 1
+        self._port_type = value
 
     @classmethod
     def from_yaml(cls: type[Port], constructor, node) -> Port:  # type: ignore
@@ -4013,7 +5463,7 @@ class Port:
                 and self.name == other.name
                 and self.layer == other.layer
                 and self.port_type == other.port_type
-                and self.info == other.info
+                and (self._info or Info()) == (other._info or Info())
             ):
                 return True
         return False
@@ -4036,57 +5486,26 @@ class Port:
         Returns:
             port: a copy of the port
         """
-        info = self.info.model_dump()
         if post_trans is None:
             if self._trans:
                 if isinstance(trans, kdb.Trans):
                     _trans = trans * self.trans
-                    return Port(
-                        name=self.name,
-                        trans=_trans,
-                        layer=self.layer,
-                        port_type=self.port_type,
-                        width=self.width,
-                        kcl=self.kcl,
-                        info=info,
-                    )
+                    return self._copy_with(trans=_trans)
                 elif not trans.is_complex():
                     _trans = trans.s_trans().to_itype(self.kcl.layout.dbu) * self.trans
-                    return Port(
-                        name=self.name,
-                        trans=_trans,
-                        layer=self.layer,
-                        port_type=self.port_type,
-                        width=self.width,
-                        kcl=self.kcl,
-                        info=info,
-                    )
+                    return self._copy_with(trans=_trans)
             if isinstance(trans, kdb.Trans):
                 dtrans = kdb.DCplxTrans(trans.to_dtype(self.kcl.layout.dbu))
                 _dtrans = dtrans * self.dcplx_trans
             else:
                 _dtrans = trans * self.dcplx_trans
-            return Port(
-                name=self.name,
-                dcplx_trans=_dtrans,
-                dwidth=self.d.width,
-                layer=self.layer,
-                kcl=self.kcl,
-                port_type=self.port_type,
-                info=info,
-            )
+            return self._copy_with(dcplx_trans=_dtrans)
         else:
             if self._trans:
                 match isinstance(trans, kdb.Trans), isinstance(post_trans, kdb.Trans):
                     case True, True:
-                        return Port(
-                            name=self.name,
-                            trans=trans * self.trans * post_trans,  # type: ignore[operator]
-                            layer=self.layer,
-                            port_type=self.port_type,
-                            width=self.width,
-                            kcl=self.kcl,
-                            info=info,
+                        return self._copy_with(
+                            trans=trans * self.trans * post_trans  # type: ignore[operator]
                         )
                     case False, True:
                         if not trans.is_complex():  # type: ignore[union-attr]
@@ -4095,15 +5514,7 @@ class Port:
                                 * self.trans
                                 * post_trans
                             )
-                            return Port(
-                                name=self.name,
-                                trans=_trans,
-                                layer=self.layer,
-                                port_type=self.port_type,
-                                width=self.width,
-                                kcl=self.kcl,
-                                info=info,
-                            )
+                            return self._copy_with(trans=_trans)
                         else:
                             _dcplxtrans = (
                                 trans
@@ -4112,15 +5523,7 @@ class Port:
                                     post_trans.to_dtype(self.kcl.layout.dbu)  # type: ignore[union-attr]
                                 )
                             )
-                            return Port(
-                                name=self.name,
-                                dcplx_trans=_dcplxtrans,
-                                layer=self.layer,
-                                port_type=self.port_type,
-                                dwidth=self.d.width,
-                                kcl=self.kcl,
-                                info=info,
-                            )
+                            return self._copy_with(dcplx_trans=_dcplxtrans)
                     case True, False:
                         _dcplxtrans = (
                             (
@@ -4131,15 +5534,7 @@ class Port:
                             * self.dcplx_trans
                             * post_trans
                         )
-                        return Port(
-                            name=self.name,
-                            dcplx_trans=_dcplxtrans,
-                            layer=self.layer,
-                            port_type=self.port_type,
-                            dwidth=self.d.width,
-                            kcl=self.kcl,
-                            info=info,
-                        )
+                        return self._copy_with(dcplx_trans=_dcplxtrans)
             if isinstance(trans, kdb.Trans):
                 dtrans = kdb.DCplxTrans(trans.to_dtype(self.kcl.layout.dbu))
                 _dtrans = dtrans * self.dcplx_trans
@@ -4150,15 +5545,7 @@ class Port:
             else:
                 _dposttrans = post_trans or kdb.DCplxTrans()
 
-            return Port(
-                name=self.name,
-                dcplx_trans=_dtrans * _dposttrans,
-                dwidth=self.d.width,
-                layer=self.layer,
-                kcl=self.kcl,
-                port_type=self.port_type,
-                info=info,
-            )
+            return self._copy_with(dcplx_trans=_dtrans * _dposttrans)
 
     def copy_polar(
         self, d: int = 0, d_orth: int = 0, angle: int = 2, mirror: bool = False
@@ -4569,6 +5956,12 @@ class Instance:
     kcl: KCLayout
     ports: InstancePorts
     d: UMInstance
+    _name_changes: ClassVar[int] = 0
+    """Counts renames of any instance.
+
+    Used by [Instances][kfactory.kcell.Instances] to check whether its name index
+    is still valid.
+    """
 
     def __init__(self, kcl: KCLayout, instance: kdb.Instance) -> None:
         """Create an instance from a KLayout Instance."""
@@ -4608,6 +6001,7 @@ class Instance:
 
     @name.setter
     def name(self, value: str) -> None:
+        Instance._name_changes += 1
         self.set_property(PROPID.NAME, value)
 
     @property
@@ -4819,6 +6213,42 @@ class Instance:
             op = other
         else:
             raise ValueError("other_instance must be of type Instance or Port")
+        conn_trans = self._connection_trans(
+            port,
+            op,
+            other,
+            mirror=mirror,
+            allow_width_mismatch=allow_width_mismatch,
+            allow_layer_mismatch=allow_layer_mismatch,
+            allow_type_mismatch=allow_type_mismatch,
+        )
+        if isinstance(conn_trans, kdb.DCplxTrans):
+            self._instance.dcplx_trans = conn_trans
+        else:
+            self._instance.trans = conn_trans
+
+    def _connection_trans(
+        self,
+        port: str | Port | None,
+        op: Port,
+        other: Instance | Port,
+        *,
+        mirror: bool = False,
+        allow_width_mismatch: bool = False,
+        allow_layer_mismatch: bool = False,
+        allow_type_mismatch: bool = False,
+    ) -> kdb.Trans | kdb.DCplxTrans:
+        """Check the ports and get the transformation connecting them.
+
+        Args:
+            port: Port (or name of the port) of the cell of this instance.
+            op: The (transformed) port to connect to.
+            other: The instance `op` belongs to or `op` itself. Used for errors.
+            mirror: Connect with klayout.db.Trans.M90 instead of R180.
+            allow_width_mismatch: Skip width check between the ports if set.
+            allow_layer_mismatch: Skip layer check between the ports if set.
+            allow_type_mismatch: Skip port_type check between the ports if set.
+        """
         if isinstance(port, Port):
             p = port
         else:
@@ -4838,12 +6268,52 @@ class Instance:
             raise PortTypeMismatch(self, other, p, op)
         if p._dcplx_trans or op._dcplx_trans:
             dconn_trans = kdb.DCplxTrans.M90 if mirror else kdb.DCplxTrans.R180
-            self._instance.dcplx_trans = (
-                op.dcplx_trans * dconn_trans * p.dcplx_trans.inverted()
-            )
+            return op.dcplx_trans * dconn_trans * p.dcplx_trans.inverted()
         else:
             conn_trans = kdb.Trans.M90 if mirror else kdb.Trans.R180
-            self._instance.trans = op.trans * conn_trans * p.trans.inverted()
+            return op.trans * conn_trans * p.trans.inverted()
+
+    def connect_chain(
+        self,
+        port: str | None,
+        chain: Iterable[tuple[Instance, str | Port | None, str | None]],
+        *,
+        mirror: bool = False,
+        allow_width_mismatch: bool = False,
+        allow_layer_mismatch: bool = False,
+        allow_type_mismatch: bool = False,
+    ) -> None:
+        """Connect a chain of instances to a port of this instance.
+
+        Each element of the chain is a tuple `(instance, in_port, out_port)`. The
+        `in_port` of the instance is connected to the `out_port` of the previous
+        element, the first one to `port` of this instance. All instances are placed in
+        one batch with [connect_many][kfactory.kcell.KCell.connect_many].
+
+        Args:
+            port: Name of the port of this instance the chain starts at.
+            chain: Instances with their input and output port names.
+            mirror: Connect with klayout.db.Trans.M90 instead of R180.
+            allow_width_mismatch: Skip width check between the ports if set.
+            allow_layer_mismatch: Skip layer check between the ports if set.
+            allow_type_mismatch: Skip port_type check between the ports if set.
+        """
+        connections: list[
+            tuple[Instance, str | Port | None, Instance | Port, str | None]
+        ] = []
+        previous = self
+        previous_port = port
+        for inst, in_port, out_port in chain:
+            connections.append((inst, in_port, previous, previous_port))
+            previous = inst
+            previous_port = out_port
+        self.parent_cell.connect_many(
+            connections,
+            mirror=mirror,
+            allow_width_mismatch=allow_width_mismatch,
+            allow_layer_mismatch=allow_layer_mismatch,
+            allow_type_mismatch=allow_type_mismatch,
+        )
 
     @classmethod
     def to_yaml(cls, representer, node):  # type: ignore[no-untyped-def]
@@ -5300,24 +6770,65 @@ class UMInstance:
 class Instances:
     """Holder for instances.
 
-    Allows retrieval by name or index
+    Allows retrieval by name or index. Instances are indexed by name lazily. As
+    names of unnamed instances depend on their position, the index is checked on
+    each lookup and rebuilt if the found instance doesn't match anymore. Destroyed
+    instances are swept whenever the index is rebuilt.
     """
 
     def __init__(self) -> None:
         """Constructor."""
         self._insts: list[Instance] = []
+        self._name_index: dict[str, list[int]] = {}
+        self._indexed = 0
+        self._index_changes: int | None = None
 
     def append(self, inst: Instance) -> None:
         """Append a new instance."""
         self._insts.append(inst)
 
+    def _index(self, rebuild: bool = False) -> None:
+        """Update the name index.
+
+        Args:
+            rebuild: Sweep destroyed instances and rebuild the whole index.
+                Otherwise only instances appended since the last update are
+                indexed, as long as no instance has been renamed.
+        """
+        if (
+            rebuild
+            or self._index_changes != Instance._name_changes
+            or self._indexed > len(self._insts)
+        ):
+            self._insts = [inst for inst in self._insts if self._valid(inst)]
+            self._name_index = {}
+            self._indexed = 0
+            self._index_changes = Instance._name_changes
+        for i in range(self._indexed, len(self._insts)):
+            self._name_index.setdefault(self._insts[i].name, []).append(i)
+        self._indexed = len(self._insts)
+
+    @staticmethod
+    def _valid(inst: Instance) -> bool:
+        """Check that the instance was neither destroyed nor deleted."""
+        return not inst._instance._destroyed() and inst._instance.is_valid()
+
     def __getitem__(self, key: str | int) -> Instance:
         """Retrieve instance by index or by name."""
         if isinstance(key, int):
             return self._insts[key]
 
-        else:
-            return next(filter(lambda inst: inst.name == key, self._insts))
+        self._index()
+        indexes = self._name_index.get(key)
+        if indexes is not None:
+            inst = self._insts[indexes[0]]
+            if self._valid(inst) and inst.name == key:
+                return inst
+        self._index(rebuild=True)
+        try:
+            return self._insts[self._name_index[key][0]]
+        except KeyError:
+            raise KeyError(f"No instance with name {key!r}")
 
     def __len__(self) -> int:
         """Length of the instances."""
@@ -5332,30 +6843,32 @@ class Instances:
 
         Not named instances will be added to the `None` key.
         """
-        names: dict[str | None, int] = {}
-        for inst in self._insts:
-            if inst.name in names:
-                names[inst.name] += 1
-            else:
-                names[inst.name] = 1
-        return names
+        self._index(rebuild=True)
+        return {name: len(indexes) for name, indexes in self._name_index.items()}
+
+    def get_duplicate_names(self) -> dict[str, list[Instance]]:
+        """Get all instances sharing a name with another instance."""
+        self._index(rebuild=True)
+        return {
+            name: [self._insts[i] for i in indexes]
+            for name, indexes in self._name_index.items()
+            if len(indexes) > 1
+        }
 
     def __delitem__(self, item: Instance | int) -> None:
         if isinstance(item, int):
             del self._insts[item]
         else:
             self._insts.remove(item)
+        self._index_changes = None
 
     def clean(self) -> None:
-        deletion_list: list[int] = []
-        for i, inst in enumerate(self._insts):
-            if inst._instance._destroyed():
-                deletion_list.insert(0, i)
-        for i in deletion_list:
-            del self._insts[i]
+        """Remove destroyed or deleted instances."""
+        self._index(rebuild=True)
 
     def clear(self) -> None:
         self._insts.clear()
+        self._index_changes = None
 
 
 class Ports:
@@ -5378,18 +6891,71 @@ class Ports:
         """Constructor."""
         self._ports: list[Port] = list(ports)
         self.kcl = kcl
+        self._index_state: tuple[int, int] | None = None
+        self._name_index: dict[str | None, list[int]] = {}
+        self._layer_index: dict[int, list[int]] = {}
+        self._port_type_index: dict[str, list[int]] = {}
 
     def __len__(self) -> int:
         """Return Port count."""
         return len(self._ports)
 
-    def copy(self) -> Ports:
-        """Get a copy of each port."""
-        return Ports(ports=[p.copy() for p in self._ports], kcl=self.kcl)
+    def _index(self) -> None:
+        """Rebuild the name, layer and port_type indexes if they are outdated.
+
+        The indexes are outdated if the list of ports changed length or any port
+        was renamed or changed its layer or port_type.
+        """
+        state = (Port._changes, len(self._ports))
+        if self._index_state == state:
+            return
+        self._name_index = {}
+        self._layer_index = {}
+        self._port_type_index = {}
+        for i, port in enumerate(self._ports):
+            self._add_to_index(i, port)
+        self._index_state = state
+
+    def _add_to_index(self, i: int, port: Port) -> None:
+        self._name_index.setdefault(port.name, []).append(i)
+        self._layer_index.setdefault(port.layer, []).append(i)
+        self._port_type_index.setdefault(port.port_type, []).append(i)
+
+    def _append(self, port: Port, index_valid: bool) -> None:
+        """Append a port and update the indexes if they were valid before."""
+        self._ports.append(port)
+        if index_valid:
+            self._add_to_index(len(self._ports) - 1, port)
+            self._index_state = (Port._changes, len(self._ports))
+
+    def _index_valid(self) -> bool:
+        return self._index_state == (Port._changes, len(self._ports))
+
+    def copy(self, kcl: KCLayout | None = None) -> Ports:
+        """Get a copy of each port.
+
+        Args:
+            kcl: Attach the copies to this KCLayout instead. Must have the same
+                layer indexes, e.g. a [dup][kfactory.kcell.KCLayout.dup].
+        """
+        ports = [p.copy() for p in self._ports]
+        if kcl is None:
+            kcl = self.kcl
+        else:
+            for port in ports:
+                port.kcl = kcl
+        return Ports(ports=ports, kcl=kcl)
 
     def contains(self, port: Port) -> bool:
         """Check whether a port is already in the list."""
-        return port.hash() in [v.hash() for v in self._ports]
+        self._index()
+        # the name is part of the hash, so only ports with the same name can match
+        names: list[str | None] = [port.name] if port.name else [None, ""]
+        indexes = [i for name in names for i in self._name_index.get(name, [])]
+        if not indexes:
+            return False
+        port_hash = port.hash()
+        return any(self._ports[i].hash() == port_hash for i in indexes)
 
     def __iter__(self) -> Iterator[Port]:
         """Iterator, that allows for loops etc to directly access the object."""
@@ -5400,10 +6966,8 @@ class Ports:
         if isinstance(port, Port):
             return port in self._ports
         else:
-            for _port in self._ports:
-                if _port.name == port:
-                    return True
-            return False
+            self._index()
+            return port in self._name_index
 
     def add_port(
         self, port: Port, name: str | None = None, keep_mirror: bool = False
@@ -5423,9 +6987,10 @@ class Ports:
                 _port._trans.mirror = False
             elif _port._dcplx_trans:
                 _port._dcplx_trans.mirror = False
+        index_valid = self._index_valid()
         if name is not None:
             _port.name = name
-        self._ports.append(_port)
+        self._append(_port, index_valid)
         return _port
 
     def add_ports(
@@ -5552,7 +7117,7 @@ class Ports:
                 f" and dwidth {dwidth}"
             )
 
-        self._ports.append(port)
+        self._append(port, self._index_valid())
         return port
 
     def get_all_named(self) -> dict[str, Port]:
@@ -5563,9 +7128,10 @@ class Ports:
         """Get a specific port by name."""
         if isinstance(key, int):
             return self._ports[key]
+        self._index()
         try:
-            return next(filter(lambda port: port.name == key, self._ports))
-        except StopIteration:
+            return self._ports[self._name_index[key][0]]
+        except KeyError:
             raise KeyError(
                 f"{key=} is not a valid port name or index. "
                 f"Available ports: {[v.name for v in self._ports]}"
@@ -5589,12 +7155,20 @@ class Ports:
             regex: Filter by regex of the name.
         """
         ports: Iterable[Port] = self._ports
+        if layer is not None or port_type:
+            self._index()
+            indexes: set[int] | None = None
+            if layer is not None:
+                indexes = set(self._layer_index.get(layer, []))
+            if port_type:
+                pt_indexes = self._port_type_index.get(port_type, [])
+                indexes = (
+                    set(pt_indexes) if indexes is None else indexes & set(pt_indexes)
+                )
+            assert indexes is not None
+            ports = [self._ports[i] for i in sorted(indexes)]
         if regex:
             ports = filter_regex(ports, regex)
-        if layer is not None:
-            ports = filter_layer(ports, layer)
-        if port_type:
-            ports = filter_port_type(ports, port_type)
         if angle is not None:
             ports = filter_direction(ports, angle)
         if orientation is not None:
@@ -5637,6 +7211,22 @@ class Ports:
         return cls(constructor.construct_sequence(node))
 
 
+_instance_port_dtype = np.dtype(
+    [
+        ("port", np.int64),
+        ("ia", np.int64),
+        ("ib", np.int64),
+        ("x", np.float64),
+        ("y", np.float64),
+        ("angle", np.int64),
+        ("orientation", np.float64),
+        ("width", np.int64),
+        ("layer", np.int64),
+        ("port_type", np.int64),
+    ]
+)
+
+
 class InstancePorts:
     """Ports of an instance.
 
@@ -5685,6 +7275,14 @@ class InstancePorts:
             port_type: Filter by port type.
             regex: Filter by regex of the name.
         """
+        if self.instance.is_regular_array():
+            return self._filter_array(
+                angle=angle,
+                orientation=orientation,
+                layer=layer,
+                port_type=port_type,
+                regex=regex,
+            )
         ports: Iterable[Port] = list(self.instance.ports)
         if regex:
             ports = filter_regex(ports, regex)
@@ -5698,6 +7296,195 @@ class InstancePorts:
             ports = filter_orientation(ports, orientation)
         return ports
 
+    def array(self) -> np.ndarray[Any, np.dtype[np.void]]:
+        """Get the ports of the instance as a NumPy structured array.
+
+        The ports are not materialized, which makes this suitable for large instance
+        arrays. The order is the same as iterating over the ports. The fields are:
+
+        - `port`: index of the port in the ports of the cell
+        - `ia`, `ib`: index of the array element in `a` and `b` direction
+        - `x`, `y`: position of the port in dbu
+        - `angle`: angle of the port in 90° increments
+        - `orientation`: angle of the port in degrees
+        - `width`: width of the port in dbu
+        - `layer`: layer index of the port
+        - `port_type`: index into [port_types][kfactory.kcell.InstancePorts.port_types]
+
+        Use [port][kfactory.kcell.InstancePorts.port] to get a Port from an entry.
+        """
+        inst = self.instance
+        cell_ports = self.cell_ports._ports
+        port_types = self.port_types
+        if inst.is_regular_array():
+            na, nb = inst.na, inst.nb
+        else:
+            na, nb = 1, 1
+        m = len(cell_ports)
+        dbu = inst.kcl.layout.dbu
+        base = np.zeros(m, dtype=_instance_port_dtype)
+        if inst.is_complex():
+            dtrans = inst.dcplx_trans
+            ports = [p.copy(dtrans) for p in cell_ports]
+            va = dtrans * inst.da if na > 1 else kdb.DVector()
+            vb = dtrans * inst.db if nb > 1 else kdb.DVector()
+            a = (va.x / dbu, va.y / dbu)
+            b = (vb.x / dbu, vb.y / dbu)
+        else:
+            trans = inst.trans
+            ports = [p.copy(trans) for p in cell_ports]
+            ta = trans * inst.a if na > 1 else kdb.Vector()
+            tb = trans * inst.b if nb > 1 else kdb.Vector()
+            a = (ta.x, ta.y)
+            b = (tb.x, tb.y)
+        for i, p in enumerate(ports):
+            if p._trans:
+                x: float = p._trans.disp.x
+                y: float = p._trans.disp.y
+            else:
+                x = p.dcplx_trans.disp.x / dbu
+                y = p.dcplx_trans.disp.y / dbu
+            base[i] = (
+                i,
+                0,
+                0,
+                x,
+                y,
+                p.trans.angle,
+                p.dcplx_trans.angle,
+                p.width,
+                p.layer,
+                port_types.index(p.port_type),
+            )
+        arr = np.tile(base, na * nb)
+        ia = np.repeat(np.arange(na), nb * m)
+        ib = np.tile(np.repeat(np.arange(nb), m), na)
+        arr["ia"] = ia
+        arr["ib"] = ib
+        arr["x"] += ia * a[0] + ib * b[0]
+        arr["y"] += ia * a[1] + ib * b[1]
+        return arr
+
+    @property
+    def port_types(self) -> tuple[str, ...]:
+        """Port types of the cell ports, indexed by the `port_type` field of `array`."""
+        return tuple(dict.fromkeys(p.port_type for p in self.cell_ports._ports))
+
+    def port(self, entry: np.void) -> Port:
+        """Create the Port of an [array][kfactory.kcell.InstancePorts.array] entry."""
+        return self._port(
+            self.cell_ports._ports[int(entry["port"])],
+            int(entry["ia"]),
+            int(entry["ib"]),
+        )
+
+    def _port(self, p: Port, i_a: int, i_b: int) -> Port:
+        if not self.instance.is_regular_array():
+            if not self.instance.is_complex():
+                return p.copy(self.instance.trans)
+            return p.copy(self.instance.dcplx_trans)
+        if not self.instance.is_complex():
+            return p.copy(
+                self.instance.trans
+                * kdb.Trans(self.instance.a * i_a + self.instance.b * i_b)
+            )
+        return p.copy(
+            self.instance.dcplx_trans
+            * kdb.DCplxTrans(self.instance.da * i_a + self.instance.db * i_b)
+        )
+
+    def _mask(
+        self,
+        arr: np.ndarray[Any, np.dtype[np.void]],
+        angle: int | None = None,
+        orientation: float | None = None,
+        layer: LayerEnum | int | None = None,
+        port_type: str | None = None,
+        regex: str | None = None,
+    ) -> np.ndarray[Any, np.dtype[np.bool_]]:
+        mask = np.ones(len(arr), dtype=bool)
+        if regex:
+            pattern = re.compile(regex)
+            matches = np.array(
+                [
+                    p.name is not None and bool(pattern.match(p.name))
+                    for p in self.cell_ports._ports
+                ],
+                dtype=bool,
+            )
+            mask &= matches[arr["port"]]
+        if layer is not None:
+            mask &= arr["layer"] == layer
+        if port_type:
+            port_types = self.port_types
+            if port_type not in port_types:
+                return np.zeros(len(arr), dtype=bool)
+            mask &= arr["port_type"] == port_types.index(port_type)
+        if angle is not None:
+            mask &= arr["angle"] == angle
+        if orientation is not None:
+            mask &= arr["orientation"] == orientation
+        return mask
+
+    def _filter_array(
+        self,
+        angle: int | None = None,
+        orientation: float | None = None,
+        layer: LayerEnum | int | None = None,
+        port_type: str | None = None,
+        regex: str | None = None,
+    ) -> list[Port]:
+        arr = self.array()
+        mask = self._mask(
+            arr,
+            angle=angle,
+            orientation=orientation,
+            layer=layer,
+            port_type=port_type,
+            regex=regex,
+        )
+        return [self.port(entry) for entry in arr[mask]]
+
+    def nearest(
+        self,
+        point: kdb.Point | kdb.DPoint,
+        angle: int | None = None,
+        orientation: float | None = None,
+        layer: LayerEnum | int | None = None,
+        port_type: str | None = None,
+        regex: str | None = None,
+    ) -> Port:
+        """Get the port closest to a point.
+
+        Only the found port is materialized, which makes this efficient for
+        instance arrays.
+
+        Args:
+            point: Point to search from. `kdb.DPoint` is in um, `kdb.Point` in dbu.
+            angle: Only consider ports with this angle. 0, 1, 2, 3.
+            orientation: Only consider ports with this orientation in degrees.
+            layer: Only consider ports on this layer.
+            port_type: Only consider ports of this port type.
+            regex: Only consider ports with names matching the regex.
+        """
+        if isinstance(point, kdb.DPoint):
+            point = point.to_itype(self.instance.kcl.layout.dbu)
+        arr = self.array()
+        arr = arr[
+            self._mask(
+                arr,
+                angle=angle,
+                orientation=orientation,
+                layer=layer,
+                port_type=port_type,
+                regex=regex,
+            )
+        ]
+        if len(arr) == 0:
+            raise ValueError(f"No port of {self.instance.name} matches the filters")
+        distances = (arr["x"] - point.x) ** 2 + (arr["y"] - point.y) ** 2
+        return self.port(arr[int(np.argmin(distances))])
+
     @config.logger.catch(reraise=True)
     def __getitem__(
         self, key: int | str | None | tuple[int | str | None, int, int]
@@ -5741,17 +7528,7 @@ class InstancePorts:
             else:
                 i_a = 0
                 i_b = 0
-            p = self.cell_ports[key]
-            if not self.instance.is_complex():
-                return p.copy(
-                    self.instance.trans
-                    * kdb.Trans(self.instance.a * i_a + self.instance.b * i_b)
-                )
-            else:
-                return p.copy(
-                    self.instance.dcplx_trans
-                    * kdb.DCplxTrans(self.instance.da * i_a + self.instance.db * i_b)
-                )
+            return self._port(self.cell_ports[key], i_a, i_b)
 
     @property
     def cell_ports(self) -> Ports:
@@ -5896,7 +7673,27 @@ def dict2name(prefix: str | None = None, **kwargs: dict[str, Any]) -> str:
 
 
 def get_cell_name(cell_type: str, **kwargs: dict[str, Any]) -> str:
-    """Convert a cell to a string."""
+    """Convert a cell to a string.
+
+    Names of cells whose parameters are all scalars are memoized.
+    """
+    if all(type(value) in _scalar_types for value in kwargs.values()):
+        # the repr keeps e.g. `1`, `1.0` and `True` or `0.0` and `-0.0` apart
+        return _scalar_cell_name(
+            cell_type, tuple((key, repr(value), value) for key, value in kwargs.items())
+        )
+    return _get_cell_name(cell_type, kwargs)
+
+
+_scalar_types: tuple[type[Any], ...] = (int, float, str, bool, type(None))
+
+
+@functools.lru_cache(maxsize=4096)
+def _scalar_cell_name(cell_type: str, params: tuple[tuple[str, str, Any], ...]) -> str:
+    return _get_cell_name(cell_type, {key: value for key, _, value in params})
+
+
+def _get_cell_name(cell_type: str, kwargs: dict[str, Any]) -> str:
     name = cell_type
 
     if kwargs:
@@ -5905,6 +7702,7 @@ def get_cell_name(cell_type: str, **kwargs: dict[str, Any]) -> str:
     return name
 
 
+@functools.cache
 def join_first_letters(name: str) -> str:
     """Join the first letter of a name separated with underscores.
 
@@ -5946,24 +7744,9 @@ def clean_value(
             "Unable to serialize lambda function. Use a named function instead."
         )
     elif callable(value) and isinstance(value, functools.partial):
-        sig = inspect.signature(value.func)
-        args_as_kwargs = dict(zip(sig.parameters.keys(), value.args))
-        args_as_kwargs.update(**value.keywords)
-        args_as_kwargs = clean_dict(args_as_kwargs)
-        # args_as_kwargs.pop("function", None)
-        func = value.func
-        while hasattr(func, "func"):
-            func = func.func
-        v = {
-            "function": func.__name__,
-            "module": func.__module__,
-            "settings": args_as_kwargs,
-        }
-        return clean_value(v)
+        return _clean_partial(value)
     elif callable(value) and isinstance(value, toolz.functoolz.Compose):
-        return "_".join(
-            [clean_value(value.first)] + [clean_value(func) for func in value.funcs]
-        )
+        return _clean_compose(value)
 
     elif callable(value):
         return getattr(value, "__name__", value.__class__.__name__)
@@ -5971,13 +7754,49 @@ def clean_value(
         return clean_name(str(value))
 
 
-def clean_name(name: str) -> str:
-    r"""Ensures that gds cells are composed of [a-zA-Z0-9_\-].
+_parameter_names_cache: weakref.WeakKeyDictionary[
+    Callable[..., Any], tuple[str, ...]
+] = weakref.WeakKeyDictionary()
 
-    FIXME: only a few characters are currently replaced.
-        This function has been updated only on case-by-case basis
-    """
-    replace_map = {
+
+def _parameter_names(func: Callable[..., Any]) -> tuple[str, ...]:
+    """Parameter names of a function, cached as long as the function exists."""
+    try:
+        return _parameter_names_cache[func]
+    except KeyError:
+        pass
+    except TypeError:
+        # not weak referenceable or unhashable
+        return tuple(inspect.signature(func).parameters)
+    parameter_names = tuple(inspect.signature(func).parameters)
+    _parameter_names_cache[func] = parameter_names
+    return parameter_names
+
+
+def _clean_partial(value: functools.partial[Any]) -> str:
+    parameter_names = _parameter_names(value.func)
+    args_as_kwargs = dict(zip(parameter_names, value.args))
+    args_as_kwargs.update(**value.keywords)
+    args_as_kwargs = clean_dict(args_as_kwargs)
+    func = value.func
+    while hasattr(func, "func"):
+        func = func.func
+    v = {
+        "function": func.__name__,
+        "module": func.__module__,
+        "settings": args_as_kwargs,
+    }
+    return clean_value(v)
+
+
+def _clean_compose(value: toolz.functoolz.Compose) -> str:
+    return "_".join(
+        [clean_value(value.first)] + [clean_value(func) for func in value.funcs]
+    )
+
+
+_clean_name_table = str.maketrans(
+    {
         "=": "",
         ",": "_",
         ")": "",
@@ -5989,9 +7808,16 @@ def clean_name(name: str) -> str:
         "]": "",
         " ": "_",
     }
-    for k, v in list(replace_map.items()):
-        name = name.replace(k, v)
-    return name
+)
+
+
+def clean_name(name: str) -> str:
+    r"""Ensures that gds cells are composed of [a-zA-Z0-9_\-].
+
+    FIXME: only a few characters are currently replaced.
+        This function has been updated only on case-by-case basis
+    """
+    return name.translate(_clean_name_table)
 
 
 DEFAULT_TRANS: dict[str, str | int | float | dict[str, str | int | float]] = {
@@ -6139,10 +7965,13 @@ def show(
             _dir = tf.parent
             _kcls = list(kcls.values())
             _kcls.remove(layout)
-            for _kcl in _kcls:
-                p = (_dir / _kcl.name).with_suffix(".oas").resolve()
-                _kcl.write(p, library_save_options)
-                _kcl_paths.append({"name": _kcl.name, "file": str(p)})
+            library_files: dict[str | Path, KCell | KCLayout] = {
+                (_dir / _kcl.name).with_suffix(".oas").resolve(): _kcl for _kcl in _kcls
+            }
+            layout.write_many(library_files, library_save_options)
+            _kcl_paths.extend(
+                {"name": _kcl.name, "file": str(p)} for p, _kcl in library_files.items()
+            )
 
     elif isinstance(layout, KCell):
         file = None
@@ -6183,10 +8012,13 @@ def show(
             _dir = tf.parent
             _kcls = list(kcls.values())
             _kcls.remove(layout.kcl)
-            for _kcl in _kcls:
-                p = (_dir / _kcl.name).with_suffix(".oas").resolve()
-                _kcl.write(p, library_save_options)
-                _kcl_paths.append({"name": _kcl.name, "file": str(p)})
+            library_files = {
+                (_dir / _kcl.name).with_suffix(".oas").resolve(): _kcl for _kcl in _kcls
+            }
+            layout.kcl.write_many(library_files, library_save_options)
+            _kcl_paths.extend(
+                {"name": _kcl.name, "file": str(p)} for p, _kcl in library_files.items()
+            )
 
     elif isinstance(layout, str | Path):
         file = Path(layout).resolve()
@@ -6279,6 +8111,104 @@ def _check_cell_ports(p1: Port, p2: Port) -> int:
     return check_int
 
 
+def _factory_calls(
+    cell: KCell,
+) -> list[tuple[str, str, dict[str, Any] | None]]:
+    """Name, factory and parameters of the child cells built by a factory.
+
+    The parameters are `None` if they can't be pickled.
+    """
+    calls: list[tuple[str, str, dict[str, Any] | None]] = []
+    for kcell in (cell.kcl[ci] for ci in cell.called_cells()):
+        if kcell._factory_call is None:
+            continue
+        function_name, params = kcell._factory_call
+        try:
+            pickle.dumps(params)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            calls.append((kcell.name, function_name, None))
+        else:
+            calls.append((kcell.name, function_name, params))
+    return calls
+
+
+def _build_cell_oasis(
+    factory: Callable[..., KCell], params: dict[str, Any]
+) -> tuple[str, bytes, list[tuple[str, str, dict[str, Any] | None]]]:
+    """Build a cell and return its name and its tree as OASIS with metadata.
+
+    Also returns the factories and parameters of the child cells, so they can be
+    added to the caches of their factories. Used in the worker processes of
+    [build_parallel][kfactory.kcell.KCLayout.build_parallel].
+    """
+    cell = factory(**params)
+    for kcell in (cell.kcl[ci] for ci in cell.called_cells()):
+        kcell.set_meta_data(skip_unchanged=True)
+    cell.set_meta_data(skip_unchanged=True)
+    options = save_layout_options(format="OASIS")
+    options.select_cell(cell.cell_index())
+    return cell.name, cell.kcl.layout.write_bytes(options), _factory_calls(cell)
+
+
+def _cell_content_hash(cell: kdb.Cell, cell_map: dict[int, int]) -> bytes:
+    """Hash of the shapes, instances and meta infos of a KLayout cell.
+
+    Args:
+        cell: The cell to hash.
+        cell_map: Instances of cells in the keys are hashed as if they were
+            instances of the cell in the value.
+    """
+    h = sha3_512()
+    layout = cell.layout()
+    for layer_index in layout.layer_indexes():
+        shapes = cell.shapes(layer_index)
+        if shapes.is_empty():
+            continue
+        h.update(layout.get_info(layer_index).to_s().encode())
+        shape_hashs = sorted(
+            (shape.polygon.hash(), shape.prop_id)
+            for shape in shapes.each(kdb.Shapes.SRegions)
+        )
+        shape_hashs.extend(
+            sorted(
+                (shape.text.hash(), shape.prop_id)
+                for shape in shapes.each(kdb.Shapes.STexts)
+            )
+        )
+        h.update(str(shape_hashs).encode())
+    inst_hashs = []
+    for inst in cell.each_inst():
+        cell_inst = inst.cell_inst.dup()
+        cell_inst.cell_index = cell_map.get(cell_inst.cell_index, cell_inst.cell_index)
+        inst_hashs.append((cell_inst.hash(), inst.prop_id))
+    h.update(str(sorted(inst_hashs)).encode())
+    h.update(
+        str(sorted((m.name, str(m.value)) for m in cell.each_meta_info())).encode()
+    )
+    return h.digest()
+
+
+def _cell_inst_keys(
+    cell: kdb.Cell,
+) -> dict[tuple[str, kdb.CellInstArray], kdb.CellInstArray]:
+    """Instances of a cell keyed independent of the layout's cell indexes."""
+    layout = cell.layout()
+    keys: dict[tuple[str, kdb.CellInstArray], kdb.CellInstArray] = {}
+    for inst in cell.each_inst():
+        cell_inst = inst.cell_inst
+        key = cell_inst.dup()
+        key.cell_index = 0
+        keys.setdefault((layout.cell_name(cell_inst.cell_index), key), cell_inst)
+    return keys
+
+
+def _region_diffs(
+    regions: list[tuple[kdb.Region, kdb.Region]],
+) -> list[tuple[kdb.Region, kdb.Region]]:
+    """Polygons only in the first and only in the second region of each pair."""
+    return [(r_a.not_in(r_b), r_b.not_in(r_a)) for r_a, r_b in regions]
+
+
 @dataclass
 class MergeDiff:
     """Dataclass to hold geometric info about the layout diff."""
@@ -6478,6 +8408,98 @@ class MergeDiff:
             | kdb.LayoutDiff.IgnoreDuplicates,
         )
 
+    def compare_sharded(self, n_threads: int | None = None) -> bool:
+        """Run the comparing sharded by cell.
+
+        Creates the same diff layouts and log messages as
+        [compare][kfactory.kcell.MergeDiff.compare]. Instead of calling back
+        for each differing polygon, the polygons of a cell are compared in bulk
+        per layer as regions. The cells are compared in parallel.
+
+        Args:
+            n_threads: Number of threads to compare the cells with.
+                Defaults to `config.n_threads`.
+
+        Returns: True if the layouts are equal, False otherwise.
+        """
+        equal = True
+        if self.layout_a.dbu != self.layout_b.dbu:
+            self.on_dbu_differs(self.layout_a.dbu, self.layout_b.dbu)
+            equal = False
+
+        layers_a = {
+            (info.layer, info.datatype): (info, layer)
+            for layer, info in zip(
+                self.layout_a.layer_indexes(), self.layout_a.layer_infos()
+            )
+        }
+        layers_b = {
+            (info.layer, info.datatype): layer
+            for layer, info in zip(
+                self.layout_b.layer_indexes(), self.layout_b.layer_infos()
+            )
+        }
+        if layers_a.keys() != layers_b.keys():
+            equal = False
+        layers = [
+            (info, layer_a, layers_b[key])
+            for key, (info, layer_a) in layers_a.items()
+            if key in layers_b
+        ]
+
+        pairs: list[tuple[kdb.Cell, kdb.Cell]] = []
+        shards: list[list[tuple[kdb.Region, kdb.Region]]] = []
+        for cell_a in self.layout_a.each_cell():
+            cell_b = self.layout_b.cell(cell_a.name)
+            if cell_b is None:
+                equal = False
+                continue
+            pairs.append((cell_a, cell_b))
+            shard: list[tuple[kdb.Region, kdb.Region]] = []
+            for _, layer_a, layer_b in layers:
+                r_a = kdb.Region(cell_a.shapes(layer_a))
+                r_a.merged_semantics = False
+                r_b = kdb.Region(cell_b.shapes(layer_b))
+                r_b.merged_semantics = False
+                shard.append((r_a, r_b))
+            shards.append(shard)
+        if len(pairs) != self.layout_b.cells():
+            equal = False
+
+        with ThreadPoolExecutor(max_workers=n_threads or config.n_threads) as pool:
+            results = list(pool.map(_region_diffs, shards))
+
+        for (cell_a, cell_b), diffs in zip(pairs, results):
+            self.on_begin_cell(cell_a, cell_b)
+
+            insts_a = _cell_inst_keys(cell_a)
+            insts_b = _cell_inst_keys(cell_b)
+            for key in insts_a.keys() - insts_b.keys():
+                self.on_instance_in_a_only(insts_a[key], 0)
+                equal = False
+            for key in insts_b.keys() - insts_a.keys():
+                self.on_instance_in_b_only(insts_b[key], 0)
+                equal = False
+
+            for (info, _, _), (a_only, b_only) in zip(layers, diffs):
+                self.on_begin_layer(info, 0, 0)
+                if not (a_only.is_empty() and b_only.is_empty()):
+                    equal = False
+                    if self.loglevel is not None:
+                        for poly in a_only.each():
+                            config.logger.log(
+                                self.loglevel, f"Found {poly=} in {self.name_a} only."
+                            )
+                        for poly in b_only.each():
+                            config.logger.log(
+                                self.loglevel, f"Found {poly=} in {self.name_b} only."
+                            )
+                    self.cell_a.shapes(self.layer_a).insert(a_only)
+                    self.cell_b.shapes(self.layer_b).insert(b_only)
+                self.on_end_layer()
+
+        return equal
+
 
 __all__ = [
     "KCell",
@@ -6490,4 +8512,8 @@ __all__ = [
     "save_layout_options",
     "LayerEnum",
     "KCellParams",
+    "PersistentCellCache",
+    "KCellCache",
+    "CellCacheStats",
+    "WriteStats",
 ]
@@ -1,22 +1,59 @@
 """Placer of bends/straights from a route."""
 
 import os
+import pickle
 import sys
+from collections import OrderedDict
 from dataclasses import dataclass
+from hashlib import sha256
 from pathlib import Path
 from typing import Any, TypeVar
 
 from ruamel.yaml import YAML
 from ruamel.yaml.constructor import SafeConstructor
+from ruamel.yaml.error import StreamMark
+from ruamel.yaml.nodes import (
+    CollectionNode,
+    MappingNode,
+    Node,
+    ScalarNode,
+    SequenceNode,
+)
 
 from .enclosure import LayerEnclosure
 from .kcell import KCell, KCLayout, Port, Ports
 from .kcell import kcl as stdkcl
 
-__all__ = ["cells_to_yaml", "cells_from_yaml"]
+__all__ = [
+    "cells_to_yaml",
+    "cells_from_yaml",
+    "compose_yaml",
+    "include_graph",
+    "IncludeCycleError",
+]
 
 PathLike = TypeVar("PathLike", str, Path, None)
 
+_ir_version = 1
+_scalar, _sequence, _mapping = range(3)
+_compiled_yaml: OrderedDict[Path, tuple[str, tuple[Any, ...] | None]] = OrderedDict()
+"""Compiled yaml files by path with the hash of the content they were compiled from.
+
+Least recently used first, at most `_compiled_yaml_maxsize` files are kept.
+"""
+_compiled_yaml_maxsize = 256
+
+
+class IncludeCycleError(ValueError):
+    """Raised if yaml files `!include` each other in a cycle."""
+
+    def __init__(self, cycle: list[Path]) -> None:
+        """Throw error with the files of the cycle."""
+        self.cycle = cycle
+        super().__init__(
+            "Cyclic !include of yaml files: " + " -> ".join(str(f) for f in cycle)
+        )
+
 
 def cells_to_yaml(output: PathLike, cells: list[KCell] | KCell) -> None:
     """Convert cell(s) to a yaml representations.
@@ -69,33 +106,258 @@ def register_classes(
             yaml.register_class(c)
 
 
+def _node_to_ir(node: Node) -> tuple[Any, ...] | None:
+    """Convert a composed yaml node tree to nested tuples.
+
+    Aliased nodes stay shared. Returns `None` for recursive trees.
+    """
+    memo: dict[int, tuple[Any, ...]] = {}
+    stack: set[int] = set()
+
+    def to_ir(node: Node) -> tuple[Any, ...]:
+        key = id(node)
+        if key in memo:
+            return memo[key]
+        if key in stack:
+            raise RecursionError
+        mark = node.start_mark
+        if isinstance(node, ScalarNode):
+            ir: tuple[Any, ...] = (
+                _scalar,
+                node.tag,
+                node.value,
+                node.style,
+                node.anchor,
+                mark.line,
+                mark.column,
+            )
+        else:
+            assert isinstance(node, CollectionNode)
+            stack.add(key)
+            if isinstance(node, MappingNode):
+                kind = _mapping
+                value: tuple[Any, ...] = tuple(
+                    (to_ir(k), to_ir(v)) for k, v in node.value
+                )
+            else:
+                kind = _sequence
+                value = tuple(to_ir(v) for v in node.value)
+            stack.discard(key)
+            ir = (
+                kind,
+                node.tag,
+                value,
+                node.flow_style,
+                node.anchor,
+                mark.line,
+                mark.column,
+            )
+        memo[key] = ir
+        return ir
+
+    try:
+        return to_ir(node)
+    except RecursionError:
+        return None
+
+
+def _ir_to_node(ir: tuple[Any, ...], name: str) -> Node:
+    """Build a fresh yaml node tree from its tuple representation."""
+    memo: dict[int, Node] = {}
+
+    def to_node(ir: tuple[Any, ...]) -> Node:
+        key = id(ir)
+        if key in memo:
+            return memo[key]
+        kind, tag, value, style, anchor, line, column = ir
+        mark = StreamMark(name, 0, line, column)
+        node: Node
+        if kind == _scalar:
+            node = ScalarNode(tag, value, mark, mark, style=style, anchor=anchor)
+        elif kind == _sequence:
+            node = SequenceNode(
+                tag,
+                [to_node(v) for v in value],
+                mark,
+                mark,
+                flow_style=style,
+                anchor=anchor,
+            )
+        else:
+            node = MappingNode(
+                tag,
+                [(to_node(k), to_node(v)) for k, v in value],
+                mark,
+                mark,
+                flow_style=style,
+                anchor=anchor,
+            )
+        memo[key] = node
+        return node
+
+    return to_node(ir)
+
+
+def compose_yaml(inp: Path, cache_dir: Path | None = None) -> Node | None:
+    """Parse a yaml file into a node tree, skipping parsing for unchanged files.
+
+    The parsed tree is kept in memory by path and reused as long as the hash of
+    the file's content doesn't change. If `cache_dir` is given, it is
+    additionally pickled there by the same hash and reused across sessions.
+
+    Args:
+        inp: Yaml file.
+        cache_dir: Directory for the on-disk cache of parsed files.
+
+    Returns:
+        A new node tree of the file (`None` for an empty file), which can be
+        constructed with `yaml.constructor.construct_document`.
+    """
+    inp = inp.resolve()
+    data = inp.read_bytes()
+    digest = sha256(data).hexdigest()
+    cached = _compiled_yaml.get(inp)
+    if cached is not None and cached[0] == digest:
+        _compiled_yaml.move_to_end(inp)
+        ir = cached[1]
+        return None if ir is None else _ir_to_node(ir, str(inp))
+
+    cache_file: Path | None = None
+    ir = None
+    if cache_dir is not None:
+        cache_dir = Path(cache_dir).expanduser()
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_file = cache_dir / f"{digest}.v{_ir_version}.pickle"
+        if cache_file.is_file():
+            ir = pickle.loads(cache_file.read_bytes())
+            _remember_yaml(inp, digest, ir)
+            return None if ir is None else _ir_to_node(ir, str(inp))
+
+    node: Node | None = YAML().compose(data)
+    if node is not None:
+        ir = _node_to_ir(node)
+        if ir is None:
+            return node
+    _remember_yaml(inp, digest, ir)
+    if cache_file is not None:
+        tmp_file = cache_file.with_suffix(".tmp")
+        tmp_file.write_bytes(pickle.dumps(ir, protocol=pickle.HIGHEST_PROTOCOL))
+        tmp_file.replace(cache_file)
+    return None if ir is None else _ir_to_node(ir, str(inp))
+
+
+def _remember_yaml(inp: Path, digest: str, ir: tuple[Any, ...] | None) -> None:
+    """Keep a compiled file in memory, dropping the least recently used ones."""
+    _compiled_yaml[inp] = (digest, ir)
+    _compiled_yaml.move_to_end(inp)
+    while len(_compiled_yaml) > _compiled_yaml_maxsize:
+        _compiled_yaml.popitem(last=False)
+
+
+def _includes(node: Node, folder: Path) -> list[Path]:
+    """Files included with `!include` anywhere in a node tree."""
+    includes: list[Path] = []
+    seen: set[int] = set()
+    nodes = [node]
+    while nodes:
+        node = nodes.pop()
+        if id(node) in seen or isinstance(node, ScalarNode):
+            continue
+        seen.add(id(node))
+        if isinstance(node, MappingNode):
+            if node.tag == "!include":
+                for k, v in node.value:
+                    if k.value == "filename":
+                        includes.append((folder / v.value).resolve())
+            else:
+                for k, v in reversed(node.value):
+                    nodes.extend((v, k))
+        else:
+            nodes.extend(reversed(node.value))
+    return includes
+
+
+def include_graph(inp: Path, cache_dir: Path | None = None) -> dict[Path, Node | None]:
+    """Parse a yaml file and all the files it includes, each once.
+
+    Args:
+        inp: Yaml file.
+        cache_dir: Directory for the on-disk cache of parsed files. See
+            [compose_yaml][kfactory.placer.compose_yaml].
+
+    Returns:
+        The parsed node trees by file, in dependency order. Each file comes
+        after all the files it includes, `inp` comes last.
+
+    Raises:
+        IncludeCycleError: If files include each other in a cycle.
+    """
+    inp = inp.resolve()
+    nodes: dict[Path, Node | None] = {}
+    composed: dict[Path, Node | None] = {}
+    stack: list[tuple[Path, list[Path]]] = []
+
+    def visit(path: Path) -> None:
+        node = composed[path] = compose_yaml(path, cache_dir)
+        includes = [] if node is None else _includes(node, path.parent)
+        stack.append((path, includes[::-1]))
+
+    visit(inp)
+    while stack:
+        path, includes = stack[-1]
+        if not includes:
+            stack.pop()
+            nodes[path] = composed.pop(path)
+        elif (include := includes.pop()) in composed:
+            chain = [p for p, _ in stack]
+            raise IncludeCycleError([*chain[chain.index(include) :], include])
+        elif include not in nodes:
+            visit(include)
+    return nodes
+
+
 def cells_from_yaml(
     inp: Path,
     kcl: KCLayout = stdkcl,
     additional_classes: list[object] | None = None,
     verbose: bool = False,
+    cache_dir: Path | None = None,
 ) -> None:
     """Recreate cells from a yaml file.
 
+    All the files included with `!include` are loaded first in dependency order,
+    each of them only once.
+
     Args:
         inp: Input file path.
         kcl: KCLayout to load the cells into.
         additional_classes: Additional yaml classes that should be registered.
             This is used for example to enable loading additional yaml files etc.
         verbose: Print more verbose errors etc.
-    """
-    yaml = get_yaml_obj()
-    yaml.register_class(
-        include_from_loader(inp.parent, kcl, additional_classes, verbose)
-    )
+        cache_dir: Directory to cache the parsed yaml files (and included ones)
+            in. See [compose_yaml][kfactory.placer.compose_yaml].
 
-    register_classes(
-        yaml,
-        kcl,
-        additional_classes,
-        verbose,
-    )
-    yaml.load(inp)
+    Raises:
+        IncludeCycleError: If files include each other in a cycle.
+    """
+    nodes = include_graph(inp, cache_dir)
+    loaded = set(nodes)
+    for path, node in nodes.items():
+        if node is None:
+            continue
+        yaml = get_yaml_obj()
+        yaml.register_class(
+            include_from_loader(
+                path.parent, kcl, additional_classes, verbose, cache_dir, loaded
+            )
+        )
+        register_classes(
+            yaml,
+            kcl,
+            additional_classes,
+            verbose,
+        )
+        yaml.constructor.construct_document(node)
 
 
 def exploded_yaml(
@@ -126,8 +388,13 @@ def include_from_loader(
     library: KCLayout,
     additional_classes: list[object] | None,
     verbose: bool,
+    cache_dir: Path | None = None,
+    loaded: set[Path] | None = None,
 ) -> Any:
-    """Expand ruamel to support the `!include` keyword."""
+    """Expand ruamel to support the `!include` keyword.
+
+    Included files which are in `loaded` are skipped.
+    """
 
     @dataclass
     class Include:
@@ -138,12 +405,8 @@ def include_from_loader(
         def from_yaml(cls, constructor, node):  # type: ignore[no-untyped-def]
             d = SafeConstructor.construct_mapping(constructor, node)
 
-            f = Path(d["filename"])
-            if f.is_absolute():
-                cells_from_yaml(f, library, additional_classes, verbose)
-            else:
-                cells_from_yaml(
-                    (folder / f).resolve(), library, additional_classes, verbose
-                )
+            f = (folder / d["filename"]).resolve()
+            if loaded is None or f not in loaded:
+                cells_from_yaml(f, library, additional_classes, verbose, cache_dir)
 
     return Include
@@ -1,8 +1,10 @@
 """Optical routing allows the creation of photonic (or any route using bends)."""
 
+from collections import OrderedDict
 from collections.abc import Callable, Sequence
 
 import numpy as np
+import numpy.typing as nty
 
 # from typing import Any
 from pydantic import BaseModel
@@ -11,7 +13,7 @@ from ... import kdb
 from ...conf import config
 from ...kcell import Port, VInstance, VKCell
 
-__all__ = ["OpticalAllAngleRoute", "route"]
+__all__ = ["BendCache", "OpticalAllAngleRoute", "bend_cache", "route"]
 
 
 class OpticalAllAngleRoute(BaseModel, arbitrary_types_allowed=True):
@@ -23,8 +25,157 @@ class OpticalAllAngleRoute(BaseModel, arbitrary_types_allowed=True):
     instances: list[VInstance]
 
 
-def _angle(v: kdb.DVector) -> float:
-    return float(np.rad2deg(np.arctan2(v.y, v.x)))
+_BendKey = tuple[Callable[..., VKCell], float, float, tuple[str, str]]
+
+
+class BendCache:
+    """Least recently used cache of bends and their effective radius.
+
+    Keyed by bend factory, width, angle and bend ports. Factories such as
+    partials are compared by identity, so the cache is bounded to not keep the
+    bends of discarded factories alive indefinitely.
+
+    Attributes:
+        maxsize: Maximum number of cached bends. `None` for unbounded, `0`
+            disables the cache.
+    """
+
+    def __init__(self, maxsize: int | None = 1_000) -> None:
+        """Create an empty cache."""
+        self.maxsize = maxsize
+        self._data: OrderedDict[_BendKey, tuple[VKCell, float]] = OrderedDict()
+
+    def get(self, key: _BendKey) -> tuple[VKCell, float] | None:
+        """Get a bend and its effective radius, `None` on a miss."""
+        cached = self._data.get(key)
+        if cached is not None:
+            self._data.move_to_end(key)
+        return cached
+
+    def put(self, key: _BendKey, value: tuple[VKCell, float]) -> None:
+        """Add a bend and its effective radius and evict the oldest if full."""
+        if self.maxsize == 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while self.maxsize is not None and len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all bends."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        """Number of cached bends."""
+        return len(self._data)
+
+
+bend_cache = BendCache()
+"""Bends of [route][kfactory.routing.aa.optical.route] and their effective radius.
+
+Clear it if a factory returns different cells for the same arguments.
+"""
+
+
+def _effective_radius(bend: VKCell, bend_ports: tuple[str, str]) -> float:
+    """Distance of the bend ports to the crossing point of their axes."""
+    p1, p2 = (bend.ports[_p] for _p in bend_ports)
+
+    # get the center of the bend
+    # the center must be on the crossing point between the two
+    v = kdb.DVector(1, 0)
+    dt1 = p1.dcplx_trans
+    dt2 = p2.dcplx_trans
+    dp11 = dt1.disp.to_p()
+    dp21 = dt2.disp.to_p()
+    dp12 = dp11 + dt1 * v
+    dp22 = dp21 + dt2 * v
+
+    e1 = kdb.DEdge(dp11, dp12)
+    e2 = kdb.DEdge(dp21, dp22)
+    cp = e1.cut_point(e2)
+
+    # from this the effective radius can be calculated (the bend must be symmetric
+    # so each lengths needs 1*eff_radius)
+    return float((cp - p1.dcplx_trans.disp.to_p()).length())
+
+
+def _bend(
+    bend_factory: Callable[..., VKCell],
+    width: float,
+    angle: float,
+    bend_ports: tuple[str, str],
+) -> tuple[VKCell, float]:
+    """Get a bend and its effective radius from the cache or the factory."""
+    key = (bend_factory, width, angle, bend_ports)
+    try:
+        cached = bend_cache.get(key)
+    except TypeError:
+        # unhashable factory
+        bend = bend_factory(width=width, angle=angle)
+        return bend, _effective_radius(bend, bend_ports)
+    if cached is None:
+        bend = bend_factory(width=width, angle=angle)
+        cached = bend, _effective_radius(bend, bend_ports)
+        bend_cache.put(key, cached)
+    return cached
+
+
+def _plan(
+    backbone: Sequence[kdb.DPoint],
+    width: float,
+    bend_factory: Callable[..., VKCell],
+    bend_ports: tuple[str, str],
+) -> tuple[
+    nty.NDArray[np.float64],
+    nty.NDArray[np.float64],
+    list[VKCell],
+    nty.NDArray[np.float64],
+]:
+    """Calculate angles, bends and straight lengths of a backbone.
+
+    Returns:
+        segment_angles: Angle of each segment in degrees.
+        bend_angles: Angle of the bend at each corner in `[-180, 180]`, positive
+            for counter-clockwise bends.
+        bends: The bend cell for each corner.
+        straight_lengths: Length of the straight of each segment, which is the
+            segment length minus the effective radii of the bends at its ends.
+    """
+    pts = np.array([(p.x, p.y) for p in backbone], dtype=np.float64)
+    v = np.diff(pts, axis=0)
+    lengths = np.sqrt(v[:, 0] * v[:, 0] + v[:, 1] * v[:, 1])
+    segment_angles = np.rad2deg(np.arctan2(v[:, 1], v[:, 0]))
+    bend_angles = np.diff(segment_angles)
+    bend_angles = np.where(
+        bend_angles > 180,
+        bend_angles - 360,
+        np.where(bend_angles < -180, bend_angles + 360, bend_angles),
+    )
+
+    angles, inverse = np.unique(np.abs(bend_angles), return_inverse=True)
+    unique_bends = [
+        _bend(bend_factory, width, float(angle), bend_ports) for angle in angles
+    ]
+    bends = [unique_bends[i][0] for i in inverse]
+    radii = np.array([unique_bends[i][1] for i in inverse], dtype=np.float64)
+
+    straight_lengths = (
+        lengths - np.concatenate((radii, [0.0])) - np.concatenate(([0.0], radii))
+    )
+    invalid = np.flatnonzero(straight_lengths < 0)
+    if invalid.size:
+        raise ValueError(
+            "Not enough space to place bends at points "
+            + ", ".join(
+                f"{[backbone[i], backbone[i + 1]]} (needed space="
+                f"{lengths[i] - straight_lengths[i]}, available "
+                f"space={lengths[i]})"
+                for i in invalid.tolist()
+            )
+        )
+
+    return segment_angles, bend_angles, bends, straight_lengths
 
 
 @config.logger.catch
@@ -38,16 +189,21 @@ def route(
     bend_ports: tuple[str, str] = ("o1", "o2"),
     straight_ports: tuple[str, str] = ("o1", "o2"),
 ) -> OpticalAllAngleRoute:
-    """Places a route."""
+    """Places a route.
+
+    All angles, bends and straight lengths are calculated before placing, and
+    all segments which are too short for their bends are reported in one error.
+    Bends are cached in [bend_cache][kfactory.routing.aa.optical.bend_cache].
+    """
     if len(backbone) < 3:
         raise ValueError("All angle routes with less than 3 points are not supported.")
 
-    bends: dict[float, VKCell] = {}
+    segment_angles, bend_angles, bends, straight_lengths = _plan(
+        backbone, width, bend_factory, bend_ports
+    )
 
-    start_v = backbone[1] - backbone[0]
-    end_v = backbone[-1] - backbone[-2]
-    start_angle = np.rad2deg(np.arctan2(start_v.y, start_v.x))
-    end_angle = (np.rad2deg(np.arctan2(end_v.y, end_v.x)) + 180) % 360
+    start_angle = float(segment_angles[0])
+    end_angle = (float(segment_angles[-1]) + 180) % 360
 
     start_port = Port(
         name="o1",
@@ -64,56 +220,11 @@ def route(
         kcl=c.kcl,
     )
 
-    old_pt = backbone[0]
-    pt = backbone[1]
-    start_offset = 0.0
     _port = start_port
     insts: list[VInstance] = []
 
-    for new_pt in backbone[2:]:
-        # Calculate (4 quadrant) angle between the three points
-        s_v = pt - old_pt
-        e_v = new_pt - pt
-        s_a = _angle(s_v)
-        e_a = _angle(e_v)
-        _a = e_a - s_a
-
-        # create a virtual bend with the angle if non-existent
-        if _a not in bends:
-            bends[_a] = bend_factory(width=width, angle=abs(_a))  # type: ignore[call-arg]
-        bend = bends[_a]
-
-        p1, p2 = (bend.ports[_p] for _p in bend_ports)
-
-        # get the center of the bend
-        # the center must be on the crossing point between the two
-        v = kdb.DVector(1, 0)
-        dt1 = p1.dcplx_trans
-        dt2 = p2.dcplx_trans
-        dp11 = dt1.disp.to_p()
-        dp21 = dt2.disp.to_p()
-        dp12 = dp11 + dt1 * v
-        dp22 = dp21 + dt2 * v
-
-        e1 = kdb.DEdge(dp11, dp12)
-        e2 = kdb.DEdge(dp21, dp22)
-        cp = e1.cut_point(e2)
-
-        # from this the effective radius can be calculated (the bend must be symmetric
-        # so each lengths needs 1*eff_radius)
-        effective_radius = (cp - p1.dcplx_trans.disp.to_p()).length()
-
-        # if the resulting straight is < old_eff_radius + new_eff_radius
-        # the route is invalid
-        if (pt - old_pt).length() - effective_radius - start_offset < 0:
-            raise ValueError(
-                f"Not enough space to place bends at points {[old_pt, pt]}."
-                f"Needed space={start_offset + effective_radius}, available "
-                f"space={(pt-old_pt).length()}"
-            )
-
-        # calculate and place the resulting straight if != 0
-        _l = (pt - old_pt).length() - effective_radius - start_offset
+    for _l, _a, bend in zip(straight_lengths.tolist(), bend_angles.tolist(), bends):
+        # place the straight before the bend if != 0
         if _l > 0:
             s = c << straight_factory(width=width, length=_l)  # type:ignore[call-arg]
             s.connect(straight_ports[0], _port)
@@ -128,19 +239,8 @@ def route(
             b.connect(bend_ports[0], _port)
             _port = b.ports[bend_ports[1]]
         insts.append(b)
-        start_offset = effective_radius
-        old_pt = pt
-        pt = new_pt
     # place last straight
-    _l = (pt - old_pt).length() - effective_radius
-    # if the resulting straight is < old_eff_radius + new_eff_radius
-    # the route is invalid
-    if _l < 0:
-        raise ValueError(
-            f"Not enough space to place bends at points {[old_pt, pt]}."
-            f"Needed space={effective_radius}, available "
-            f"space={(pt-old_pt).length()}"
-        )
+    _l = float(straight_lengths[-1])
     if _l > 0:
         s = c << straight_factory(width=width, length=_l)  # type:ignore[call-arg]
         s.connect(straight_ports[0], _port)
@@ -1,16 +1,24 @@
 """Can calculate manhattan routes based on ports/transformations."""
 
+from collections import OrderedDict
+from collections.abc import Iterable
 from dataclasses import InitVar, dataclass, field
+from heapq import heappop, heappush
 from typing import Literal, Protocol
 
 from .. import kdb
 from ..conf import config
 from ..enclosure import clean_points
-from ..kcell import KCLayout, Port
+from ..kcell import KCell, KCLayout, LayerEnum, Port
 
 __all__ = [
     "route_manhattan",
     "route_manhattan_180",
+    "route_manhattan_obstacles",
+    "ObstacleIndex",
+    "RouteCache",
+    "RouteCacheStats",
+    "route_cache",
     "clean_points",
     "ManhattanRoutePathFunction",
     "ManhattanRoutePathFunction180",
@@ -214,6 +222,72 @@ def droute_manhattan(
 _p = kdb.Point()
 
 
+@dataclass
+class RouteCacheStats:
+    """Counters of a [RouteCache][kfactory.routing.manhattan.RouteCache]."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class RouteCache:
+    """Least recently used cache of manhattan routes.
+
+    A route of [route_manhattan][kfactory.routing.manhattan.route_manhattan] only
+    depends on the position of the end port relative to the start port, so the
+    routes are stored in the frame of the start port and keyed by the relative
+    transformation and the route parameters. Identical port pairs at different
+    positions or rotations share one entry.
+
+    Warnings of the router are only logged when a route is calculated, not on
+    cache hits.
+
+    Attributes:
+        maxsize: Maximum number of cached routes. `None` for unbounded, `0`
+            disables the cache.
+        stats: Hit/miss/eviction counters.
+    """
+
+    def __init__(self, maxsize: int | None = 10_000) -> None:
+        """Create an empty cache."""
+        self.maxsize = maxsize
+        self.stats = RouteCacheStats()
+        self._data: OrderedDict[tuple[int, ...], tuple[kdb.Point, ...]] = OrderedDict()
+
+    def get(self, key: tuple[int, ...]) -> tuple[kdb.Point, ...] | None:
+        """Get the relative points of a route, `None` on a miss."""
+        pts = self._data.get(key)
+        if pts is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        self._data.move_to_end(key)
+        return pts
+
+    def put(self, key: tuple[int, ...], pts: tuple[kdb.Point, ...]) -> None:
+        """Add the relative points of a route and evict the oldest if full."""
+        if self.maxsize == 0:
+            return
+        self._data[key] = pts
+        self._data.move_to_end(key)
+        while self.maxsize is not None and len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all routes."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        """Number of cached routes."""
+        return len(self._data)
+
+
+route_cache = RouteCache()
+"""Cache used by [route_manhattan][kfactory.routing.manhattan.route_manhattan]."""
+
+
 @dataclass
 class ManhattanRouter:
     bend90_radius: int
@@ -412,21 +486,327 @@ def route_manhattan(
         _end_straight = start_straight
         _start_straight = end_straight
 
-    router = ManhattanRouter(
-        bend90_radius=bend90_radius,
-        t1=t1,
-        t2=t2,
-        start_straight=_start_straight,
-        end_straight=_end_straight,
+    # the router ignores mirroring, so the route only depends on the unmirrored
+    # end port in the frame of the unmirrored start port
+    t1_frame = kdb.Trans(t1.angle, False, t1.disp)
+    rel = t1_frame.inverted() * kdb.Trans(t2.angle, False, t2.disp)
+    key = (
+        rel.rot,
+        rel.disp.x,
+        rel.disp.y,
+        bend90_radius,
+        _start_straight,
+        _end_straight,
+        max_tries,
     )
-
-    pts = router.auto_route()
+    rel_pts = route_cache.get(key)
+    if rel_pts is None:
+        router = ManhattanRouter(
+            bend90_radius=bend90_radius,
+            t1=t1,
+            t2=t2,
+            start_straight=_start_straight,
+            end_straight=_end_straight,
+        )
+        pts = router.auto_route(max_tries)
+        inv = t1_frame.inverted()
+        route_cache.put(key, tuple(inv * p for p in pts))
+    else:
+        pts = [t1_frame * p for p in rel_pts]
     if invert:
         pts.reverse()
 
     return pts
 
 
+_dirs = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+
+def _along(box: kdb.Box, x: int, y: int, ux: int, uy: int) -> tuple[int, int]:
+    """Extent of a box along a ray from `(x, y)` in direction `(ux, uy)`."""
+    if box.empty():
+        return (0, 0)
+    a = (box.left - x) * ux + (box.bottom - y) * uy
+    b = (box.right - x) * ux + (box.top - y) * uy
+    return (a, b) if a < b else (b, a)
+
+
+class ObstacleIndex:
+    """Box-tree index of the areas a route must not cross.
+
+    The obstacles are decomposed into boxes, grown by the clearance and stored in a
+    `kdb.Shapes` container, whose box tree answers the collision queries of
+    [route_manhattan_obstacles][kfactory.routing.manhattan.route_manhattan_obstacles].
+    Build it once and pass it to all routes of a cell.
+
+    Attributes:
+        clearance: Distance the center line of a route keeps from the obstacles.
+            Should include half the width of the route and its cladding. [dbu]
+        boxes: The grown obstacle boxes.
+        shapes: Box tree of the grown obstacle boxes.
+        bbox: Bounding box of the grown obstacle boxes.
+    """
+
+    def __init__(self, obstacles: kdb.Region, clearance: int = 0) -> None:
+        """Index the obstacles of a region.
+
+        Args:
+            obstacles: Region of the areas to avoid.
+            clearance: Distance the center line of a route keeps from the
+                obstacles. [dbu]
+        """
+        self.clearance = clearance
+        self.boxes = [
+            poly.bbox().enlarged(clearance)
+            for poly in obstacles.merged().decompose_trapezoids_to_region().each()
+        ]
+        self.shapes = kdb.Shapes()
+        self.bbox = kdb.Box()
+        for box in self.boxes:
+            self.shapes.insert(box)
+            self.bbox += box
+
+    @classmethod
+    def from_cell(
+        cls, c: KCell, layers: Iterable[LayerEnum | int], clearance: int = 0
+    ) -> "ObstacleIndex":
+        """Index the shapes of a cell (and its children) on some layers.
+
+        Args:
+            c: The cell to take the obstacles from.
+            layers: Layer indexes of the obstacles.
+            clearance: Distance the center line of a route keeps from the
+                obstacles. [dbu]
+        """
+        region = kdb.Region()
+        for layer in layers:
+            region.insert(c.begin_shapes_rec(layer))
+        return cls(region, clearance)
+
+    def free_run(
+        self, x: int, y: int, d: int, limit: int, exempt: Iterable[kdb.Box] = ()
+    ) -> int:
+        """Distance a ray travels until it enters an obstacle.
+
+        Args:
+            x: X-coordinate of the start of the ray.
+            y: Y-coordinate of the start of the ray.
+            d: Direction of the ray (0: east, 1: north, 2: west, 3: south).
+            limit: Maximum length of the ray.
+            exempt: Areas in which obstacles are ignored.
+        """
+        ux, uy = _dirs[d]
+        ray = kdb.Box(kdb.Point(x, y), kdb.Point(x + ux * limit, y + uy * limit))
+        zones = [_along(ray & zone, x, y, ux, uy) for zone in exempt]
+        run = limit
+        for shape in self.shapes.each_overlapping(ray):
+            near, far = _along(ray & shape.box, x, y, ux, uy)
+            for zone_near, zone_far in zones:
+                if zone_near <= near < zone_far:
+                    near = zone_far
+            if near < far:
+                run = min(run, near)
+        return run
+
+    def collides(self, box: kdb.Box, exempt: Iterable[kdb.Box] = ()) -> bool:
+        """Check whether a box (or a line) overlaps any obstacle.
+
+        Touching an obstacle is not a collision.
+
+        Args:
+            box: The box or line to check.
+            exempt: Areas in which overlaps are ignored.
+        """
+        for shape in self.shapes.each_overlapping(box):
+            overlap = box & shape.box
+            if not any(overlap.inside(zone) for zone in exempt):
+                return True
+        return False
+
+
+def _port_zone(t: kdb.Trans, clearance: int) -> kdb.Box:
+    """Area in front of a port in which obstacles are ignored."""
+    return kdb.Box(t * kdb.Point(0, -clearance), t * kdb.Point(clearance, clearance))
+
+
+def _min_bends(dx: int, dy: int, d: int, d_end: int) -> int:
+    """Lower bound of the bends from heading `d` to `(dx, dy)` heading `d_end`."""
+    ux, uy = _dirs[d]
+    ahead = dx * ux + dy * uy
+    side = dx * -uy + dy * ux
+    if d == d_end:
+        if side == 0 and ahead >= 0:
+            return 0
+        return 2 if ahead > 0 else 4
+    if d == (d_end + 2) % 4:
+        return 4 if side == 0 else 2
+    vx, vy = _dirs[d_end]
+    return 1 if ahead > 0 and dx * vx + dy * vy > 0 else 3
+
+
+def route_manhattan_obstacles(
+    port1: Port | kdb.Trans,
+    port2: Port | kdb.Trans,
+    bend90_radius: int,
+    start_straight: int,
+    end_straight: int,
+    obstacles: ObstacleIndex | kdb.Region,
+    bend_cost: int | None = None,
+    max_expansions: int = 100_000,
+    weight: float = 1.2,
+) -> list[kdb.Point]:
+    """Calculate a manhattan route around obstacles.
+
+    Runs an A* search over the corners of the route. From each corner a ray is
+    cast through the obstacle index, and the route may turn on it where the
+    edges of nearby obstacles (and the bend radius offsets from them) or the
+    port positions call for it. A turn needs the straight length for the bends
+    and a free `bend90_radius` square inside the corner, so the points can be
+    placed like the ones of `route_manhattan`. Use it in `optical.route` with
+    `route_path_function=route_manhattan_obstacles` and
+    `route_kwargs={"obstacles": index}`.
+
+    Args:
+        port1: Transformation of start port.
+        port2: Transformation of end port.
+        bend90_radius: The radius or (symmetrical) dimension of 90° bend. [dbu]
+        start_straight: Minimum straight after the starting port. [dbu]
+        end_straight: Minimum straight before the end port. [dbu]
+        obstacles: Index (or region) of the areas to avoid. Obstacles within the
+            clearance in front of the ports, e.g. the connected devices, are
+            ignored.
+        bend_cost: Penalty for each bend in dbu of route length. Defaults to
+            `bend90_radius`.
+        max_expansions: Maximum number of corners to search before giving up.
+        weight: Weight of the A* heuristic. The route costs at most `weight`
+            times the cheapest one. `1` searches for the cheapest route, but has
+            to visit far more corners in obstacle fields.
+
+    Returns:
+        route: Calculated route in dbu points.
+
+    Raises:
+        ValueError: If there is no route or it wasn't found within
+            `max_expansions`.
+    """
+    t1 = port1 if isinstance(port1, kdb.Trans) else port1.trans
+    t2 = port2 if isinstance(port2, kdb.Trans) else port2.trans
+    index = (
+        obstacles if isinstance(obstacles, ObstacleIndex) else ObstacleIndex(obstacles)
+    )
+    r = bend90_radius
+    _bend_cost = r if bend_cost is None else bend_cost
+    exempt = (_port_zone(t1, index.clearance), _port_zone(t2, index.clearance))
+
+    port_xs: set[int] = set()
+    port_ys: set[int] = set()
+    for t, straight in ((t1, start_straight), (t2, end_straight)):
+        for offset in (0, r, 2 * r, 3 * r, straight + r, straight + 2 * r):
+            port_xs.update((t.disp.x - offset, t.disp.x + offset))
+            port_ys.update((t.disp.y - offset, t.disp.y + offset))
+    bounds = (
+        index.bbox + kdb.Box(min(port_xs), min(port_ys), max(port_xs), max(port_ys))
+    ).enlarged(3 * r)
+
+    ex, ey = t2.disp.x, t2.disp.y
+    d_end = (t2.angle + 2) % 4
+    need_start = start_straight + r
+    need_end = end_straight + r
+
+    def h(x: int, y: int, d: int) -> int:
+        dx = ex - x
+        dy = ey - y
+        return abs(dx) + abs(dy) + _bend_cost * _min_bends(dx, dy, d, d_end)
+
+    # a state is a corner (or the start) given by its position, the heading after
+    # it and the turn into that heading (1: left, 3: right, 0: start)
+    start = (t1.disp.x, t1.disp.y, t1.angle, 0)
+    goal = (ex, ey, d_end, -1)
+    best = {start: 0}
+    parent: dict[tuple[int, int, int, int], tuple[int, int, int, int] | None] = {
+        start: None
+    }
+    heap: list[tuple[float, int, tuple[int, int, int, int]]] = [
+        (h(t1.disp.x, t1.disp.y, t1.angle), 0, start)
+    ]
+    expansions = 0
+
+    while heap:
+        _, neg_g, state = heappop(heap)
+        g = -neg_g
+        if g > best[state]:
+            continue
+        if state == goal:
+            break
+        x, y, d, turn = state
+        ux, uy = _dirs[d]
+        if turn:
+            # the corner square is only checked once the corner is reached
+            vx, vy = _dirs[(d - turn) % 4]
+            if index.collides(
+                kdb.Box(
+                    kdb.Point(x - r * vx, y - r * vy), kdb.Point(x + r * ux, y + r * uy)
+                ),
+                exempt,
+            ):
+                continue
+        expansions += 1
+        if expansions > max_expansions:
+            raise ValueError(
+                f"No route from {t1} to {t2} found within {max_expansions} expansions."
+            )
+        limit = max(
+            (bounds.right - x, bounds.top - y, x - bounds.left, y - bounds.bottom)[d], 0
+        )
+        run = index.free_run(x, y, d, limit, exempt)
+        if d == d_end and (ex - x) * -uy + (ey - y) * ux == 0:
+            dist = (ex - x) * ux + (ey - y) * uy
+            if (need_end if turn else 0) <= dist <= run:
+                nxt = g + dist
+                if nxt < best.get(goal, nxt + 1):
+                    best[goal] = nxt
+                    parent[goal] = state
+                    heappush(heap, (nxt, -nxt, goal))
+        need = 2 * r if turn else need_start
+        if run < need:
+            continue
+        ray = kdb.Box(kdb.Point(x, y), kdb.Point(x + ux * run, y + uy * run))
+        band = ray.enlarged(2 * r * abs(uy), 2 * r * abs(ux))
+        coords = set(port_xs if ux else port_ys)
+        for shape in index.shapes.each_touching(band):
+            box = shape.box
+            if ux:
+                coords.update((box.left - r, box.left, box.right, box.right + r))
+            else:
+                coords.update((box.bottom - r, box.bottom, box.top, box.top + r))
+        c = x if ux else y
+        sign = ux + uy
+        for coord in coords:
+            dist = (coord - c) * sign
+            if need <= dist <= run:
+                next_g = g + dist + _bend_cost
+                nx, ny = (coord, y) if ux else (x, coord)
+                for next_turn in (1, 3):
+                    nd = (d + next_turn) % 4
+                    next_state = (nx, ny, nd, next_turn)
+                    if next_g < best.get(next_state, next_g + 1):
+                        best[next_state] = next_g
+                        parent[next_state] = state
+                        heappush(
+                            heap, (next_g + weight * h(nx, ny, nd), -next_g, next_state)
+                        )
+    else:
+        raise ValueError(f"No route from {t1} to {t2} around the obstacles.")
+
+    pts = [kdb.Point(ex, ey)]
+    _state = parent[goal]
+    while _state is not None:
+        pts.append(kdb.Point(_state[0], _state[1]))
+        _state = parent[_state]
+    pts.reverse()
+    return pts
+
+
 def vec_dir(vec: kdb.Vector) -> int:
     match (vec.x, vec.y):
         case (x, 0) if x > 0:
@@ -453,6 +453,37 @@ def route_bundle(
         abs(bend90_cell.ports[0].y - bend90_cell.ports[1].y),
     )
 
+    return [
+        place90(
+            c=c,
+            p1=sp,
+            p2=ep,
+            pts=pts,
+            straight_factory=straight_factory,
+            bend90_cell=bend90_cell,
+        )
+        for sp, ep, pts in _plan_bundle(
+            start_ports,
+            end_ports,
+            spacing,
+            radius,
+            c.bbox(),
+            start_straight,
+            end_straight,
+        )
+    ]
+
+
+def _plan_bundle(
+    start_ports: list[Port],
+    end_ports: list[Port],
+    spacing: int,
+    radius: int,
+    bbox: kdb.Box,
+    start_straight: int,
+    end_straight: int,
+) -> list[tuple[Port, Port, list[kdb.Point]]]:
+    """Calculate the start port, end port and points of each route of a bundle."""
     sp_dict = {p.trans: i for i, p in enumerate(start_ports)}
 
     if not (len(start_ports) == len(end_ports) and len(start_ports) > 0):
@@ -461,21 +492,22 @@ def route_bundle(
             " the same size as the end ports and be the same length."
         )
 
-    bundle_point_start = start_ports[0].trans.disp.to_p()
-    for p in start_ports[1:]:
-        bundle_point_start += p.trans.disp
-    bundle_point_start /= len(start_ports)
-    bundle_point_end = end_ports[0].trans.disp.to_p()
-    for p in end_ports[1:]:
-        bundle_point_end += p.trans.disp
-    bundle_point_end /= len(end_ports)
+    # average in python ints, summing kdb.Points overflows for large coordinates
+    bundle_point_start = kdb.DPoint(
+        sum(p.trans.disp.x for p in start_ports) / len(start_ports),
+        sum(p.trans.disp.y for p in start_ports) / len(start_ports),
+    ).to_itype()
+    bundle_point_end = kdb.DPoint(
+        sum(p.trans.disp.x for p in end_ports) / len(end_ports),
+        sum(p.trans.disp.y for p in end_ports) / len(end_ports),
+    ).to_itype()
 
     bundle_width = sum(p.width for p in start_ports) + len(start_ports) * spacing
 
     start_routes, bundle_start = route_ports_to_bundle(
         ports_to_route=[(p.trans, p.width) for p in start_ports],
         bend_radius=radius,
-        bbox=c.bbox(),
+        bbox=bbox,
         bundle_base_point=bundle_point_start,
         start_straight=start_straight,
         spacing=spacing,
@@ -484,7 +516,7 @@ def route_bundle(
     end_routes, bundle_end = route_ports_to_bundle(
         ports_to_route=[(p.trans, p.width) for p in end_ports],
         bend_radius=radius,
-        bbox=c.bbox(),
+        bbox=bbox,
         bundle_base_point=bundle_point_end,
         start_straight=end_straight,
         spacing=spacing,
@@ -520,7 +552,7 @@ def route_bundle(
         spacings=[spacing] * len(start_widths),
     )
 
-    routes: list[OpticalManhattanRoute] = []
+    plan: list[tuple[Port, Port, list[kdb.Point]]] = []
 
     end_routes_values = list(end_routes.values())
 
@@ -528,25 +560,14 @@ def route_bundle(
         bundle_pts = backbone_points[i]
         end_pts = list(reversed(end_routes_values[-(i + 1)]))
 
-        pts = clean_points(start_pts + bundle_pts + end_pts)
-
         s_idx = sp_dict[t]
         sp = start_ports[s_idx].copy()
         sp.angle = (sp.trans.angle + 2) % 4
         ep = end_ports[s_idx].copy()
         ep.angle = (ep.trans.angle + 2) % 4
-        routes.append(
-            place90(
-                c=c,
-                p1=sp,
-                p2=ep,
-                pts=pts,
-                straight_factory=straight_factory,
-                bend90_cell=bend90_cell,
-            )
-        )
+        plan.append((sp, ep, clean_points(start_pts + bundle_pts + end_pts)))
 
-    return routes
+    return plan
 
 
 def place90(
@@ -560,6 +581,7 @@ def place90(
     port_type: str = "optical",
     min_straight_taper: int = 0,
     allow_small_routes: bool = False,
+    instance_arrays: bool = False,
 ) -> OpticalManhattanRoute:
     """Place bends and straight waveguides based on a sequence of points.
 
@@ -569,6 +591,8 @@ def place90(
     This function will throw an error in case it cannot place bends due to too small
     routings, E.g. two corner are too close for two bends to be safely placed.
 
+    The positions of all instances are calculated first and the instances are
+    inserted into `c` at the end in one batch.
 
     Args:
         c: Cell in which the route should be placed.
@@ -590,6 +614,10 @@ def place90(
             is below this minimum length.
         allow_small_routes: Don't throw an error if two corners cannot be safely placed
             due to small space and place them anyway.
+        instance_arrays: Place runs of at least three equally spaced instances of
+            the same cell and orientation, e.g. the bends and straights of a
+            meander, as one instance array. The array is listed once in the
+            route's instances.
     """
     route_start_port = p1.copy()
     route_start_port.name = None
@@ -664,6 +692,14 @@ def place90(
                 " the bend's ports"
             )
 
+    placer = _RoutePlacer(c)
+    # indexes of the placements in the order of route.instances
+    order: list[int] = []
+
+    def straight_ports(cell: KCell) -> tuple[Port, Port]:
+        wg_p1, wg_p2 = (v for v in cell.ports if v.port_type == port_type)
+        return wg_p1, wg_p2
+
     if len(pts) == 2:
         length = int((pts[1] - pts[0]).length())
         route.length += int(length)
@@ -673,37 +709,33 @@ def place90(
             < (taperp1.trans.disp - taperp2.trans.disp).length() * 2
             + min_straight_taper
         ):
-            wg = c << straight_factory(width=w, length=int((pts[1] - pts[0]).length()))
-            wg_p1, wg_p2 = (v for v in wg.ports if v.port_type == port_type)
-            wg.connect(wg_p1, p1)
-            route.instances.append(wg)
+            wg_cell = straight_factory(width=w, length=int((pts[1] - pts[0]).length()))
+            wg_p1, wg_p2 = straight_ports(wg_cell)
+            order.append(placer.connect(wg_cell, wg_p1, p1))
             route.start_port = wg_p1.copy()
             route.start_port.name = None
             route.length_straights += int(length)
         else:
-            t1 = c << taper_cell
-            t1.connect(taperp1.name, p1)
-            route.instances.append(t1)
-            route.start_port = t1.ports[taperp1.name].copy()
+            t1 = placer.connect(taper_cell, taperp1, p1)
+            order.append(t1)
+            route.start_port = placer.port(t1, taperp1)
             route.start_port.name = None
             _l = int(length - (taperp1.trans.disp - taperp2.trans.disp).length() * 2)
             if _l != 0:
-                wg = c << straight_factory(
+                wg_cell = straight_factory(
                     width=taperp2.width,
                     length=length
                     - int((taperp1.trans.disp - taperp2.trans.disp).length() * 2),
                 )
-                wg_p1, wg_p2 = (v for v in wg.ports if v.port_type == port_type)
-                wg.connect(wg_p1, t1, taperp2.name)
-                route.instances.append(wg)
-                t2 = c << taper_cell
-                t2.connect(taperp2.name, wg_p2)
+                wg_p1, wg_p2 = straight_ports(wg_cell)
+                order.append(placer.connect(wg_cell, wg_p1, t1, taperp2))
+                t2 = placer.connect(taper_cell, taperp2, wg_p2)
                 route.length_straights += _l
             else:
-                t2 = c << taper_cell
-                t2.connect(taperp2.name, t1, taperp2.name)
-            route.instances.append(t2)
-            route.end_port = t2.ports[taperp1.name]
+                t2 = placer.connect(taper_cell, taperp2, t1, taperp2)
+            order.append(t2)
+            route.end_port = placer.port(t2, taperp1)
+        route.instances = placer.insert(order, instance_arrays)
         return route
     for i in range(1, len(pts) - 1):
         pt = pts[i]
@@ -729,7 +761,6 @@ def place90(
         vec = pt - old_pt
         vec_n = new_pt - pt
 
-        bend90 = c << bend90_cell
         route.n_bend90 += 1
         mirror = (vec_angle(vec_n) - vec_angle(vec)) % 4 != 3
         if (vec.y != 0) and (vec.x != 0):
@@ -741,9 +772,11 @@ def place90(
             raise ValueError(
                 f"The vector between manhattan points is not manhattan {old_pt}, {pt}"
             )
-        bend90.transform(kdb.Trans(ang, mirror, pt.x, pt.y) * b90c.inverted())
+        bend90 = placer.place(
+            bend90_cell, kdb.Trans(ang, mirror, pt.x, pt.y) * b90c.inverted()
+        )
         length = int(
-            (bend90.ports[b90p1.name].trans.disp - old_bend_port.trans.disp).length()
+            (placer.port(bend90, b90p1).trans.disp - old_bend_port.trans.disp).length()
         )
         route.length += int(length)
         if length > 0:
@@ -753,40 +786,36 @@ def place90(
                 < (taperp1.trans.disp - taperp2.trans.disp).length() * 2
                 + min_straight_taper
             ):
-                wg = c << straight_factory(width=w, length=length)
-                wg_p1, wg_p2 = (v for v in wg.ports if v.port_type == port_type)
-                wg.connect(wg_p1, bend90, b90p1.name)
-                route.instances.append(wg)
+                wg_cell = straight_factory(width=w, length=length)
+                wg_p1, wg_p2 = straight_ports(wg_cell)
+                order.append(placer.connect(wg_cell, wg_p1, bend90, b90p1))
                 route.length_straights += int(length)
             else:
-                t1 = c << taper_cell
-                t1.connect(taperp1.name, bend90, b90p1.name)
-                route.instances.append(t1)
+                t1 = placer.connect(taper_cell, taperp1, bend90, b90p1)
+                order.append(t1)
                 _l = int(
                     length - (taperp1.trans.disp - taperp2.trans.disp).length() * 2
                 )
                 if length - (taperp1.trans.disp - taperp2.trans.disp).length() * 2 != 0:
-                    wg = c << straight_factory(
+                    wg_cell = straight_factory(
                         width=taperp2.width,
                         length=int(
                             length
                             - (taperp1.trans.disp - taperp2.trans.disp).length() * 2,
                         ),
                     )
-                    wg_p1, wg_p2 = (v for v in wg.ports if v.port_type == port_type)
-                    wg.connect(wg_p1.name, t1, taperp2.name)
-                    route.instances.append(wg)
-                    t2 = c << taper_cell
-                    t2.connect(taperp2.name, wg, wg_p2.name)
+                    wg_p1, wg_p2 = straight_ports(wg_cell)
+                    wg = placer.connect(wg_cell, wg_p1, t1, taperp2)
+                    order.append(wg)
+                    t2 = placer.connect(taper_cell, taperp2, wg, wg_p2)
                     route.length_straights += _l
                 else:
-                    t2 = c << taper_cell
-                    t2.connect(taperp2.name, t1, taperp2.name)
-                route.instances.append(t2)
-        route.instances.append(bend90)
+                    t2 = placer.connect(taper_cell, taperp2, t1, taperp2)
+                order.append(t2)
+        order.append(bend90)
         old_pt = pt
-        old_bend_port = bend90.ports[b90p2.name]
-    length = int((bend90.ports[b90p2.name].trans.disp - p2.trans.disp).length())
+        old_bend_port = placer.port(bend90, b90p2)
+    length = int((old_bend_port.trans.disp - p2.trans.disp).length())
     route.length += int(length)
     if length > 0:
         if (
@@ -795,38 +824,160 @@ def place90(
             < (taperp1.trans.disp - taperp2.trans.disp).length() * 2
             + min_straight_taper
         ):
-            wg = c << straight_factory(width=w, length=length)
-            wg_p1, wg_p2 = (v for v in wg.ports if v.port_type == port_type)
-            wg.connect(wg_p1.name, bend90, b90p2.name)
-            route.instances.append(wg)
-            route.end_port = wg.ports[wg_p2.name].copy()
+            wg_cell = straight_factory(width=w, length=length)
+            wg_p1, wg_p2 = straight_ports(wg_cell)
+            wg = placer.connect(wg_cell, wg_p1, bend90, b90p2)
+            order.append(wg)
+            route.end_port = placer.port(wg, wg_p2)
             route.end_port.name = None
             route.length_straights += int(length)
         else:
-            t1 = c << taper_cell
-            t1.connect(taperp1.name, bend90, b90p2.name)
-            route.instances.append(t1)
+            t1 = placer.connect(taper_cell, taperp1, bend90, b90p2)
+            order.append(t1)
             if length - (taperp1.trans.disp - taperp2.trans.disp).length() * 2 != 0:
                 _l = int(
                     length - (taperp1.trans.disp - taperp2.trans.disp).length() * 2
                 )
-                wg = c << straight_factory(
+                wg_cell = straight_factory(
                     width=taperp2.width,
                     length=_l,
                 )
-                route.instances.append(wg)
-                wg_p1, wg_p2 = (v for v in wg.ports if v.port_type == port_type)
-                wg.connect(wg_p1.name, t1, taperp2.name)
-                t2 = c << taper_cell
-                t2.connect(taperp2.name, wg, wg_p2.name)
+                wg_p1, wg_p2 = straight_ports(wg_cell)
+                wg = placer.connect(wg_cell, wg_p1, t1, taperp2)
+                order.append(wg)
+                t2 = placer.connect(taper_cell, taperp2, wg, wg_p2)
                 route.length_straights += int(_l)
             else:
-                t2 = c << taper_cell
-                t2.connect(taperp2.name, t1, taperp2.name)
-            route.instances.append(t2)
-            route.end_port = t2.ports[taperp1.name].copy()
+                t2 = placer.connect(taper_cell, taperp2, t1, taperp2)
+            order.append(t2)
+            route.end_port = placer.port(t2, taperp1)
             route.end_port.name = None
     else:
         route.end_port = old_bend_port.copy()
         route.end_port.name = None
+    route.instances = placer.insert(order, instance_arrays)
     return route
+
+
+class _RoutePlacer:
+    """Positions of the instances of a route before they are inserted.
+
+    Connections are calculated on the transformations of the ports like
+    [Instance.connect][kfactory.kcell.Instance.connect], without creating
+    instances and instance ports for each step.
+    """
+
+    def __init__(self, c: KCell) -> None:
+        self.c = c
+        self.cells: list[KCell] = []
+        self.trans: list[kdb.Trans] = []
+
+    def place(self, cell: KCell, trans: kdb.Trans) -> int:
+        """Add a placement and return its index."""
+        self.cells.append(cell)
+        self.trans.append(trans)
+        return len(self.cells) - 1
+
+    def port(self, i: int, port: Port) -> Port:
+        """Copy of a port of the cell of placement `i` at its position."""
+        return port.copy(self.trans[i])
+
+    def connect(
+        self,
+        cell: KCell,
+        port: Port,
+        other: int | Port,
+        other_port: Port | None = None,
+    ) -> int:
+        """Add a placement of `cell` with `port` connected to `other`.
+
+        Args:
+            cell: The cell to place.
+            port: Port of `cell` to connect.
+            other: A port or the index of a placement.
+            other_port: Port of the cell of placement `other`.
+        """
+        if isinstance(other, Port):
+            op = other
+        else:
+            assert other_port is not None
+            op = self.port(other, other_port)
+        if (
+            port.width != op.width
+            or port.layer != op.layer
+            or port.port_type != op.port_type
+        ):
+            # insert everything so far and let Instance.connect raise the error
+            insts = self.insert(list(range(len(self.cells))))
+            inst = self.c << cell
+            if isinstance(other, Port):
+                inst.connect(port, other)
+            else:
+                inst.connect(port, insts[other], other_port.name)  # type: ignore[union-attr]
+        return self.place(cell, op.trans * kdb.Trans.R180 * port.trans.inverted())
+
+    def insert(self, order: list[int], instance_arrays: bool = False) -> list[Instance]:
+        """Insert all placements into the cell.
+
+        Args:
+            order: Indexes of the placements, in the order of the returned instances.
+            instance_arrays: Insert runs of at least three placements of the same
+                cell and orientation with a constant step as instance arrays.
+
+        Returns:
+            The instances in the given order. Each array is listed once.
+        """
+        runs: list[list[int]] = []
+        if instance_arrays:
+            groups: dict[tuple[int, int], list[int]] = {}
+            for i, (cell, trans) in enumerate(zip(self.cells, self.trans)):
+                groups.setdefault((cell.cell_index(), trans.rot), []).append(i)
+            for indexes in groups.values():
+                j = 0
+                while j < len(indexes):
+                    k = j + 1
+                    if j + 2 < len(indexes):
+                        step = (
+                            self.trans[indexes[j + 1]].disp
+                            - self.trans[indexes[j]].disp
+                        )
+                        while (
+                            k + 1 < len(indexes)
+                            and self.trans[indexes[k + 1]].disp
+                            - self.trans[indexes[k]].disp
+                            == step
+                        ):
+                            k += 1
+                        k = k + 1 if k - j >= 2 else j + 1
+                    runs.append(indexes[j:k])
+                    j = k
+            runs.sort(key=lambda run: run[0])
+        else:
+            runs = [[i] for i in range(len(self.cells))]
+
+        insts: dict[int, Instance] = {}
+        self.c.kcl.layout.start_changes()
+        try:
+            for run in runs:
+                if len(run) == 1:
+                    inst = self.c.create_inst(self.cells[run[0]], self.trans[run[0]])
+                else:
+                    step = self.trans[run[1]].disp - self.trans[run[0]].disp
+                    first = run[0]
+                    if step.x < 0 or (step.x == 0 and step.y < 0):
+                        step = -step
+                        first = run[-1]
+                    inst = self.c.create_inst(
+                        self.cells[first],
+                        self.trans[first],
+                        a=step,
+                        b=kdb.Vector(),
+                        na=len(run),
+                    )
+                for i in run:
+                    insts[i] = inst
+        finally:
+            self.c.kcl.layout.end_changes()
+        self.cells.clear()
+        self.trans.clear()
+        return list({id(insts[i]): insts[i] for i in order}.values())
@@ -0,0 +1,253 @@
+"""Tests for the caches of the @cell decorator."""
+
+from collections.abc import Callable
+from pathlib import Path
+
+import kfactory as kf
+
+
+def persistent_factory(
+    kcl: kf.KCLayout, cache: kf.kcell.PersistentCellCache, calls: list[int]
+) -> Callable[..., kf.KCell]:
+    @kcl.cell(persistent_cache=cache)
+    def persistent_box(width: int = 1000) -> kf.KCell:
+        calls.append(width)
+        c = kcl.kcell()
+        layer = kcl.layer(1, 0)
+        c.shapes(layer).insert(kf.kdb.Box(width))
+        c.create_port(name="o1", trans=kf.kdb.Trans.R0, width=width, layer=layer)
+        c.info["area"] = width * width
+        return c
+
+    return persistent_box
+
+
+def test_persistent_cache(tmp_path: Path) -> None:
+    calls: list[int] = []
+    cache = kf.kcell.PersistentCellCache(tmp_path)
+    kcl1 = kf.KCLayout("PERSISTENT_CACHE_1")
+    c1 = persistent_factory(kcl1, cache, calls)(width=1000)
+
+    kcl2 = kf.KCLayout("PERSISTENT_CACHE_2")
+    c2 = persistent_factory(kcl2, kf.kcell.PersistentCellCache(tmp_path), calls)(
+        width=1000
+    )
+
+    assert calls == [1000]
+    assert c2.name == c1.name
+    assert c2._locked
+    assert c2.bbox() == c1.bbox()
+    assert c2.settings == c1.settings
+    assert c2.info["area"] == 1000 * 1000
+    assert c2.ports["o1"].trans == c1.ports["o1"].trans
+    assert c2.ports["o1"].width == 1000
+
+
+def test_persistent_cache_eviction(tmp_path: Path) -> None:
+    calls: list[int] = []
+    cache = kf.kcell.PersistentCellCache(tmp_path, max_entries=2)
+    kcl = kf.KCLayout("PERSISTENT_CACHE_EVICT")
+    factory = persistent_factory(kcl, cache, calls)
+    for width in (1000, 2000, 3000):
+        factory(width=width)
+    assert len(cache) == 2
+    assert len(list(tmp_path.glob("*.oas"))) == 2
+    assert len(list(tmp_path.glob("*.pkl"))) == 2
+
+    cache.invalidate(factory)
+    assert len(cache) == 0
+    assert not list(tmp_path.glob("*.oas"))
+    assert not list(tmp_path.glob("*.pkl"))
+
+
+LEAF_SOURCE = """
+def persistent_leaf(width: int = 1000) -> kf.KCell:
+    c = kcl.kcell()
+    c.shapes(kcl.layer(1, 0)).insert(kf.kdb.Box(width, {length}))
+    return c
+"""
+
+
+def persistent_parent_factory(
+    kcl: kf.KCLayout,
+    cache: kf.kcell.PersistentCellCache,
+    calls: list[int],
+    length: int,
+) -> tuple[Callable[..., kf.KCell], Callable[..., kf.KCell]]:
+    namespace = {"kf": kf, "kcl": kcl, "__name__": "persistent_leaves"}
+    exec(LEAF_SOURCE.format(length=length), namespace)
+    leaf = kcl.cell(namespace["persistent_leaf"])
+
+    @kcl.cell(persistent_cache=cache)
+    def persistent_parent(width: int = 1000) -> kf.KCell:
+        calls.append(width)
+        c = kcl.kcell()
+        c << leaf(width)
+        return c
+
+    return persistent_parent, leaf
+
+
+def test_persistent_cache_children(tmp_path: Path) -> None:
+    calls: list[int] = []
+    kcl1 = kf.KCLayout("PERSISTENT_CACHE_CHILDREN_1")
+    parent, _ = persistent_parent_factory(
+        kcl1, kf.kcell.PersistentCellCache(tmp_path), calls, 500
+    )
+    c1 = parent(1000)
+
+    kcl2 = kf.KCLayout("PERSISTENT_CACHE_CHILDREN_2")
+    parent, leaf = persistent_parent_factory(
+        kcl2, kf.kcell.PersistentCellCache(tmp_path), calls, 500
+    )
+    c2 = parent(1000)
+    assert calls == [1000]
+    assert leaf(1000) is c2.insts[0].cell
+    assert len(kcl2.layout.cells("persistent_leaf*")) == 1
+
+    kcl3 = kf.KCLayout("PERSISTENT_CACHE_CHILDREN_3")
+    parent, _ = persistent_parent_factory(
+        kcl3, kf.kcell.PersistentCellCache(tmp_path), calls, 700
+    )
+    c3 = parent(1000)
+    assert calls == [1000, 1000]
+    assert c3.bbox() != c1.bbox()
+
+
+def test_cell_cache_stats() -> None:
+    kcl = kf.KCLayout("CELL_CACHE_STATS")
+    cache = kf.kcell.KCellCache(maxsize=2, delete_evicted=True)
+
+    @kcl.cell(cache=cache)
+    def cached_box(width: int = 1000) -> kf.KCell:
+        c = kcl.kcell()
+        c.shapes(kcl.layer(1, 0)).insert(kf.kdb.Box(width))
+        return c
+
+    c1 = cached_box(1000)
+    assert cached_box(1000) is c1
+    c2 = cached_box(2000)
+    name = f"{cached_box.__module__}.{cached_box.__qualname__}"
+    assert kcl.cell_caches[name] is cache
+    stats = kcl.cache_stats()[name]
+    assert (stats.hits, stats.misses, stats.evictions) == (1, 2, 0)
+    assert stats.build_time > 0
+
+    parent = kcl.kcell("CELL_CACHE_PARENT")
+    parent << c2
+    cached_box(3000)
+    cached_box(4000)
+    assert stats.evictions == 2
+    assert c1._destroyed()
+    assert not c2._destroyed()
+    assert len(cache) == 2
+
+
+def test_cell_cache_oversized() -> None:
+    kcl = kf.KCLayout("CELL_CACHE_OVERSIZED")
+    calls: list[int] = []
+
+    @kcl.cell(cache=kf.kcell.KCellCache(maxsize=10, getsizeof=lambda c: 100))
+    def large_box(width: int = 1000) -> kf.KCell:
+        calls.append(width)
+        c = kcl.kcell()
+        c.shapes(kcl.layer(1, 0)).insert(kf.kdb.Box(width))
+        return c
+
+    c = large_box(1000)
+    assert large_box(1000) is c
+    assert calls == [1000]
+    assert kcl.layout.cells("large_box*") == [c._kdb_cell]
+
+
+def test_cell_cache_keep_evicted() -> None:
+    kcl = kf.KCLayout("CELL_CACHE_KEEP_EVICTED")
+
+    @kcl.cell(cache=kf.kcell.KCellCache(maxsize=1))
+    def kept_box(width: int = 1000) -> kf.KCell:
+        c = kcl.kcell()
+        c.shapes(kcl.layer(1, 0)).insert(kf.kdb.Box(width))
+        return c
+
+    top = kept_box(1000)
+    kept_box(2000)
+    assert not top._destroyed()
+
+
+def box_factory(kcl: kf.KCLayout) -> Callable[..., kf.KCell]:
+    @kcl.cell
+    def box(width: int = 1000) -> kf.KCell:
+        c = kcl.kcell()
+        c.shapes(kcl.layer(1, 0)).insert(kf.kdb.Box(width))
+        return c
+
+    return box
+
+
+def other_box_factory(kcl: kf.KCLayout) -> Callable[..., kf.KCell]:
+    @kcl.cell
+    def box(width: int = 1000) -> kf.KCell:
+        c = kcl.kcell()
+        c.shapes(kcl.layer(2, 0)).insert(kf.kdb.Box(width))
+        return c
+
+    return box
+
+
+def test_cell_cache_names() -> None:
+    kcl = kf.KCLayout("CELL_CACHE_NAMES")
+    box = box_factory(kcl)
+    other_box = other_box_factory(kcl)
+    box(1000)
+    other_box(2000)
+    other_box(3000)
+    caches = kcl.cell_caches
+    assert len(caches[f"{box.__module__}.{box.__qualname__}"]) == 1
+    assert len(caches[f"{other_box.__module__}.{other_box.__qualname__}"]) == 2
+
+
+def test_cell_cache_lfu() -> None:
+    kcl = kf.KCLayout("CELL_CACHE_LFU")
+    cache = kf.kcell.KCellCache(maxsize=2, policy="lfu", delete_evicted=False)
+
+    @kcl.cell(cache=cache)
+    def lfu_box(width: int = 1000) -> kf.KCell:
+        c = kcl.kcell()
+        c.shapes(kcl.layer(1, 0)).insert(kf.kdb.Box(width))
+        return c
+
+    c1 = lfu_box(1000)
+    lfu_box(1000)
+    lfu_box(2000)
+    lfu_box(3000)
+    assert lfu_box(1000) is c1
+    assert cache.stats.evictions == 1
+    assert not c1._destroyed()
+
+    kcl.delete_cell(c1)
+    assert lfu_box(1000) is not c1
+
+
+def test_cell_cache_key() -> None:
+    kcl = kf.KCLayout("CELL_CACHE_KEY")
+
+    @kcl.cell
+    def key_box(width: int, length: int = 1000, info: dict[str, int] = {}) -> kf.KCell:
+        c = kcl.kcell()
+        c.shapes(kcl.layer(1, 0)).insert(kf.kdb.Box(width, length))
+        return c
+
+    c = key_box(500)
+    assert key_box(width=500) is c
+    assert key_box(500, 1000) is c
+    assert key_box(length=1000, width=500, info={}) is c
+    assert key_box(500, info={"a": 1}) is key_box(500, info={"a": 1})
+    assert key_box(500, info={"a": 1}) is not c
+
+    @kcl.cell
+    def kwargs_box(width: int = 500, **kwargs: int) -> kf.KCell:
+        c = kcl.kcell()
+        c.shapes(kcl.layer(1, 0)).insert(kf.kdb.Box(width, kwargs.get("length", 1)))
+        return c
+
+    assert kwargs_box(length=2, a=1) is kwargs_box(a=1, length=2)
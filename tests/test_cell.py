@@ -3,6 +3,32 @@ import kfactory as kf
 from collections.abc import Callable
 
 
+@kf.kcl.cell
+def parallel_taper(width: int, length: int) -> kf.KCell:
+    c = kf.kcl.kcell()
+    layer = kf.kcl.layer(1, 0)
+    c.shapes(layer).insert(
+        kf.kdb.Polygon([(0, -width), (length, -500), (length, 500), (0, width)])
+    )
+    c.create_port(name="o1", trans=kf.kdb.Trans.R180, width=2 * width, layer=layer)
+    c.create_port(name="o2", trans=kf.kdb.Trans(length, 0), width=1000, layer=layer)
+    return c
+
+
+@kf.kcl.cell
+def parallel_leaf(width: int) -> kf.KCell:
+    c = kf.kcl.kcell()
+    c.shapes(kf.kcl.layer(1, 0)).insert(kf.kdb.Box(width))
+    return c
+
+
+@kf.kcl.cell
+def parallel_parent(width: int) -> kf.KCell:
+    c = kf.kcl.kcell()
+    c << parallel_leaf(width)
+    return c
+
+
 def test_enclosure_name(straight_factory_dbu: Callable[..., kf.KCell]) -> None:
     wg = straight_factory_dbu(width=1000, length=10000)
     assert wg.name == "straight_W1000_L10000_LWG_EWGSTD"
@@ -64,6 +90,13 @@ def test_ports_cell(LAYER: kf.LayerEnum) -> None:
     assert c["o1"]
 
 
+def test_ports_attached(LAYER: kf.LayerEnum) -> None:
+    ports = kf.Ports(kf.kcl)
+    ports.create_port(name="o1", trans=kf.kdb.Trans.R0, width=1000, layer=LAYER.WG)
+    c = kf.KCell(ports=ports)
+    assert c.ports is ports
+
+
 def test_getter(LAYER: kf.LayerEnum) -> None:
     c = kf.KCell()
     c << kf.cells.straight.straight(width=1, length=10, layer=LAYER.WG)
@@ -127,3 +160,91 @@ def test_info() -> None:
 
     c = test_info_cell(42)
     assert c.info["test"] == 42
+
+
+def test_hash_cache(straight: kf.KCell, LAYER: kf.LayerEnum) -> None:
+    h = straight.hash()
+    assert straight._hash == h
+    assert straight.hash() == h
+
+    c = kf.KCell()
+    c << straight
+    h1 = c.hash()
+    assert c._hash is None
+    c.shapes(LAYER.WG).insert(kf.kdb.Box(500))
+    h2 = c.hash()
+    assert h1 != h2
+    c._locked = True
+    assert c.hash() == h2
+    assert c._hash == h2
+
+
+def test_hash_cache_locked_shapes(straight: kf.KCell, LAYER: kf.LayerEnum) -> None:
+    h = straight.hash()
+    with pytest.raises(RuntimeError):
+        straight.shapes(LAYER.WG).insert(kf.kdb.Box(5000))
+    with pytest.raises(RuntimeError):
+        straight._kdb_cell.transform(kf.kdb.Trans(1, False, 0, 0))
+    with pytest.raises(RuntimeError):
+        straight.shapes(LAYER.WG).clear()
+    assert straight.hash() == h
+
+
+def test_kcl_dup() -> None:
+    kcl = kf.KCLayout("DUP_SOURCE")
+    locked = kcl.kcell("locked")
+    locked.create_port(
+        name="o1", trans=kf.kdb.Trans.R0, width=1000, layer=kcl.layer(1, 0)
+    )
+    locked.info["length"] = 10
+    locked._settings = kf.kcell.KCellSettings(length=10)
+    locked._locked = True
+    unlocked = kcl.kcell("unlocked")
+    unlocked << locked
+    unlocked.create_port(
+        name="o1", trans=kf.kdb.Trans.R180, width=1000, layer=kcl.layer(1, 0)
+    )
+
+    kcl_dup = kcl.dup()
+    unlocked.ports["o1"].width = 2000
+
+    locked_dup = kcl_dup["locked"]
+    unlocked_dup = kcl_dup["unlocked"]
+    assert locked_dup.settings is locked.settings
+    for cell, dup in ((locked, locked_dup), (unlocked, unlocked_dup)):
+        assert len(dup.ports) == 1
+        assert dup.ports[0] is not cell.ports[0]
+        assert dup.ports[0].kcl is kcl_dup
+        assert dup.ports[0].trans == cell.ports[0].trans
+    assert unlocked_dup.ports["o1"].width == 1000
+    assert [inst.cell.name for inst in unlocked_dup.insts] == ["locked"]
+    assert unlocked_dup.insts[0].cell is locked_dup
+
+
+def test_build_parallel() -> None:
+    params = [{"width": 1000 + 100 * i, "length": 10_000} for i in range(4)]
+    cells = kf.kcl.build_parallel(parallel_taper, params + params[:1], workers=2)
+
+    assert [c.name for c in cells] == [
+        f"parallel_taper_W{1000 + 100 * i}_L10000" for i in range(4)
+    ] + ["parallel_taper_W1000_L10000"]
+    assert cells[4] is cells[0]
+    for c, p in zip(cells, params):
+        assert c.kcl is kf.kcl
+        assert c.settings.width == p["width"]
+        assert c.ports["o1"].width == 2 * p["width"]
+        assert c.ports["o2"].trans == kf.kdb.Trans(10_000, 0)
+        assert parallel_taper(**p) is c
+
+
+def test_build_parallel_children() -> None:
+    cells = kf.kcl.build_parallel(
+        parallel_parent, [{"width": 1234}, {"width": 2345}], workers=2
+    )
+
+    leaf = parallel_leaf(1234)
+    assert [c.name for c in kf.kcl.layout.each_cell() if c.name == leaf.name] == [
+        leaf.name
+    ]
+    assert cells[0].insts[0].cell is leaf
+    assert parallel_leaf(2345) is cells[1].insts[0].cell
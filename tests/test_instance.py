@@ -1,5 +1,6 @@
 import kfactory as kf
 import klayout.db as kdb
+import pytest
 
 
 def test_instance_xsize(LAYER: kf.LayerEnum) -> None:
@@ -73,3 +74,100 @@ def test_dmirror(LAYER: kf.LayerEnum) -> None:
 
     c.shapes(LAYER.WG).insert(kf.kdb.DEdge(mp1, mp2).transformed(disp))
     c.show()
+
+
+def test_instance_name_index(straight: kf.KCell) -> None:
+    c = kf.KCell()
+    insts = [c << straight for _ in range(100)]
+    for i, inst in enumerate(insts):
+        inst.name = f"s{i}"
+    assert c.insts["s42"] is insts[42]
+
+    insts[42].name = "renamed"
+    assert c.insts["renamed"] is insts[42]
+    insts[43].name = "s0"
+    assert c.insts.get_duplicate_names() == {"s0": [insts[0], insts[43]]}
+
+    unnamed = c << straight
+    unnamed.d.movex(10)
+    assert c.insts[unnamed.name] is unnamed
+
+    insts[1].delete()
+    with pytest.raises(KeyError):
+        c.insts["s1"]
+    assert len(c.insts) == 100
+
+
+def test_instance_array_ports(straight: kf.KCell) -> None:
+    c = kf.KCell()
+    inst = c.create_inst(
+        straight,
+        kdb.Trans(1, True, 1000, -500),
+        a=kdb.Vector(0, 5000),
+        b=kdb.Vector(20000, 0),
+        na=3,
+        nb=4,
+    )
+    arr = inst.ports.array()
+    ports = list(inst.ports)
+    assert len(arr) == len(ports) == 3 * 4 * len(straight.ports)
+    for entry, port in zip(arr, ports):
+        assert inst.ports.port(entry) == port
+        assert (entry["x"], entry["y"]) == (port.x, port.y)
+        assert entry["angle"] == port.angle
+        assert entry["width"] == port.width
+        assert entry["layer"] == port.layer
+
+    o2 = inst.ports.filter(regex="o2", angle=ports[1].angle)
+    assert o2 == [p for p in ports if p.name == "o2"]
+    assert inst.ports.nearest(kdb.Point(*ports[13].center)) == ports[13]
+
+    inst.transform(kdb.DCplxTrans(1, 30, False, 0.5, 0))
+    ports = list(inst.ports)
+    arr = inst.ports.array()
+    for entry, port in zip(arr, ports):
+        assert inst.ports.port(entry) == port
+        assert abs(entry["x"] - port.dcplx_trans.disp.x / c.kcl.dbu) < 1e-6
+        assert abs(entry["y"] - port.dcplx_trans.disp.y / c.kcl.dbu) < 1e-6
+        assert entry["orientation"] == port.orientation
+    assert inst.ports.nearest(ports[7].dcplx_trans.disp.to_p()) == ports[7]
+
+
+def test_connect_many(straight: kf.KCell, bend90: kf.KCell) -> None:
+    cells = [straight, bend90] * 50
+
+    c1 = kf.KCell()
+    insts1 = [c1 << cell for cell in cells]
+    for previous, inst in zip(insts1, insts1[1:]):
+        inst.connect("o1", previous, "o2", allow_width_mismatch=True)
+
+    c2 = kf.KCell()
+    insts2 = [c2 << cell for cell in cells]
+    insts2[0].connect_chain(
+        "o2", [(inst, "o1", "o2") for inst in insts2[1:]], allow_width_mismatch=True
+    )
+
+    assert [inst.trans for inst in insts1] == [inst.trans for inst in insts2]
+
+    c3 = kf.KCell()
+    s1 = c3 << straight
+    s2 = c3 << straight
+    s2.transform(kdb.Trans(5000, 0))
+    with pytest.raises(kf.kcell.PortWidthMismatch):
+        c3.connect_many(
+            [
+                (s2, "o1", s1, "o2"),
+                (
+                    s1,
+                    "o1",
+                    kf.Port(
+                        name="x",
+                        width=10,
+                        layer=straight.ports["o1"].layer,
+                        trans=kdb.Trans.R0,
+                    ),
+                    None,
+                ),
+            ]
+        )
+    assert s2.trans == kdb.Trans(5000, 0)
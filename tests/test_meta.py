@@ -1,6 +1,7 @@
 """Tests for read and write of metadata."""
 
 import kfactory as kf
+from pathlib import Path
 from tempfile import NamedTemporaryFile
 
 
@@ -141,3 +142,115 @@ def test_info_dump() -> None:
 
     assert c.info == c.info.model_copy()
     assert c.settings == c.settings.model_copy()
+
+
+def test_metainfo_v3(straight: kf.KCell) -> None:
+    """Test reading and writing of the packed metadata format."""
+    kf.config.meta_format = "v3"
+    try:
+        with NamedTemporaryFile("a", suffix=".oas") as t:
+            straight.kcl.write(t.name)
+
+            kcl = kf.KCLayout("TEST_META_V3")
+            kcl.read(t.name)
+    finally:
+        kf.config.meta_format = "v2"
+
+    assert kcl.get_meta_data()[1]["meta_format"] == "v3"
+    wg_read = kcl[straight.name]
+    names = [meta.name for meta in wg_read.each_meta_info()]
+    assert names == ["kfactory:cell"]
+
+    assert wg_read.settings == straight.settings
+    assert len(wg_read.ports) == len(straight.ports)
+    for port, read_port in zip(straight.ports, wg_read.ports):
+        assert port.name == read_port.name
+        assert port.trans == read_port.trans
+        assert port.dcplx_trans == read_port.dcplx_trans
+        assert port.port_type == read_port.port_type
+        assert port.width == read_port.width
+
+    wg_read.set_meta_data(meta_format="v2")
+    assert wg_read.meta_info("kfactory:cell") is None
+    wg_read.ports = kf.Ports(kcl=kcl)
+    wg_read.get_meta_data()
+    assert [p.name for p in wg_read.ports] == [p.name for p in straight.ports]
+
+
+def test_metainfo_v3_dcplx() -> None:
+    """Test packed metadata of off-grid ports with info."""
+    c = kf.KCell()
+    port = c.create_port(
+        name="o1",
+        dwidth=1,
+        layer=c.kcl.layer(1, 0),
+        dcplx_trans=kf.kdb.DCplxTrans(1, 33.3, True, 0.1234567891234, 5),
+    )
+    port.info["length"] = 1.5
+    c.set_meta_data(meta_format="v3")
+
+    c.ports = kf.Ports(kcl=c.kcl)
+    c.get_meta_data()
+
+    assert c.ports["o1"].dcplx_trans == port.dcplx_trans
+    assert c.ports["o1"].info["length"] == 1.5
+
+
+def test_write_skip_unchanged_meta(straight: kf.KCell) -> None:
+    """Test that unchanged cells don't set their metadata again on write."""
+    kcl = straight.kcl
+    with NamedTemporaryFile("a", suffix=".oas") as t:
+        kcl.write(t.name)
+        kcl.write(t.name)
+        assert kcl.write_stats.cells_updated == 0
+        assert kcl.write_stats.cells_skipped == len(kcl.kcells)
+        assert not straight.meta_dirty
+
+        straight.info["meta_test"] = 1
+        assert straight.meta_dirty
+        kcl.write(t.name)
+        assert kcl.write_stats.cells_updated == 1
+
+        kcl2 = kf.KCLayout("TEST_META_DIRTY")
+        kcl2.read(t.name)
+        assert kcl2[straight.name].info["meta_test"] == 1
+
+
+def test_write_many(straight: kf.KCell, bend90: kf.KCell, tmp_path: Path) -> None:
+    """Test concurrent writing of cells and layouts."""
+    lib = kf.KCLayout("TEST_WRITE_MANY_LIB")
+    lib_cell = lib.kcell("lib_cell")
+    lib_cell.shapes(lib.layer(1, 0)).insert(kf.kdb.Box(1000))
+
+    targets: dict[str | Path, kf.KCell | kf.KCLayout] = {
+        tmp_path / "straight.oas": straight,
+        tmp_path / "bend90.gds": bend90,
+        tmp_path / "lib.oas": lib,
+    }
+    stats = straight.kcl.write_many(targets, n_threads=2)
+    assert list(stats) == list(targets)
+    data = {p: p.read_bytes() for p in stats}
+
+    straight.kcl.write_many(targets, n_threads=2)
+    assert data == {p: p.read_bytes() for p in stats}
+
+    kcl = kf.KCLayout("TEST_WRITE_MANY")
+    kcl.read(tmp_path / "straight.oas")
+    assert {c.name for c in kcl.layout.each_cell()} == {straight.name}
+    assert [p.name for p in kcl[straight.name].ports] == ["o1", "o2"]
+
+
+def test_read_lazy(straight: kf.KCell, bend90: kf.KCell, tmp_path: Path) -> None:
+    """Test lazy registration and filtering of read cells."""
+    path = tmp_path / "lazy.oas"
+    straight.kcl.write(path)
+
+    kcl = kf.KCLayout("TEST_READ_LAZY")
+    kcl.read(path, register_cells=True, lazy=True, cell_filter="straight*")
+    assert kcl.layout.cell(bend90.name) is None
+
+    kc = kcl[straight.name]
+    assert kc._lazy_meta_format is not None
+    assert [p.name for p in kc.ports] == ["o1", "o2"]
+    assert kc._lazy_meta_format is None
+    assert kc.settings == straight.settings
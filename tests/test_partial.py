@@ -1,3 +1,5 @@
+import gc
+
 import kfactory as kf
 from functools import partial
 
@@ -28,3 +30,39 @@ def partial_cell(partial: partial[kf.KCell]) -> kf.KCell:
 def test_partial(LAYER: kf.LayerEnum) -> None:
     c = partial_cell(partial(to_be_partialled, width=1, length=10, layer=LAYER.WG))
     assert "<" not in c.name
+
+
+def test_partial_name() -> None:
+    p = partial(to_be_partialled, 1, length=10.5)
+    assert kf.kcell.get_cell_name("partial_cell", partial=p) == (
+        "partial_cell_PFto_be_partialled_Mtest_partial_SW1_L10p5"
+    )
+    assert kf.kcell.get_cell_name("partial_cell", partial=p) == (
+        kf.kcell.get_cell_name("partial_cell", partial=p)
+    )
+    p.keywords["length"] = 20
+    assert kf.kcell.get_cell_name("partial_cell", partial=p) == (
+        "partial_cell_PFto_be_partialled_Mtest_partial_SW1_L20"
+    )
+    assert kf.kcell.clean_name("a=b,c)(d-e.f:g[h] i") == "ab_cdmepf_gh_i"
+
+
+def test_cell_name_memo() -> None:
+    for value in (1, 1.0, 1.5, True, None, 0.0, -0.0, "a b", -2):
+        name = kf.kcell.get_cell_name("memo_cell", width=value, n=3)
+        assert name == kf.kcell._get_cell_name("memo_cell", {"width": value, "n": 3})
+        assert kf.kcell.get_cell_name("memo_cell", width=value, n=3) == name
+    assert kf.kcell.get_cell_name("memo_cell", width=-0.0) == "memo_cell_Wm0"
+    assert kf.kcell.get_cell_name("memo_cell", width=0.0) == "memo_cell_W0"
+    assert kf.kcell.get_cell_name("memo_cell", width=True) == "memo_cell_WTrue"
+
+
+def test_parameter_names_weak() -> None:
+    def to_be_collected(a: int, b: int) -> None:
+        pass
+
+    assert kf.kcell._parameter_names(to_be_collected) == ("a", "b")
+    assert to_be_collected in kf.kcell._parameter_names_cache
+    del to_be_collected
+    gc.collect()
+    assert all(f.__name__ != "to_be_collected" for f in kf.kcell._parameter_names_cache)
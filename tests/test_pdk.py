@@ -284,6 +284,179 @@ def test_merge_properties() -> None:
     Path("MERGE_READ.oas").unlink(missing_ok=True)
 
 
+def test_merge_read_equal(tmp_path: Path) -> None:
+    kcl_1 = kf.KCLayout("MERGE_EQUAL_BASE")
+    s_base = kf.factories.straight.straight_dbu_factory(kcl_1)(
+        width=1000, length=10_000, layer=kcl_1.layer(1, 0)
+    )
+
+    kcl_2 = kf.KCLayout("MERGE_EQUAL_READ")
+    s_read = kf.factories.straight.straight_dbu_factory(kcl_2)(
+        width=1000, length=10_000, layer=kcl_2.layer(1, 0)
+    )
+    top = kcl_2.kcell("TOP")
+    top << s_read
+
+    kcl_2.write(tmp_path / "merge_equal.oas")
+    kcl_1.read(tmp_path / "merge_equal.oas")
+
+    names = [c.name for c in kcl_1.layout.each_cell()]
+    assert sorted(names) == sorted([s_base.name, "TOP"])
+    assert [inst.cell.name for inst in kcl_1["TOP"].insts] == [s_base.name]
+    assert kcl_1["TOP"].insts[0].cell_index == s_base.cell_index()
+
+
+def _write_nested_merge_file(path: Path) -> None:
+    kcl = kf.KCLayout(f"MERGE_NESTED_{path.stem}")
+    layer = kcl.layer(1, 0)
+    a = kcl.kcell("A")
+    a.shapes(layer).insert(kf.kdb.Box(1000))
+    grand = kcl.kcell("GRAND")
+    grand.shapes(layer).insert(kf.kdb.Box(200))
+    new_child = kcl.kcell("NEWCHILD")
+    new_child << grand
+    top = kcl.kcell("TOP")
+    top << a
+    new_child_inst = top << new_child
+    new_child_inst.transform(kf.kdb.Trans(5000, 0))
+    kcl.write(path)
+
+
+def _merge_nested_base(name: str) -> kf.KCLayout:
+    kcl = kf.KCLayout(name)
+    a = kcl.kcell("A")
+    a.shapes(kcl.layer(1, 0)).insert(kf.kdb.Box(1000))
+    top = kcl.kcell("TOP")
+    top << a
+    return kcl
+
+
+def _cell_tree(kcl: kf.KCLayout) -> dict[str, list[str]]:
+    return {
+        c.name: sorted(kcl.layout.cell(inst.cell_index).name for inst in c.each_inst())
+        for c in kcl.layout.each_cell()
+    }
+
+
+def test_merge_read_skip_nested(tmp_path: Path) -> None:
+    _write_nested_merge_file(tmp_path / "nested.oas")
+    kcl = _merge_nested_base("MERGE_SKIP_NESTED")
+    kcl.read(
+        tmp_path / "nested.oas",
+        options=kf.kcell.load_layout_options(),
+        test_merge=False,
+    )
+
+    assert _cell_tree(kcl) == {"A": [], "TOP": ["A"]}
+
+
+def test_merge_read_add_nested(tmp_path: Path) -> None:
+    _write_nested_merge_file(tmp_path / "nested.oas")
+    kcl = _merge_nested_base("MERGE_ADD_NESTED")
+    options = kf.kcell.load_layout_options()
+    options.cell_conflict_resolution = (
+        kf.kdb.LoadLayoutOptions.CellConflictResolution.AddToCell
+    )
+    kcl.read(tmp_path / "nested.oas", options=options, test_merge=False)
+
+    assert _cell_tree(kcl) == {
+        "A": [],
+        "GRAND": [],
+        "NEWCHILD": ["GRAND"],
+        "TOP": ["A", "NEWCHILD"],
+    }
+
+
+def _build_parity_cells(
+    layout: kf.kdb.Layout, tree: dict[str, list[str]], size: int
+) -> None:
+    layer = layout.layer(1, 0)
+    cells = {name: layout.create_cell(name) for name in tree}
+    for name, children in tree.items():
+        cells[name].shapes(layer).insert(kf.kdb.Box(size))
+        for i, child in enumerate(children):
+            cells[name].insert(
+                kf.kdb.CellInstArray(
+                    cells[child].cell_index(), kf.kdb.Trans(i * 1000, 0)
+                )
+            )
+
+
+def _layout_state(layout: kf.kdb.Layout) -> list[tuple[str, int, list[str]]]:
+    layer = layout.layer(1, 0)
+    return sorted(
+        (
+            c.name,
+            c.shapes(layer).size(),
+            sorted(
+                f"{layout.cell(inst.cell_index).name} {inst.trans}"
+                for inst in c.each_inst()
+            ),
+        )
+        for c in layout.each_cell()
+    )
+
+
+@pytest.mark.parametrize(
+    "mode",
+    [
+        kf.kdb.LoadLayoutOptions.CellConflictResolution.SkipNewCell,
+        kf.kdb.LoadLayoutOptions.CellConflictResolution.AddToCell,
+        kf.kdb.LoadLayoutOptions.CellConflictResolution.OverwriteCell,
+    ],
+)
+def test_merge_read_parity(
+    tmp_path: Path, mode: kf.kdb.LoadLayoutOptions.CellConflictResolution
+) -> None:
+    existing = {
+        "TOP": ["A", "OLD"],
+        "A": [],
+        "OLD": ["OLDCHILD"],
+        "OLDCHILD": [],
+        "B": [],
+        "C": [],
+    }
+    read = {
+        "TOP": ["A", "NEWCHILD"],
+        "A": [],
+        "NEWCHILD": ["GRAND"],
+        "GRAND": [],
+        "B": ["SHARED"],
+        "C": ["SHARED"],
+        "SHARED": [],
+    }
+    layout = kf.kdb.Layout()
+    _build_parity_cells(layout, read, 500)
+    layout.write(tmp_path / "parity.oas")
+
+    options = kf.kcell.load_layout_options()
+    options.cell_conflict_resolution = mode
+    ref = kf.kdb.Layout()
+    _build_parity_cells(ref, existing, 1000)
+    ref.read(str(tmp_path / "parity.oas"), options)
+
+    kcl = kf.KCLayout(f"MERGE_PARITY_{mode}")
+    _build_parity_cells(kcl.layout, existing, 1000)
+    kcl.read(tmp_path / "parity.oas", options=options, test_merge=False)
+
+    assert _layout_state(kcl.layout) == _layout_state(ref)
+
+
+def test_merge_read_keeps_dbu(tmp_path: Path) -> None:
+    layout = kf.kdb.Layout()
+    layout.dbu = 0.005
+    layout.create_cell("SMALL").shapes(layout.layer(1, 0)).insert(kf.kdb.Box(1000))
+    layout.write(tmp_path / "dbu.oas")
+
+    kcl = kf.KCLayout("MERGE_DBU")
+    kcl.kcell("EXISTING").shapes(kcl.layer(1, 0)).insert(kf.kdb.Box(1000))
+    kcl.read(tmp_path / "dbu.oas", test_merge=False)
+
+    assert kcl.layout.dbu == 0.001
+    assert kcl["EXISTING"].dbbox() == kf.kdb.DBox(1)
+    assert kcl.layout.cell("SMALL").dbbox() == kf.kdb.DBox(5)
+
+
 def test_pdk_cell_infosettings(straight: kf.KCell) -> None:
     kcl = kf.KCLayout("INFOSETTINGS")
     c = kcl.kcell()
@@ -291,3 +464,67 @@ def test_pdk_cell_infosettings(straight: kf.KCell) -> None:
     _wg.cell
     assert _wg.cell.settings == straight.settings
     assert _wg.cell.info == straight.info
+
+
+def test_merge_diff_sharded() -> None:
+    layout_a = kf.kdb.Layout()
+    layout_b = kf.kdb.Layout()
+    for layout in (layout_a, layout_b):
+        leaf = layout.create_cell("leaf")
+        leaf.shapes(layout.layer(2, 0)).insert(kf.kdb.Box(50))
+        top = layout.create_cell("top")
+        top.shapes(layout.layer(1, 0)).insert(kf.kdb.Box(0, 0, 1000, 500))
+        top.shapes(layout.layer(1, 0)).insert(kf.kdb.Box(500, 0, 1500, 500))
+    layout_b.cell("top").shapes(layout_b.layer(1, 0)).insert(
+        kf.kdb.Box(2000, 0, 2500, 500)
+    )
+    layout_b.cell("top").insert(
+        kf.kdb.CellInstArray(layout_b.cell("leaf").cell_index(), kf.kdb.Trans(0, 1000))
+    )
+
+    diff = kf.kcell.MergeDiff(layout_a, layout_b, "A", "B", loglevel=None)
+    diff_sharded = kf.kcell.MergeDiff(layout_a, layout_b, "A", "B", loglevel=None)
+    assert diff.compare() == diff_sharded.compare_sharded() is False
+
+    for layer in ((1, 0), (2, 0)):
+        xor = kf.kdb.Region(
+            diff.diff_xor.cell("top").shapes(diff.diff_xor.layer(*layer))
+        )
+        xor_sharded = kf.kdb.Region(
+            diff_sharded.diff_xor.cell("top").shapes(
+                diff_sharded.diff_xor.layer(*layer)
+            )
+        )
+        assert not xor.is_empty()
+        assert (xor ^ xor_sharded).is_empty()
+
+
+def test_merge_read_rebuilds_locked(tmp_path: Path) -> None:
+    kcl_file = kf.KCLayout("MERGE_LOCKED_FILE")
+    layer = kcl_file.layer(1, 0)
+    child = kcl_file.kcell("CHILD")
+    child.shapes(layer).insert(kf.kdb.Box(500))
+    base = kcl_file.kcell("base_cell")
+    base.shapes(layer).insert(kf.kdb.Box(1000))
+    base << child
+    kcl_file.write(tmp_path / "locked.oas")
+
+    kcl = kf.KCLayout("MERGE_LOCKED")
+
+    @kcl.cell
+    def base_cell() -> kf.KCell:
+        c = kcl.kcell()
+        c.shapes(kcl.layer(1, 0)).insert(kf.kdb.Box(1000))
+        return c
+
+    c = base_cell()
+    assert c._locked
+    assert len(c.insts) == 0
+
+    options = kf.kcell.load_layout_options()
+    options.cell_conflict_resolution = (
+        kf.kdb.LoadLayoutOptions.CellConflictResolution.AddToCell
+    )
+    kcl.read(tmp_path / "locked.oas", options=options, test_merge=False)
+
+    assert [inst.cell.name for inst in c.insts] == ["CHILD"]
@@ -0,0 +1,108 @@
+import os
+from pathlib import Path
+
+import pytest
+
+import kfactory as kf
+
+
+def _write_yaml(path: Path, n: int) -> None:
+    cells = []
+    for i in range(n):
+        cell = f"- !KCell\n  name: yaml_cell{i}\n"
+        if i:
+            cell += f"  insts:\n    - cellname: yaml_cell{i - 1}\n"
+            cell += f"      trans: 'r0 {i},0'\n"
+        cells.append(cell)
+    path.write_text("".join(cells))
+
+
+def test_cells_from_yaml_cached(tmp_path: Path) -> None:
+    inc = tmp_path / "inc.yaml"
+    _write_yaml(inc, 2)
+    top = tmp_path / "top.yaml"
+    top.write_text(
+        "- !include {filename: inc.yaml}\n"
+        "- !KCell\n  name: yaml_top\n  insts:\n    - cellname: yaml_cell1\n"
+    )
+    cache_dir = tmp_path / "cache"
+
+    kcl = kf.KCLayout("YAML_UNCACHED")
+    kf.placer.cells_from_yaml(top, kcl, cache_dir=cache_dir)
+    assert len(list(cache_dir.iterdir())) == 2
+
+    kf.placer._compiled_yaml.clear()
+    kcl_cached = kf.KCLayout("YAML_CACHED")
+    kf.placer.cells_from_yaml(top, kcl_cached, cache_dir=cache_dir)
+    for kcl_ in (kcl, kcl_cached):
+        assert sorted(c.name for c in kcl_.layout.each_cell()) == [
+            "yaml_cell0",
+            "yaml_cell1",
+            "yaml_top",
+        ]
+        assert kcl_["yaml_cell1"].insts[0].trans == kf.kdb.Trans(1, 0)
+
+    _write_yaml(inc, 3)
+    kcl_changed = kf.KCLayout("YAML_CHANGED")
+    kf.placer.cells_from_yaml(top, kcl_changed, cache_dir=cache_dir)
+    assert kcl_changed.layout.cells() == 4
+
+
+def test_cells_from_yaml_include_once(tmp_path: Path) -> None:
+    _write_yaml(tmp_path / "common.yaml", 2)
+    for name in ("a", "b"):
+        (tmp_path / f"{name}.yaml").write_text(
+            "- !include {filename: common.yaml}\n"
+            f"- !KCell\n  name: yaml_{name}\n  insts:\n    - cellname: yaml_cell1\n"
+        )
+    top = tmp_path / "top.yaml"
+    top.write_text(
+        "- !include {filename: a.yaml}\n- !include {filename: b.yaml}\n"
+        "- !KCell\n  name: yaml_top\n"
+    )
+
+    assert list(kf.placer.include_graph(top)) == [
+        tmp_path / "common.yaml",
+        tmp_path / "a.yaml",
+        tmp_path / "b.yaml",
+        top,
+    ]
+    kcl = kf.KCLayout("YAML_INCLUDE_ONCE")
+    kf.placer.cells_from_yaml(top, kcl)
+    assert kcl.layout.cells() == 5
+
+
+def test_cells_from_yaml_include_cycle(tmp_path: Path) -> None:
+    (tmp_path / "a.yaml").write_text("- !include {filename: b.yaml}\n")
+    (tmp_path / "b.yaml").write_text("- !include {filename: a.yaml}\n")
+    top = tmp_path / "top.yaml"
+    top.write_text("- !include {filename: a.yaml}\n")
+
+    with pytest.raises(kf.placer.IncludeCycleError) as e:
+        kf.placer.cells_from_yaml(top, kf.KCLayout("YAML_INCLUDE_CYCLE"))
+    assert e.value.cycle == [
+        tmp_path / "a.yaml",
+        tmp_path / "b.yaml",
+        tmp_path / "a.yaml",
+    ]
+
+
+def test_compose_yaml_memory_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(kf.placer, "_compiled_yaml_maxsize", 2)
+    kf.placer._compiled_yaml.clear()
+    files = [tmp_path / f"{name}.yaml" for name in ("a", "b", "c")]
+    for i, f in enumerate(files):
+        _write_yaml(f, i + 1)
+        kf.placer.compose_yaml(f)
+    assert list(kf.placer._compiled_yaml) == files[1:]
+
+    # same size and mtime, different content
+    stat = files[2].stat()
+    files[2].write_text(files[2].read_text().replace("yaml_cell", "yaml_celx"))
+    os.utime(files[2], ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert files[2].stat().st_size == stat.st_size
+    node = kf.placer.compose_yaml(files[2])
+    assert node is not None
+    assert node.value[0].value[0][1].value == "yaml_celx0"
@@ -188,3 +188,63 @@ def test_polar_copy_complex(LAYER: kf.LayerEnum) -> None:
     assert p2.dcplx_trans == kf.kdb.DCplxTrans(
         1, 210, True, 0.938012701892, 0.683012701892
     )
+
+
+def test_ports_index(LAYER: kf.LayerEnum) -> None:
+    c = kf.KCell()
+    n = 10_000
+    for i in range(n):
+        c.create_port(
+            name=f"o{i}",
+            trans=kf.kdb.Trans(i % 4, False, i * 1000, 0),
+            width=1000,
+            layer=LAYER.WG if i % 2 else LAYER.WGCLAD,
+            port_type="optical" if i % 3 else "electrical",
+        )
+    assert c.ports["o9999"].x == 9_999_000
+    assert "o5000" in c.ports
+    assert "o10000" not in c.ports
+    assert c.ports.contains(c.ports["o42"].copy())
+    assert not c.ports.contains(c.ports["o42"].copy(kf.kdb.Trans(1000, 0)))
+
+    filtered = list(c.ports.filter(layer=LAYER.WG, port_type="electrical", angle=1))
+    assert filtered == [
+        p
+        for p in c.ports
+        if p.layer == LAYER.WG and p.port_type == "electrical" and p.angle == 1
+    ]
+    assert [p.name for p in filtered[:2]] == ["o9", "o21"]
+
+    c.ports["o1"].name = "renamed"
+    assert "o1" not in c.ports
+    assert c.ports["renamed"] is c.ports[1]
+    c.ports[3].layer = LAYER.WGCLAD
+    assert c.ports[3] in c.ports.filter(layer=LAYER.WGCLAD)
+    c.add_port(c.ports[0], name="o10000")
+    assert c.ports["o10000"] is c.ports[n]
+    with pytest.raises(KeyError):
+        c.ports["o1"]
+
+
+def test_port_copy_lazy(LAYER: kf.LayerEnum) -> None:
+    p = kf.Port(
+        name="o1", trans=kf.kdb.Trans(1, False, 0, 0), width=1000, layer=LAYER.WG
+    )
+    assert p._info is None and p._d is None
+    assert not hasattr(p, "__dict__")
+
+    p2 = p.copy()
+    assert p2 == p
+    assert p2._info is None
+    p2.x = 500
+    assert p.x == 0
+
+    p.info["length"] = 10
+    p3 = p.copy(kf.kdb.DCplxTrans(1, 30, False, 0, 0))
+    assert p3.info == p.info and p3.info is not p.info
+    assert p3.d.width == p.d.width == 1
+
+    p.info["tags"] = ["a"]
+    p4 = p.copy()
+    p4.info["tags"].append("b")
+    assert p.info["tags"] == ["a"]
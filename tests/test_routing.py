@@ -1,6 +1,6 @@
 import kfactory as kf
 import pytest
-from random import randint
+from random import Random, randint
 
 from collections.abc import Callable
 
@@ -229,3 +229,104 @@ def test_route_length(
     assert route.length_straights == 25196
     assert route.length_backbone == 140000
     assert route.n_bend90 == 2
+
+
+def test_route_manhattan_obstacles(
+    bend90: kf.KCell,
+    straight_factory_dbu: Callable[..., kf.KCell],
+    LAYER: kf.LayerEnum,
+    optical_port: kf.Port,
+) -> None:
+    c = kf.KCell()
+    c.shapes(LAYER.WG).insert(kf.kdb.Box(40000, -50000, 45000, 50000))
+    obstacles = kf.routing.manhattan.ObstacleIndex.from_cell(
+        c, [LAYER.WG], clearance=2500
+    )
+    p1 = optical_port.copy()
+    p1.trans = kf.kdb.Trans(0, False, 0, 0)
+    p2 = optical_port.copy()
+    p2.trans = kf.kdb.Trans(2, False, 100000, 0)
+    kf.routing.optical.route(
+        c,
+        p1,
+        p2,
+        straight_factory=straight_factory_dbu,
+        bend90_cell=bend90,
+        route_path_function=kf.routing.manhattan.route_manhattan_obstacles,
+        route_kwargs={"obstacles": obstacles},
+    )
+    wall = kf.kdb.Region(kf.kdb.Box(40000, -50000, 45000, 50000))
+    route = kf.kdb.Region(c.begin_shapes_rec(LAYER.WG)) - wall
+    assert route.interacting(wall).is_empty()
+
+
+def test_route_manhattan_obstacles_field() -> None:
+    rng = Random(1)
+    obstacles = kf.kdb.Region()
+    for _ in range(10000):
+        x = rng.randrange(20000, 8_000_000)
+        y = rng.randrange(-4_000_000, 4_000_000)
+        obstacles.insert(kf.kdb.Box(x, y, x + 15000, y + 15000))
+    index = kf.routing.manhattan.ObstacleIndex(obstacles, clearance=1000)
+    t1 = kf.kdb.Trans(0, False, 0, 0)
+    t2 = kf.kdb.Trans(2, False, 8_040_000, 2_000_000)
+    pts = kf.routing.manhattan.route_manhattan_obstacles(
+        t1, t2, 10000, 0, 0, obstacles=index
+    )
+    assert pts[0] == t1.disp.to_p()
+    assert pts[-1] == t2.disp.to_p()
+    for p1, p2 in zip(pts[:-1], pts[1:]):
+        assert p1.x == p2.x or p1.y == p2.y
+        assert not index.collides(kf.kdb.Box(p1, p2))
+
+
+def test_route_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = kf.routing.manhattan.RouteCache(maxsize=2)
+    monkeypatch.setattr(kf.routing.manhattan, "route_cache", cache)
+    rel = kf.kdb.Trans(3, False, 80_000, 150_000)
+    t1 = kf.kdb.Trans(0, False, 0, 0)
+    pts = kf.routing.manhattan.route_manhattan(t1, t1 * rel, 10_000, 0, 0)
+    moved = kf.kdb.Trans(1, False, 1_000_000, -20_000)
+    moved_pts = kf.routing.manhattan.route_manhattan(
+        moved * t1, moved * t1 * rel, 10_000, 0, 0
+    )
+    assert moved_pts == [moved * p for p in pts]
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    for x in (100_000, 200_000):
+        kf.routing.manhattan.route_manhattan(
+            t1, kf.kdb.Trans(2, False, x, 50_000), 10_000, 0, 0
+        )
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+
+
+def test_place90_instance_arrays(
+    optical_port: kf.Port,
+    bend90: kf.KCell,
+    straight_factory_dbu: Callable[..., kf.KCell],
+    LAYER: kf.LayerEnum,
+) -> None:
+    pts = [kf.kdb.Point(0, 0)]
+    for i in range(20):
+        x = 200_000 if i % 2 == 0 else 0
+        pts.append(kf.kdb.Point(x, i * 50_000))
+        pts.append(kf.kdb.Point(x, (i + 1) * 50_000))
+    pts.append(kf.kdb.Point(-100_000, 1_000_000))
+    p1 = optical_port.copy(kf.kdb.Trans(0, False, 0, 0))
+    p2 = optical_port.copy(kf.kdb.Trans(0, False, -100_000, 1_000_000))
+
+    c = kf.KCell()
+    route = kf.routing.optical.place90(c, p1, p2, pts, straight_factory_dbu, bend90)
+    c_arrays = kf.KCell()
+    route_arrays = kf.routing.optical.place90(
+        c_arrays, p1, p2, pts, straight_factory_dbu, bend90, instance_arrays=True
+    )
+    assert route_arrays.length == route.length
+    assert route_arrays.length_straights == route.length_straights
+    assert route_arrays.n_bend90 == route.n_bend90 == 40
+    assert len(c_arrays.insts) == len(route_arrays.instances) < len(c.insts)
+    assert (
+        kf.kdb.Region(c.begin_shapes_rec(LAYER.WG))
+        ^ kf.kdb.Region(c_arrays.begin_shapes_rec(LAYER.WG))
+    ).is_empty()
@@ -1,4 +1,5 @@
 import kfactory as kf
+import pytest
 from functools import partial
 
 
@@ -75,3 +76,60 @@ def test_all_angle_route(LAYER: kf.LayerEnum, wg_enc: kf.LayerEnclosure) -> None
     )
     kf.VInstance(vc, kf.kdb.DCplxTrans()).insert_into(c)
     c.show()
+
+
+def test_all_angle_route_plan(LAYER: kf.LayerEnum, wg_enc: kf.LayerEnclosure) -> None:
+    kf.routing.aa.optical.bend_cache.clear()
+    straight_factory = partial(
+        kf.cells.virtual.straight.virtual_straight,
+        layer=LAYER.WG,
+        enclosure=wg_enc,
+    )
+    bend_factory = partial(
+        kf.cells.virtual.euler.virtual_bend_euler,
+        width=5,
+        radius=20,
+        layer=LAYER.WG,
+        enclosure=wg_enc,
+    )
+    # segment angles 170° and -170°, a 20° bend across the ±180° boundary
+    bb = [
+        kf.kdb.DPoint(0, 0),
+        kf.kdb.DPoint(-295.442, 52.094),
+        kf.kdb.DPoint(-590.885, 0),
+    ]
+    for _ in range(2):
+        vc = kf.VKCell()
+        route = kf.routing.aa.optical.route(
+            vc,
+            width=5,
+            layer=LAYER.WG,
+            backbone=bb,
+            straight_factory=straight_factory,
+            bend_factory=bend_factory,
+        )
+        assert route is not None
+        end = route.instances[-1].ports["o2"].dcplx_trans.disp.to_p()
+        assert (end - bb[-1]).length() < 1e-3
+    assert len(kf.routing.aa.optical.bend_cache) == 1
+
+    bb = [kf.kdb.DPoint(x, y) for x, y in [(0, 0), (5, 0), (5, 5), (100, 5)]]
+    with pytest.raises(ValueError) as e:
+        kf.routing.aa.optical._plan(bb, 5, bend_factory, ("o1", "o2"))
+    assert str(e.value).count("needed space") == 2
+
+
+def test_bend_cache_bounded(
+    LAYER: kf.LayerEnum, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = kf.routing.aa.optical.BendCache(maxsize=2)
+    monkeypatch.setattr(kf.routing.aa.optical, "bend_cache", cache)
+    for radius in (10, 20, 30):
+        bend_factory = partial(
+            kf.cells.virtual.euler.virtual_bend_euler,
+            radius=radius,
+            layer=LAYER.WG,
+        )
+        kf.routing.aa.optical._bend(bend_factory, 5, 90, ("o1", "o2"))
+    assert len(cache) == 2
+    assert [key[0].keywords["radius"] for key in cache._data] == [20, 30]